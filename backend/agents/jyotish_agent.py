@@ -2,13 +2,29 @@ import swisseph as swe
 from datetime import datetime
 import pytz
 from timezonefinder import TimezoneFinder
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, NamedTuple, Optional
 import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .vargas import POINTS, RASHIS, divisional_charts, divisional_charts_batch
+from .vimshottari import DashaTimeline
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+NATAL_CACHE_SIZE = 256
+
+
+class Natal(NamedTuple):
+    """Everything derived from one set of birth data, cached together"""
+    chart: Dict[str, Any]
+    dasha: DashaTimeline
+    longitudes: np.ndarray  # unrounded, in vargas.POINTS order
+
 class JyotishAgent:
     """
     Agent for calculating Vedic Astrology (Jyotish) Panchanga elements:
@@ -55,6 +71,10 @@ class JyotishAgent:
             "Indra", "Vaidhriti"
         ]
 
+        # Natal charts and their dasha timelines, keyed by birth data
+        self._natal_cache: "OrderedDict[tuple, Natal]" = OrderedDict()
+        self._natal_lock = threading.Lock()
+
     def _get_julian_day(self, date_str: str) -> float:
         # Simple date parsing for Panchanga (assumes Noon UTC if no time)
         dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
@@ -118,11 +138,125 @@ class JyotishAgent:
             logger.error(f"Error in calculate_panchanga: {e}")
             return {}
 
+    def calculate_panchanga_range(self, start_date: str, days: int) -> Dict[str, np.ndarray]:
+        """
+        Tithi, yoga and nakshatra numbers (1-based) at 00:00 UTC of `days`
+        consecutive days, the same instant calculate_panchanga uses for a
+        bare date. Returns arrays.
+        """
+        jd_start = self._get_julian_day(start_date[:10])
+        flags = swe.FLG_SIDEREAL | swe.FLG_SWIEPH
+        sun = np.empty(days)
+        moon = np.empty(days)
+        for i in range(days):
+            sun[i] = swe.calc_ut(jd_start + i, swe.SUN, flags)[0][0]
+            moon[i] = swe.calc_ut(jd_start + i, swe.MOON, flags)[0][0]
+
+        segment = 360 / 27
+        return {
+            "tithi": ((moon - sun) % 360 // 12).astype(np.int64) % 30 + 1,
+            "yoga": ((sun + moon) % 360 // segment).astype(np.int64) % 27 + 1,
+            "nakshatra": (moon // segment).astype(np.int64) % 27 + 1,
+        }
+
     def calculate_birth_chart(self, birth_date: str, birth_time: str, latitude: float, longitude: float) -> Dict[str, Any]:
         """
         Calculate natal chart using birth time and location.
         Automatically detects timezone to convert local birth time to UTC.
         """
+        return self._natal(birth_date, birth_time, latitude, longitude).chart
+
+    def get_dasha_timeline(self, birth_date: str, birth_time: str, latitude: float, longitude: float) -> DashaTimeline:
+        """Vimshottari timeline from the natal Moon, cached with the natal chart"""
+        return self._natal(birth_date, birth_time, latitude, longitude).dasha
+
+    def calculate_divisional_charts(
+        self,
+        birth_date: str,
+        birth_time: str,
+        latitude: float,
+        longitude: float,
+        vargas: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, Optional[str]]]:
+        """
+        Varga charts (D2/D3/D7/D9/D10/D12/D60 by default): sign of the
+        Ascendant and every graha. Derived from the cached natal longitudes,
+        so no extra ephemeris calls.
+        """
+        return divisional_charts(self._natal(birth_date, birth_time, latitude, longitude).longitudes, vargas)
+
+    def calculate_divisional_charts_batch(
+        self,
+        births: Iterable[Dict[str, Any]],
+        vargas: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Varga signs for many profiles at once. `births` items have birth_date,
+        birth_time, latitude and longitude. Returns compact columns:
+        {"points": [...], "rashis": [...], "vargas": {varga: [[sign index per point] per birth]}}
+        (255 where a chart could not be computed).
+        """
+        rows = []
+        for birth in births:
+            try:
+                rows.append(self.natal_longitudes(
+                    birth["birth_date"], birth["birth_time"], float(birth["latitude"]), float(birth["longitude"])
+                ))
+            except Exception as e:
+                logger.error(f"Skipping divisional charts for {birth.get('birth_date')}: {e}")
+                rows.append(np.full(len(POINTS), np.nan))
+        longitudes = np.vstack(rows) if rows else np.empty((0, len(POINTS)))
+        return {
+            "points": list(POINTS),
+            "rashis": list(RASHIS),
+            "vargas": {varga: signs.tolist() for varga, signs in divisional_charts_batch(longitudes, vargas).items()},
+        }
+
+    def natal_longitudes(self, birth_date: str, birth_time: str, latitude: float, longitude: float) -> np.ndarray:
+        """Unrounded Ascendant and graha longitudes (vargas.POINTS order), e.g. for batch vargas"""
+        return self._natal(birth_date, birth_time, latitude, longitude).longitudes
+
+    def calculate_dasha(
+        self,
+        birth_date: str,
+        birth_time: str,
+        latitude: float,
+        longitude: float,
+        date: Optional[str] = None,
+        level: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Mahadasha, antardasha and pratyantardasha running at `date` (ISO date
+        or datetime, default now). With `level`, also lists that level's periods.
+        """
+        timeline = self.get_dasha_timeline(birth_date, birth_time, latitude, longitude)
+        when = None
+        if date:
+            when = datetime.fromisoformat(date.replace('Z', '+00:00'))
+            if when.tzinfo is None:
+                when = pytz.UTC.localize(when)
+        result = timeline.at(when)
+        result["balance_at_birth"] = timeline.balance_at_birth
+        if level:
+            result["periods"] = timeline.periods(level)
+        return result
+
+    def _natal(self, birth_date: str, birth_time: str, latitude: float, longitude: float) -> Natal:
+        key = (birth_date, birth_time, round(float(latitude), 4), round(float(longitude), 4))
+        with self._natal_lock:
+            cached = self._natal_cache.get(key)
+            if cached is not None:
+                self._natal_cache.move_to_end(key)
+                return cached
+
+        natal = self._compute_birth_chart(birth_date, birth_time, latitude, longitude)
+        with self._natal_lock:
+            self._natal_cache[key] = natal
+            while len(self._natal_cache) > NATAL_CACHE_SIZE:
+                self._natal_cache.popitem(last=False)
+        return natal
+
+    def _compute_birth_chart(self, birth_date: str, birth_time: str, latitude: float, longitude: float) -> Natal:
         logger.info(f"Calculating birth chart for: {birth_date} {birth_time} at {latitude}, {longitude}")
         
         try:
@@ -161,8 +295,8 @@ class JyotishAgent:
             jd = swe.julday(dt_utc.year, dt_utc.month, dt_utc.day, 
                             dt_utc.hour + dt_utc.minute/60.0 + dt_utc.second/3600.0)
             
-            # 5. Calculate Houses (for Ascendant) - Placidus system
-            houses_result = swe.houses(jd, latitude, longitude, b'P')
+            # 5. Calculate Houses (for Ascendant) - Placidus system, sidereal like the grahas
+            houses_result = swe.houses_ex(jd, latitude, longitude, b'P', swe.FLG_SIDEREAL)
             ascendant_long = houses_result[0][0]  # Ascendant is 1st house cusp
             
             # 6. Calculate All Planets (Grahas)
@@ -183,10 +317,12 @@ class JyotishAgent:
                       "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
             
             grahas = {}
+            raw = {"Ascendant": ascendant_long}  # unrounded longitudes
             
             for name, planet_id in planets_map.items():
                 res = swe.calc_ut(jd, planet_id, swe.FLG_SIDEREAL | swe.FLG_SWIEPH)
                 long = res[0][0]
+                raw[name] = long
                 rashi_idx = int(long / 30)
                 
                 # Calculate Nakshatra for all planets
@@ -216,7 +352,10 @@ class JyotishAgent:
             ascendant_rashi_idx = int(ascendant_long / 30)
             ascendant_nakshatra_idx = int(ascendant_long / (360 / 27))
             
-            return {
+            raw["Ketu"] = (raw["Rahu"] + 180) % 360
+            dasha = DashaTimeline(raw["Moon"], dt_utc)
+
+            chart = {
                 "timezone": timezone_str,
                 "utc_time": dt_utc.isoformat(),
                 "ascendant": {
@@ -225,8 +364,10 @@ class JyotishAgent:
                     "rashi_degree": round(ascendant_long % 30, 2),
                     "nakshatra": self.NAKSHATRAS[ascendant_nakshatra_idx % 27]
                 },
-                "grahas": grahas
+                "grahas": grahas,
+                "dasha_balance": dasha.balance_at_birth
             }
+            return Natal(chart, dasha, np.array([raw[point] for point in POINTS]))
             
         except Exception as e:
             logger.error(f"CRITICAL ERROR in calculate_birth_chart: {e}", exc_info=True)
@@ -1,6 +1,9 @@
 from datetime import datetime, timedelta
 import math
 from typing import Dict, Any, Optional
+
+import numpy as np
+
 from .mayan_data import MAYAN_DATA
 
 class MayanAgent:
@@ -71,6 +74,54 @@ class MayanAgent:
             "year": year_data
         }
 
+    def calculate_tzolkin_range(self, start_date: str, days: int) -> Dict[str, np.ndarray]:
+        """
+        Kin, tone, seal and 13-Moon month numbers for `days` consecutive days
+        from start_date, as arrays. Leap days (Hunab Ku) get 0 in every column
+        and the Day Out of Time gets moon 0, like calculate_tzolkin.
+        """
+        dates = np.datetime64(start_date[:10], "D") + np.arange(days)
+        anchor = np.datetime64(self.ANCHOR_DATE.date(), "D")
+        leap_day = self._is_leap_day_array(dates)
+
+        # Dreamspell skips Feb 29: drop the leap days between anchor and date
+        effective_days = (dates - anchor).astype(np.int64) - (
+            self._leap_days_before(dates) - self._leap_days_before(anchor)
+        )
+        kin = (self.ANCHOR_KIN + effective_days) % 260
+        kin[kin == 0] = 260
+
+        # 13-Moon year starts on July 26; 13 moons of 28 days, then the Day Out of Time
+        july = dates.astype("datetime64[Y]").astype("datetime64[M]") + 6
+        new_year = july.astype("datetime64[D]") + 25
+        new_year = np.where(dates < new_year, (july - 12).astype("datetime64[D]") + 25, new_year)
+        moon_day = (dates - new_year).astype(np.int64) - (
+            self._leap_days_before(dates) - self._leap_days_before(new_year)
+        )
+        moon = np.where((moon_day == 364) | leap_day, 0, moon_day // 28 + 1)
+
+        return {
+            "kin": np.where(leap_day, 0, kin),
+            "tone": np.where(leap_day, 0, (kin - 1) % 13 + 1),
+            "seal": np.where(leap_day, 0, (kin - 1) % 20 + 1),
+            "moon": moon,
+        }
+
+    @staticmethod
+    def _is_leap_day_array(dates: np.ndarray) -> np.ndarray:
+        months = dates.astype("datetime64[M]")
+        return (months.astype(np.int64) % 12 == 1) & ((dates - months).astype(np.int64) == 28)
+
+    @staticmethod
+    def _leap_days_before(dates) -> np.ndarray:
+        """Number of Feb 29ths strictly before each date (proleptic Gregorian)"""
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        years = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+        after_feb = dates.astype("datetime64[M]").astype(np.int64) % 12 >= 2
+        leap_year = (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+        prior = years - 1
+        return prior // 4 - prior // 100 + prior // 400 + (leap_year & after_feb)
+
     def _calculate_13moon_date(self, date: datetime) -> Dict[str, Any]:
         year = date.year
         # 13 Moon New Year is always July 26
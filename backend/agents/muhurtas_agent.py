@@ -10,9 +10,17 @@ Requires:
 """
 
 import swisseph as swe
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from .solar import jd_to_datetime64, sun_events
 
 # Planetary order for Hora calculation
 # Starting from Sunday's first hour (Sun) and cycling through
@@ -65,13 +73,78 @@ YAMAGHANDA_PORTIONS = {
 }
 
 
+# Solved sunrise/sunset events kept per agent (kind, location, day)
+SUN_EVENT_CACHE_SIZE = 8192
+
+# Choghadiya ruled by each hora planet: (name, name_ru, nature)
+CHOGHADIYAS = {
+    "Sun": ("Udveg", "Удвег", "bad"),
+    "Venus": ("Chal", "Чал", "neutral"),
+    "Mercury": ("Labh", "Лабх", "good"),
+    "Moon": ("Amrit", "Амрит", "good"),
+    "Saturn": ("Kaal", "Каал", "bad"),
+    "Jupiter": ("Shubh", "Шубх", "good"),
+    "Mars": ("Rog", "Рог", "bad"),
+}
+
+# Timeline entry types, in the order used to break ties on equal start times
+TIMELINE_TYPES = ("brahma_muhurta", "hora", "choghadiya", "rahu_kala", "gulika_kala", "yamaghanda", "abhijit_muhurta")
+TIMELINE_NAMES = {
+    "brahma_muhurta": ("Brahma Muhurta", "Брахма Мухурта", "good"),
+    "rahu_kala": ("Rahu Kala", "Раху Кала", "bad"),
+    "gulika_kala": ("Gulika Kala", "Гулика Кала", "bad"),
+    "yamaghanda": ("Yamaghanda", "Ямаганда", "bad"),
+    "abhijit_muhurta": ("Abhijit Muhurta", "Абхиджит Мухурта", "good"),
+}
+
+
+_tz_finder = None
+_tz_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4096)
+def _timezone_at(latitude: float, longitude: float) -> str:
+    global _tz_finder
+    try:
+        with _tz_lock:
+            if _tz_finder is None:
+                from timezonefinder import TimezoneFinder
+                _tz_finder = TimezoneFinder(in_memory=False)
+        return _tz_finder.timezone_at(lng=longitude, lat=latitude) or "UTC"
+    except Exception as e:
+        print(f"Warning: timezone lookup failed, using UTC: {e}")
+        return "UTC"
+
+
+def timezone_at(latitude: float, longitude: float) -> str:
+    """
+    IANA timezone name of a location (timezonefinder), "UTC" when unknown.
+    Used to default request dates and output offsets to the location's.
+    """
+    return _timezone_at(round(latitude, 2), round(longitude, 2))
+
+
+def location_datetime(value: Optional[str], latitude: float, longitude: float) -> datetime:
+    """
+    Parse an ISO date/datetime for a location: naive values are read in the
+    location's timezone, None means now there. Raises ValueError.
+    """
+    from zoneinfo import ZoneInfo
+    tz = ZoneInfo(timezone_at(latitude, longitude))
+    if not value:
+        return datetime.now(tz)
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return dt if dt.tzinfo else dt.replace(tzinfo=tz)
+
+
 @dataclass
 class SunTimes:
     """Sunrise and sunset times for a given date and location."""
     sunrise: datetime
     sunset: datetime
     day_duration: timedelta
-    night_duration: timedelta
+    night_duration: timedelta  # sunset to next sunrise
+    next_sunrise: datetime
 
 
 class MuhurtasAgent:
@@ -92,7 +165,10 @@ class MuhurtasAgent:
     
     def __init__(self):
         # Swiss Ephemeris path (uses default if not set)
-        pass
+        # Solved sunrise/sunset Julian days, keyed by (kind, lat, lon, search start)
+        self._events: "OrderedDict[tuple, float]" = OrderedDict()
+        self._events_lock = threading.Lock()
+        self.stats: Dict[str, int] = {"solves": 0}
     
     def _get_julian_day(self, dt: datetime) -> float:
         """Convert datetime to Julian Day."""
@@ -120,6 +196,21 @@ class MuhurtasAgent:
         dt = datetime(year, month, day, hours, minutes, seconds, tzinfo=timezone.utc)
         return dt.astimezone(tz) if tz != timezone.utc else dt
     
+    def _day_anchor(self, date: datetime, longitude: float) -> float:
+        """
+        Julian Day of local mean solar midnight starting `date`'s calendar
+        day at `longitude`. Rise/set searches start here, so a day is the
+        location's day whatever timezone `date` carries.
+        """
+        return swe.julday(date.year, date.month, date.day, 0.0) - longitude / 360
+    
+    def _local_day(self, dt: datetime, longitude: float) -> datetime:
+        """Midnight (in dt's timezone) of the calendar day it is at `longitude` at instant dt"""
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        solar = dt.astimezone(timezone.utc) + timedelta(hours=longitude / 15)
+        return datetime(solar.year, solar.month, solar.day, tzinfo=dt.tzinfo)
+    
     def get_sun_times(
         self, 
         date: datetime, 
@@ -127,7 +218,15 @@ class MuhurtasAgent:
         longitude: float
     ) -> SunTimes:
         """
-        Calculate sunrise and sunset for a given date and location.
+        Calculate sunrise, sunset and the next sunrise for a given date and location.
+        
+        Rise/set events are cached per location as a rolling series, so
+        consecutive days share work: day N's next sunrise is day N+1's
+        sunrise, and a run of N days costs N+1 sunrise and N sunset solves.
+        
+        The day is `date`'s calendar date at the location (searched from
+        local mean solar midnight); date's timezone only sets that calendar
+        date and the offset of the returned times.
         
         Args:
             date: The date to calculate for
@@ -135,63 +234,172 @@ class MuhurtasAgent:
             longitude: Geographic longitude
             
         Returns:
-            SunTimes dataclass with sunrise, sunset, and duration info
+            SunTimes dataclass with sunrise, sunset, next sunrise and durations
         """
-        # Get Julian Day for midnight UTC of the given date
         if date.tzinfo is None:
             date = date.replace(tzinfo=timezone.utc)
         
-        # Start from midnight of the given date
-        midnight = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        jd_start = self._get_julian_day(midnight)
-        
-        # Calculate sunrise
-        # swe.rise_trans(jd_start, planet, geopos, atpress, attemp, rsmi)
-        # rsmi: 1 = rise, 2 = set
-        geopos = (longitude, latitude, 0)  # (lon, lat, altitude)
+        jd_start = self._day_anchor(date, longitude)
         
-        try:
-            sunrise_result = swe.rise_trans(
-                jd_start, 
-                swe.SUN, 
-                geopos,
-                0,  # atmospheric pressure (0 = default)
-                0,  # temperature (0 = default)
-                swe.CALC_RISE | swe.BIT_DISC_CENTER
-            )
-            sunrise_jd = sunrise_result[1][0]
-            
-            sunset_result = swe.rise_trans(
-                jd_start,
-                swe.SUN,
-                geopos,
-                0,
-                0,
-                swe.CALC_SET | swe.BIT_DISC_CENTER
-            )
-            sunset_jd = sunset_result[1][0]
-        except Exception as e:
-            # Fallback to approximate times if calculation fails
-            # (can happen at extreme latitudes)
-            sunrise_jd = jd_start + 0.25  # ~6 AM
-            sunset_jd = jd_start + 0.75   # ~6 PM
+        sunrise_jd = self._sun_event(jd_start, latitude, longitude, "rise")
+        sunset_jd = self._sun_event(jd_start, latitude, longitude, "set")
+        if sunset_jd <= sunrise_jd:
+            sunset_jd = self._sun_event(sunrise_jd, latitude, longitude, "set")
+        next_sunrise_jd = self._sun_event(jd_start + 1, latitude, longitude, "rise")
         
         sunrise_dt = self._jd_to_datetime(sunrise_jd, date.tzinfo)
         sunset_dt = self._jd_to_datetime(sunset_jd, date.tzinfo)
-        
-        day_duration = sunset_dt - sunrise_dt
-        
-        # Night duration (sunset to next sunrise)
-        # For simplicity, we'll approximate as 24h - day_duration
-        night_duration = timedelta(hours=24) - day_duration
+        next_sunrise_dt = self._jd_to_datetime(next_sunrise_jd, date.tzinfo)
         
         return SunTimes(
             sunrise=sunrise_dt,
             sunset=sunset_dt,
-            day_duration=day_duration,
-            night_duration=night_duration
+            day_duration=sunset_dt - sunrise_dt,
+            night_duration=next_sunrise_dt - sunset_dt,
+            next_sunrise=next_sunrise_dt
         )
     
+    def get_sun_series(
+        self,
+        start: datetime,
+        days: int,
+        latitude: float,
+        longitude: float
+    ) -> List[SunTimes]:
+        """SunTimes for `days` consecutive dates from `start` (N+1 rise and N set solves)"""
+        return [self.get_sun_times(start + timedelta(days=i), latitude, longitude) for i in range(days)]
+    
+    def get_sun_table(
+        self,
+        start: datetime,
+        days: int,
+        latitude: float,
+        longitude: float,
+        precise: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """
+        Sunrise, sunset and next sunrise (Julian days) for `days` consecutive
+        dates from `start`, as arrays.
+        
+        By default all days come from the vectorized NOAA solver in one pass
+        (agents/solar.py, within a few seconds of Swiss Ephemeris). With
+        precise=True every event is solved with swe.rise_trans through the
+        rolling event cache instead. `approximate` marks polar days/nights,
+        which fall back to 06:00 / 18:00 like get_sun_times.
+        """
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        # Local solar midnights, as in get_sun_times (days + 1 for the last next sunrise)
+        jd_start = self._day_anchor(start, longitude) + np.arange(days + 1)
+        
+        if precise:
+            rises = np.array([self._sun_event(jd, latitude, longitude, "rise") for jd in jd_start])
+            sets = np.array([self._sun_event(jd, latitude, longitude, "set") for jd in jd_start[:-1]])
+            approximate = np.zeros(days, dtype=bool)
+        else:
+            rises = sun_events(jd_start, latitude, longitude, "rise")
+            sets = sun_events(jd_start[:-1], latitude, longitude, "set")
+            approximate = np.isnan(rises[:-1]) | np.isnan(sets)
+            rises = np.where(np.isnan(rises), jd_start + 0.25, rises)
+            sets = np.where(np.isnan(sets), jd_start[:-1] + 0.75, sets)
+        # A set before its sunrise belongs to the previous day: take the one after sunrise
+        early = sets <= rises[:-1]
+        if early.any():
+            if precise:
+                sets[early] = [self._sun_event(jd, latitude, longitude, "set") for jd in rises[:-1][early]]
+            else:
+                sets[early] = sun_events(rises[:-1][early], latitude, longitude, "set")
+        
+        return {
+            "jd_start": jd_start[:-1],
+            "sunrise": rises[:-1],
+            "sunset": sets,
+            "next_sunrise": rises[1:],
+            "approximate": approximate,
+        }
+    
+    def get_muhurtas_calendar(
+        self,
+        start: datetime,
+        days: int,
+        latitude: float,
+        longitude: float,
+        precise: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Daily sunrise/sunset, Rahu Kala, Gulika Kala, Yamaghanda, Brahma and
+        Abhijit muhurtas for `days` dates (annual calendars, exports).
+        
+        Columnar: one list per field, ISO times in start's timezone. All
+        windows are computed on the get_sun_table arrays at once.
+        """
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        table = self.get_sun_table(start, days, latitude, longitude, precise)
+        sunrise, sunset = table["sunrise"], table["sunset"]
+        portion = (sunset - sunrise) / 8
+        muhurta = (sunset - sunrise) / 15
+        # Sunday = 0, as in the portion tables
+        weekday_sun = (start.weekday() + 1 + np.arange(days)) % 7
+        
+        def kala(portions: Dict[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+            begin = sunrise + np.array([portions[w] for w in range(7)])[weekday_sun] * portion
+            return begin, begin + portion
+        
+        tz = start.tzinfo
+        
+        def iso(jd: np.ndarray) -> List[str]:
+            return [
+                value.replace(tzinfo=timezone.utc).astimezone(tz).isoformat()
+                for value in jd_to_datetime64(jd).astype(datetime)
+            ]
+        
+        def window(begin: np.ndarray, end: np.ndarray) -> Dict[str, List[str]]:
+            return {"start": iso(begin), "end": iso(end)}
+        
+        midnight = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "precise": precise,
+            "dates": [(midnight + timedelta(days=i)).date().isoformat() for i in range(days)],
+            "sunrise": iso(sunrise),
+            "sunset": iso(sunset),
+            "approximate": table["approximate"].tolist(),
+            "rahu_kala": window(*kala(RAHU_KALA_PORTIONS)),
+            "gulika_kala": window(*kala(GULIKA_KALA_PORTIONS)),
+            "yamaghanda": window(*kala(YAMAGHANDA_PORTIONS)),
+            "brahma_muhurta": window(sunrise - 96 / 1440, sunrise),
+            "abhijit_muhurta": window(sunrise + 7 * muhurta, sunrise + 8 * muhurta),
+        }
+    
+    def _sun_event(self, jd_start: float, latitude: float, longitude: float, kind: str) -> float:
+        """First sunrise/sunset (kind "rise"/"set") after jd_start, cached per location"""
+        key = (kind, round(latitude, 4), round(longitude, 4), round(jd_start, 6))
+        with self._events_lock:
+            if key in self._events:
+                self._events.move_to_end(key)
+                return self._events[key]
+        
+        self.stats["solves"] += 1
+        rsmi = (swe.CALC_RISE if kind == "rise" else swe.CALC_SET) | swe.BIT_DISC_CENTER
+        try:
+            # swe.rise_trans(tjdut, body, rsmi, geopos, atpress, attemp)
+            res, tret = swe.rise_trans(jd_start, swe.SUN, rsmi, (longitude, latitude, 0), 0, 0)
+            event_jd = tret[0] if res == 0 else None  # -2: circumpolar (polar day/night)
+        except Exception as e:
+            print(f"Warning: sun {kind} calculation failed: {e}")
+            event_jd = None
+        if event_jd is None:
+            # Fallback to approximate times (extreme latitudes)
+            event_jd = jd_start + (0.25 if kind == "rise" else 0.75)  # ~6 AM / ~6 PM
+        
+        with self._events_lock:
+            self._events[key] = event_jd
+            while len(self._events) > SUN_EVENT_CACHE_SIZE:
+                self._events.popitem(last=False)
+        return event_jd
+    
     def get_current_hora(
         self, 
         dt: datetime, 
@@ -214,28 +422,34 @@ class MuhurtasAgent:
         Returns:
             Dictionary with current hora information
         """
-        sun_times = self.get_sun_times(dt, latitude, longitude)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        day_date = self._local_day(dt, longitude)
+        sun_times = self.get_sun_times(day_date, latitude, longitude)
+        if dt < sun_times.sunrise:
+            # Before sunrise: still the night of the previous day
+            day_date -= timedelta(days=1)
+            sun_times = self.get_sun_times(day_date, latitude, longitude)
+        elif dt >= sun_times.next_sunrise:
+            day_date += timedelta(days=1)
+            sun_times = self.get_sun_times(day_date, latitude, longitude)
         
         # Determine if it's day or night
-        is_day = sun_times.sunrise <= dt < sun_times.sunset
+        is_day = dt < sun_times.sunset
         
         if is_day:
             # Day hora duration = day_duration / 12
             hora_duration = sun_times.day_duration / 12
-            time_since_start = dt - sun_times.sunrise
-            hora_index = int(time_since_start / hora_duration)
+            period_start = sun_times.sunrise
         else:
-            # Night hora
+            # Night hora: sunset to the next sunrise, in 12 parts
             hora_duration = sun_times.night_duration / 12
-            if dt >= sun_times.sunset:
-                time_since_start = dt - sun_times.sunset
-            else:
-                # After midnight, before sunrise
-                time_since_start = dt - (sun_times.sunset - timedelta(days=1))
-            hora_index = int(time_since_start / hora_duration) + 12  # Offset by 12 for night
+            period_start = sun_times.sunset
+        period_index = min(int((dt - period_start) / hora_duration), 11)
+        hora_index = period_index + (0 if is_day else 12)  # Offset by 12 for night
         
         # Get day of week to determine starting planet
-        weekday = dt.weekday()  # Monday = 0, Sunday = 6
+        weekday = day_date.weekday()  # Monday = 0, Sunday = 6
         # Convert to Sunday = 0
         weekday_sun = (weekday + 1) % 7
         
@@ -249,13 +463,8 @@ class MuhurtasAgent:
         planet_ru = HORA_PLANETS_RU[planet_index]
         
         # Calculate hora start and end times
-        if is_day:
-            hora_start = sun_times.sunrise + (hora_index * hora_duration)
-            hora_end = hora_start + hora_duration
-        else:
-            night_hora_index = hora_index - 12
-            hora_start = sun_times.sunset + (night_hora_index * hora_duration)
-            hora_end = hora_start + hora_duration
+        hora_start = period_start + (period_index * hora_duration)
+        hora_end = hora_start + hora_duration
         
         return {
             "planet": planet_ru if language == "ru" else planet_en,
@@ -304,12 +513,15 @@ class MuhurtasAgent:
         Returns:
             Dictionary with Rahu Kala start, end, and status
         """
-        sun_times = self.get_sun_times(dt, latitude, longitude)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        day = self._local_day(dt, longitude)
+        sun_times = self.get_sun_times(day, latitude, longitude)
         
         # Day is divided into 8 parts
         portion_duration = sun_times.day_duration / 8
         
-        weekday = dt.weekday()
+        weekday = day.weekday()
         weekday_sun = (weekday + 1) % 7
         
         rahu_portion = RAHU_KALA_PORTIONS[weekday_sun]
@@ -354,7 +566,9 @@ class MuhurtasAgent:
         Returns:
             Dictionary with Brahma Muhurta timing
         """
-        sun_times = self.get_sun_times(dt, latitude, longitude)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        sun_times = self.get_sun_times(self._local_day(dt, longitude), latitude, longitude)
         
         # Brahma Muhurta: 96 minutes (1 hr 36 min) before sunrise
         brahma_duration = timedelta(minutes=96)
@@ -397,7 +611,9 @@ class MuhurtasAgent:
         Returns:
             Dictionary with Abhijit Muhurta timing
         """
-        sun_times = self.get_sun_times(dt, latitude, longitude)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        sun_times = self.get_sun_times(self._local_day(dt, longitude), latitude, longitude)
         
         # Day divided into 15 muhurtas
         muhurta_duration = sun_times.day_duration / 15
@@ -420,6 +636,95 @@ class MuhurtasAgent:
             )
         }
     
+    def get_day_timeline(
+        self,
+        date: datetime,
+        latitude: float,
+        longitude: float,
+        language: str = "ru",
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        The whole Vedic day (sunrise to next sunrise) as one sorted list of
+        intervals: 24 horas, 16 choghadiyas (8 day, 8 night), Rahu Kala,
+        Gulika Kala, Yamaghanda, Abhijit Muhurta and the Brahma Muhurta
+        ending at this sunrise.
+
+        Everything comes from one sunrise/sunset/next-sunrise computation.
+        `next_transition` is the first interval boundary after `now`
+        (default: current time), so clients can sleep until then instead
+        of polling; None once `now` is past the timeline.
+        """
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        sun_times = self.get_sun_times(date, latitude, longitude)
+        sunrise, sunset, next_sunrise = sun_times.sunrise, sun_times.sunset, sun_times.next_sunrise
+        day, night = sunset - sunrise, next_sunrise - sunset
+
+        weekday_sun = (date.weekday() + 1) % 7
+        first = HORA_PLANETS.index(DAY_RULERS[weekday_sun])
+        entries: List[Dict[str, Any]] = []
+
+        def add(kind: str, start: datetime, end: datetime, **fields):
+            entries.append({"type": kind, "start": start, "end": end, **fields})
+
+        for i in range(24):
+            is_day = i < 12
+            base, span = (sunrise, day) if is_day else (sunset, night)
+            # Boundaries as base + span * k / 12 so the 12th ends exactly at sunset / next sunrise
+            start, end = base + span * (i % 12) / 12, base + span * (i % 12 + 1) / 12
+            planet = HORA_PLANETS[(first + i) % 7]
+            add("hora", start, end, number=i % 12 + 1, is_day=is_day, planet=planet,
+                name=HORA_PLANETS_RU[HORA_PLANETS.index(planet)] if language == "ru" else planet,
+                quality=self._get_hora_quality(planet, language))
+
+        for i in range(16):
+            is_day = i < 8
+            base, span = (sunrise, day) if is_day else (sunset, night)
+            start, end = base + span * (i % 8) / 8, base + span * (i % 8 + 1) / 8
+            # Day choghadiyas follow the hora order from the day ruler; night ones
+            # start five places on and step back two
+            planet = HORA_PLANETS[(first + i) % 7 if is_day else (first + 5 - 2 * (i - 8)) % 7]
+            name_en, name_ru, nature = CHOGHADIYAS[planet]
+            add("choghadiya", start, end, number=i % 8 + 1, is_day=is_day, planet=planet,
+                name=name_ru if language == "ru" else name_en, nature=nature)
+
+        portion = day / 8
+        for kind, portions in (("rahu_kala", RAHU_KALA_PORTIONS), ("gulika_kala", GULIKA_KALA_PORTIONS),
+                               ("yamaghanda", YAMAGHANDA_PORTIONS)):
+            start = sunrise + portions[weekday_sun] * portion
+            add(kind, start, start + portion)
+        add("brahma_muhurta", sunrise - timedelta(minutes=96), sunrise)
+        abhijit_start = sunrise + 7 * (day / 15)
+        add("abhijit_muhurta", abhijit_start, abhijit_start + day / 15)
+
+        for entry in entries:
+            if entry["type"] in TIMELINE_NAMES:
+                name_en, name_ru, nature = TIMELINE_NAMES[entry["type"]]
+                entry.update(name=name_ru if language == "ru" else name_en, nature=nature)
+        entries.sort(key=lambda e: (e["start"], TIMELINE_TYPES.index(e["type"])))
+
+        now = now or datetime.now(timezone.utc)
+        boundaries = sorted({e["start"] for e in entries} | {e["end"] for e in entries})
+        after = bisect_right(boundaries, now)
+        current = [e for e in entries if e["start"] <= now < e["end"]]
+
+        def serialize(entry: Dict[str, Any]) -> Dict[str, Any]:
+            return {**entry, "start": entry["start"].isoformat(), "end": entry["end"].isoformat()}
+
+        return {
+            "date": date.date().isoformat(),
+            "sunrise": sunrise.isoformat(),
+            "sunset": sunset.isoformat(),
+            "next_sunrise": next_sunrise.isoformat(),
+            "day_duration_hours": day.total_seconds() / 3600,
+            "night_duration_hours": night.total_seconds() / 3600,
+            "intervals": [serialize(e) for e in entries],
+            "now": now.isoformat(),
+            "current": [serialize(e) for e in current],
+            "next_transition": boundaries[after].isoformat() if after < len(boundaries) else None,
+        }
+
     def get_all_muhurtas(
         self, 
         dt: datetime, 
@@ -439,7 +744,9 @@ class MuhurtasAgent:
         Returns:
             Dictionary with all calculated muhurtas
         """
-        sun_times = self.get_sun_times(dt, latitude, longitude)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        sun_times = self.get_sun_times(self._local_day(dt, longitude), latitude, longitude)
         
         return {
             "sun_times": {
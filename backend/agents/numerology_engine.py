@@ -2,6 +2,8 @@ import math
 from datetime import datetime
 from typing import Dict, List, Optional
 
+import numpy as np
+
 class NumerologyEngine:
     """
     Core engine for numerological calculations.
@@ -83,6 +85,42 @@ class NumerologyEngine:
         
         return self.reduce_digits(personal_year + month_red + day_red)
 
+    @staticmethod
+    def reduce_digits_array(values, reduce_to_master: bool = True) -> np.ndarray:
+        """reduce_digits over a whole array at once."""
+        values = np.array(values, dtype=np.int64)
+        while True:
+            active = values > 9
+            if reduce_to_master:
+                active &= ~np.isin(values, (11, 22, 33))
+            if not active.any():
+                return values
+            remaining = values[active]
+            total = np.zeros_like(remaining)
+            while remaining.any():
+                total += remaining % 10
+                remaining //= 10
+            values[active] = total
+
+    def get_daily_vibrations(self, dob: str, start_date: str, days: int) -> np.ndarray:
+        """
+        Daily vibrations for `days` consecutive days from start_date (YYYY-MM-DD),
+        same rules as get_daily_vibration.
+        """
+        try:
+            birth = datetime.strptime(dob, "%Y-%m-%d")
+        except ValueError:
+            raise ValueError("Date must be in YYYY-MM-DD format.")
+        dates = np.datetime64(start_date, "D") + np.arange(days)
+        years = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+        months = dates.astype("datetime64[M]").astype(np.int64) % 12 + 1
+        month_days = (dates - dates.astype("datetime64[M]")).astype(np.int64) + 1
+
+        reduce = self.reduce_digits_array
+        birth_part = self.reduce_digits(birth.month) + self.reduce_digits(birth.day)
+        personal_years = reduce(birth_part + reduce(years))
+        return reduce(personal_years + reduce(months) + reduce(month_days))
+
 if __name__ == "__main__":
     # Quick test
     engine = NumerologyEngine()
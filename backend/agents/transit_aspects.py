@@ -0,0 +1,137 @@
+"""
+Transit-to-natal aspects, batched over many natal charts.
+
+Today's graha longitudes are computed once; natal longitudes for every
+profile are stacked into a (profiles, 9) array, and all relations are
+worked out with broadcasting in one pass:
+
+- conjunctions and oppositions: angular separation within an orb
+- graha drishti (sign-based Vedic aspects): every graha aspects the 7th
+  sign from itself; Mars also the 4th and 8th, Jupiter the 5th and 9th,
+  Saturn the 3rd and 10th
+- gochara: the house of each transiting graha counted from the natal Moon
+  sign, flagged favorable per the classical gochara table, plus Sade Sati
+  (Saturn in the 12th, 1st or 2nd from the Moon)
+
+Profiles with missing natal data can carry NaN rows; they match nothing.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+GRAHAS = ("Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu")
+MOON = GRAHAS.index("Moon")
+SATURN = GRAHAS.index("Saturn")
+
+CONJUNCTION_ORB = 8.0
+OPPOSITION_ORB = 8.0
+
+# Houses (counted from the aspecting graha's sign, 1 = same sign) each graha aspects
+DRISHTI_HOUSES = {
+    "Sun": (7,), "Moon": (7,), "Mars": (4, 7, 8), "Mercury": (7,), "Jupiter": (5, 7, 9),
+    "Venus": (7,), "Saturn": (3, 7, 10), "Rahu": (7,), "Ketu": (7,),
+}
+
+# Favorable houses from the natal Moon for each transiting graha
+GOCHARA_FAVORABLE = {
+    "Sun": (3, 6, 10, 11), "Moon": (1, 3, 6, 7, 10, 11), "Mars": (3, 6, 11),
+    "Mercury": (2, 4, 6, 8, 10, 11), "Jupiter": (2, 5, 7, 9, 11),
+    "Venus": (1, 2, 3, 4, 5, 8, 9, 11, 12), "Saturn": (3, 6, 11), "Rahu": (3, 6, 11), "Ketu": (3, 6, 11),
+}
+
+
+def _house_table(houses: Dict[str, Sequence[int]]) -> np.ndarray:
+    """(9, 13) lookup: table[graha, house] is True for the listed houses"""
+    table = np.zeros((len(GRAHAS), 13), dtype=bool)
+    for i, graha in enumerate(GRAHAS):
+        table[i, list(houses[graha])] = True
+    return table
+
+
+DRISHTI_TABLE = _house_table(DRISHTI_HOUSES)
+GOCHARA_TABLE = _house_table(GOCHARA_FAVORABLE)
+
+
+def natal_longitudes(chart: Dict[str, Any]) -> np.ndarray:
+    """The 9 graha longitudes of a JyotishAgent birth chart (NaN where missing)"""
+    grahas = (chart or {}).get("grahas", {})
+    return np.array([float(grahas.get(g, {}).get("degree", np.nan)) for g in GRAHAS])
+
+
+def transit_longitudes(positions: Dict[str, Any]) -> np.ndarray:
+    """The 9 graha longitudes from TransitsAgent.get_current_positions"""
+    planets = positions["planets"]
+    return np.array([float(planets[g.lower()]["longitude"]) for g in GRAHAS])
+
+
+def compute_aspects(
+    transit: np.ndarray,
+    natal: np.ndarray,
+    conjunction_orb: float = CONJUNCTION_ORB,
+    opposition_orb: float = OPPOSITION_ORB
+) -> Dict[str, np.ndarray]:
+    """
+    transit: (9,) longitudes; natal: (profiles, 9) longitudes.
+
+    Returns arrays indexed [profile, transiting graha, natal graha] for
+    separation, conjunction, opposition and drishti, and [profile, graha]
+    for gochara_house (0 when the natal Moon is unknown) and
+    gochara_favorable, plus sade_sati per profile.
+    """
+    transit = np.asarray(transit, dtype=np.float64)
+    natal = np.atleast_2d(np.asarray(natal, dtype=np.float64))
+    known = ~np.isnan(natal)
+
+    separation = np.abs((transit[None, :, None] - natal[:, None, :] + 180) % 360 - 180)
+    pair_known = np.broadcast_to(known[:, None, :], separation.shape)
+    conjunction = pair_known & (separation <= conjunction_orb)
+    opposition = pair_known & (separation >= 180 - opposition_orb)
+
+    transit_sign = (transit // 30).astype(np.int64) % 12
+    natal_sign = np.where(known, natal // 30, 0).astype(np.int64) % 12
+    # House of the natal graha counted from the transiting graha's sign
+    house_from_transit = (natal_sign[:, None, :] - transit_sign[None, :, None]) % 12 + 1
+    drishti = pair_known & DRISHTI_TABLE[np.arange(len(GRAHAS))[None, :, None], house_from_transit]
+
+    moon_known = known[:, MOON]
+    gochara_house = np.where(
+        moon_known[:, None], (transit_sign[None, :] - natal_sign[:, MOON:MOON + 1]) % 12 + 1, 0
+    )
+    gochara_favorable = moon_known[:, None] & GOCHARA_TABLE[np.arange(len(GRAHAS))[None, :], gochara_house]
+    sade_sati = moon_known & np.isin(gochara_house[:, SATURN], (12, 1, 2))
+
+    return {
+        "separation": separation,
+        "conjunction": conjunction,
+        "opposition": opposition,
+        "drishti": drishti,
+        "gochara_house": gochara_house,
+        "gochara_favorable": gochara_favorable,
+        "sade_sati": sade_sati,
+    }
+
+
+def describe_profile(aspects: Dict[str, np.ndarray], i: int) -> Dict[str, Any]:
+    """Per-profile summary of compute_aspects output (row i)"""
+    found: Dict[str, List[Dict[str, Any]]] = {"conjunctions": [], "oppositions": [], "drishti": []}
+    for kind, key in (("conjunctions", "conjunction"), ("oppositions", "opposition")):
+        for t, n in zip(*np.nonzero(aspects[key][i])):
+            found[kind].append({
+                "transit": GRAHAS[t], "natal": GRAHAS[n],
+                "orb": round(float(abs(aspects["separation"][i, t, n] - (0 if kind == "conjunctions" else 180))), 2),
+            })
+    for t, n in zip(*np.nonzero(aspects["drishti"][i])):
+        found["drishti"].append({"transit": GRAHAS[t], "natal": GRAHAS[n]})
+
+    houses = aspects["gochara_house"][i]
+    gochara: Optional[Dict[str, Any]] = None
+    if houses.any():
+        favorable = aspects["gochara_favorable"][i]
+        gochara = {
+            "houses": {GRAHAS[g]: int(houses[g]) for g in range(len(GRAHAS))},
+            "favorable": [GRAHAS[g] for g in np.flatnonzero(favorable)],
+            "score": int(favorable.sum()) * 2 - len(GRAHAS),
+            "sade_sati": bool(aspects["sade_sati"][i]),
+        }
+    return {**found, "gochara": gochara}
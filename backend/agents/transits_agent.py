@@ -12,6 +12,11 @@ from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 
+import numpy as np
+
+from .base_agent import BaseAgent, Location
+from .transit_aspects import compute_aspects, describe_profile, natal_longitudes, transit_longitudes
+
 
 # Vedic planet mappings
 PLANETS = {
@@ -75,7 +80,7 @@ class PlanetPosition:
     nakshatra_pada: int  # 1-4
 
 
-class TransitsAgent:
+class TransitsAgent(BaseAgent):
     """
     Agent for calculating current planetary positions (transits).
     
@@ -84,6 +89,7 @@ class TransitsAgent:
     - Sign (Rashi) and Nakshatra placements
     - Retrograde status
     - Speed of motion
+    - Transit-to-natal aspects and gochara, for one chart or many at once
     """
     
     name = "Transits Agent"
@@ -238,6 +244,29 @@ class TransitsAgent:
                 retrograde.append(pos["name"])
         return retrograde
     
+    def get_current_data(self, dt: datetime, location: Optional[Location] = None) -> Dict[str, Any]:
+        return self.get_current_positions(dt, "en")
+
+    def compare(self, current: Dict[str, Any], birth: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Transit-to-natal analysis: `current` from get_current_data and
+        `birth` a JyotishAgent birth chart.
+        """
+        aspects = compute_aspects(transit_longitudes(current), natal_longitudes(birth)[None, :])
+        return describe_profile(aspects, 0)
+
+    def compare_many(self, dt: datetime, charts: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        compare() for many natal charts (e.g. every active profile, keyed
+        by id): transits are computed once and all charts in one pass.
+        """
+        if not charts:
+            return {}
+        ids = list(charts)
+        natal = np.vstack([natal_longitudes(charts[i]) for i in ids])
+        aspects = compute_aspects(transit_longitudes(self.get_current_data(dt)), natal)
+        return {profile_id: describe_profile(aspects, row) for row, profile_id in enumerate(ids)}
+
     def get_significant_transits(
         self,
         dt: datetime,
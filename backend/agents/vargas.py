@@ -0,0 +1,101 @@
+"""
+Divisional charts (vargas) from natal longitudes.
+
+A varga splits each sign into N equal parts and maps every part to a sign.
+Placements are pure arithmetic on the sidereal (Lahiri) longitudes of the
+Ascendant and grahas, so they come from the longitudes calculate_birth_chart
+already has, with no ephemeris calls. The (sign, part) -> sign maps are
+precomputed per varga (Parashari rules), and a lookup is one fancy-indexing
+gather, for one chart or a (profiles, points) array of them:
+
+- D2 Hora: odd signs Leo then Cancer, even signs Cancer then Leo
+- D3 Drekkana: the sign, its 5th, its 9th
+- D7 Saptamsa: odd signs count from the sign, even signs from its 7th
+- D9 Navamsa: movable signs from the sign, fixed from its 9th, dual from its 5th
+- D10 Dasamsa: odd signs from the sign, even signs from its 9th
+- D12 Dwadasamsa: from the sign
+- D60 Shashtiamsa: from the sign
+
+"Odd" signs are Aries, Gemini, Leo, ... (sign index 0, 2, 4, ...).
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+RASHIS = ("Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+          "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces")
+POINTS = ("Ascendant", "Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu")
+VARGAS = {"D2": 2, "D3": 3, "D7": 7, "D9": 9, "D10": 10, "D12": 12, "D60": 60}
+LEO, CANCER = 4, 3
+
+
+def _start_sign(varga: str, sign: int) -> int:
+    """Sign the first part of `sign` maps to"""
+    odd = sign % 2 == 0
+    if varga == "D3":
+        return sign
+    if varga == "D7":
+        return sign if odd else sign + 6
+    if varga == "D9":
+        return sign + (0, 8, 4)[sign % 3]  # movable, fixed, dual
+    if varga == "D10":
+        return sign if odd else sign + 8
+    return sign  # D12, D60
+
+
+def _build_table(varga: str) -> np.ndarray:
+    parts = VARGAS[varga]
+    table = np.empty((12, parts), dtype=np.uint8)
+    for sign in range(12):
+        if varga == "D2":
+            table[sign] = (LEO, CANCER) if sign % 2 == 0 else (CANCER, LEO)
+        elif varga == "D3":
+            table[sign] = [(sign + 4 * part) % 12 for part in range(parts)]
+        else:
+            table[sign] = [(_start_sign(varga, sign) + part) % 12 for part in range(parts)]
+    return table
+
+
+VARGA_TABLES = {varga: _build_table(varga) for varga in VARGAS}
+
+
+def varga_signs(longitudes, varga: str) -> np.ndarray:
+    """
+    Sign index (0 = Aries) in `varga` for every longitude (any shape).
+    NaN longitudes give 255.
+    """
+    if varga not in VARGA_TABLES:
+        raise ValueError(f"Unknown varga '{varga}'. Use one of: {', '.join(VARGAS)}")
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    known = ~np.isnan(longitudes)
+    safe = np.where(known, longitudes, 0.0) % 360
+    sign = (safe // 30).astype(np.int64)
+    # min() guards against float edge cases at the very end of a sign
+    part = np.minimum((safe % 30 * VARGAS[varga] / 30).astype(np.int64), VARGAS[varga] - 1)
+    return np.where(known, VARGA_TABLES[varga][sign, part], 255).astype(np.uint8)
+
+
+def divisional_charts_batch(longitudes, vargas: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    longitudes: (profiles, len(POINTS)) array in POINTS order.
+    Returns {varga: (profiles, len(POINTS)) sign indexes}.
+    """
+    return {varga: varga_signs(longitudes, varga) for varga in (vargas or VARGAS)}
+
+
+def chart_longitudes(chart: Dict[str, Any]) -> np.ndarray:
+    """POINTS longitudes from a calculate_birth_chart result (NaN where missing)"""
+    chart = chart or {}
+    values = [chart.get("ascendant", {}).get("degree", np.nan)]
+    values += [chart.get("grahas", {}).get(point, {}).get("degree", np.nan) for point in POINTS[1:]]
+    return np.array(values, dtype=np.float64)
+
+
+def divisional_charts(longitudes, vargas: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Optional[str]]]:
+    """One chart: {varga: {point: sign name}} from POINTS-ordered longitudes"""
+    signs = divisional_charts_batch(np.asarray(longitudes, dtype=np.float64)[None, :], vargas)
+    return {
+        varga: {point: (RASHIS[s] if s < 12 else None) for point, s in zip(POINTS, row[0])}
+        for varga, row in signs.items()
+    }
@@ -0,0 +1,99 @@
+"""
+Vimshottari dasha timeline.
+
+The 120-year Vimshottari cycle runs through nine planetary periods
+(mahadashas). Each is divided into nine antardashas, and each of those into
+nine pratyantardashas, always in the same order. Every subperiod starts
+with its parent's lord and has length parent * years(lord) / 120.
+
+The first mahadasha belongs to the lord of the natal Moon's nakshatra. The
+part of it that remains at birth is proportional to how much of the
+nakshatra the Moon still has to cross.
+
+Each level is stored as two sorted arrays (start times in epoch seconds
+and lord indexes). Finding the period at a date is a binary search
+(np.searchsorted), O(log n), over 10 / 90 / 810 entries.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+DASHA_LORDS = ("Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury")
+DASHA_YEARS = np.array([7, 20, 6, 10, 7, 18, 16, 19, 17], dtype=np.float64)
+CYCLE_YEARS = 120
+YEAR_SECONDS = 365.25 * 86400
+NAKSHATRA_SPAN = 360 / 27
+LEVELS = ("mahadasha", "antardasha", "pratyantardasha")
+
+
+def _subdivide(starts: np.ndarray, lords: np.ndarray, lengths: np.ndarray):
+    """Split every period into its nine subperiods, starting with its own lord"""
+    sub_lords = (lords[:, None] + np.arange(9)) % 9
+    sub_lengths = lengths[:, None] * DASHA_YEARS[sub_lords] / CYCLE_YEARS
+    offsets = np.cumsum(sub_lengths, axis=1) - sub_lengths
+    return (starts[:, None] + offsets).ravel(), sub_lords.ravel(), sub_lengths.ravel()
+
+
+def _aware(dt: datetime) -> datetime:
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _iso(seconds: float) -> str:
+    return datetime.fromtimestamp(float(seconds), tz=timezone.utc).isoformat(timespec="seconds")
+
+
+class DashaTimeline:
+    """Mahadasha, antardasha and pratyantardasha boundaries from birth for 120 years"""
+
+    def __init__(self, moon_longitude: float, birth: datetime, years: int = CYCLE_YEARS):
+        self.birth = _aware(birth).timestamp()
+        nakshatra = int(moon_longitude % 360 // NAKSHATRA_SPAN)
+        first = nakshatra % 9
+        elapsed = (moon_longitude % NAKSHATRA_SPAN) / NAKSHATRA_SPAN
+
+        # Enough mahadashas to cover birth + years (one extra when the first is partial)
+        count = 9 * (years // CYCLE_YEARS + 1) + 1
+        lords = (first + np.arange(count)) % 9
+        lengths = DASHA_YEARS[lords] * YEAR_SECONDS
+        starts = self.birth - DASHA_YEARS[first] * elapsed * YEAR_SECONDS + np.cumsum(lengths) - lengths
+        keep = starts < self.birth + years * YEAR_SECONDS
+        starts, lords, lengths = starts[keep], lords[keep], lengths[keep]
+
+        self.end = float(starts[-1] + lengths[-1])
+        self.balance_at_birth = {
+            "lord": DASHA_LORDS[first],
+            "years": round(float(DASHA_YEARS[first] * (1 - elapsed)), 4),
+        }
+        self._levels = {}
+        for level in LEVELS:
+            self._levels[level] = (starts, lords.astype(np.uint8))
+            starts, lords, lengths = _subdivide(starts, lords, lengths)
+
+    def _period(self, level: str, i: int) -> Dict[str, Any]:
+        starts, lords = self._levels[level]
+        end = starts[i + 1] if i + 1 < len(starts) else self.end
+        return {"lord": DASHA_LORDS[lords[i]], "start": _iso(starts[i]), "end": _iso(end)}
+
+    def at(self, when: Optional[datetime] = None) -> Dict[str, Any]:
+        """Periods running at `when` (default now); ValueError outside the timeline"""
+        when = _aware(when or datetime.now(timezone.utc))
+        t = when.timestamp()
+        if not self._levels["mahadasha"][0][0] <= t < self.end:
+            raise ValueError("Date is outside the dasha timeline")
+
+        result: Dict[str, Any] = {"at": when.isoformat()}
+        for level in LEVELS:
+            starts, _ = self._levels[level]
+            result[level] = self._period(level, int(np.searchsorted(starts, t, side="right")) - 1)
+        return result
+
+    def periods(self, level: str = "mahadasha", start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Periods of `level` overlapping [start, end) (default: the whole timeline)"""
+        if level not in self._levels:
+            raise ValueError(f"level must be one of: {', '.join(LEVELS)}")
+        starts, _ = self._levels[level]
+        lo = 0 if start is None else max(int(np.searchsorted(starts, _aware(start).timestamp(), side="right")) - 1, 0)
+        hi = len(starts) if end is None else int(np.searchsorted(starts, _aware(end).timestamp(), side="left"))
+        return [self._period(level, i) for i in range(lo, hi)]
@@ -40,6 +40,22 @@ create policy "Users can delete own profiles"
 create index if not exists profiles_user_id_idx on profiles(user_id);
 create index if not exists profiles_active_idx on profiles(user_id, is_active);
 
+-- At most one active profile per user.
+-- Existing duplicates are resolved first (the most recently updated one stays active).
+update profiles set is_active = false
+where id in (
+  select id from (
+    select id, row_number() over (partition by user_id order by updated_at desc) as rn
+    from profiles
+    where is_active
+  ) ranked
+  where rn > 1
+);
+
+create unique index if not exists profiles_one_active_per_user_idx
+  on profiles(user_id)
+  where is_active;
+
 -- Action Log Table
 -- Tracks all major operations for debugging and audit trail
 
@@ -82,3 +98,64 @@ create trigger update_profiles_updated_at
   before update on profiles
   for each row
   execute function update_updated_at_column();
+
+-- Atomic profile switching
+-- Called by ProfileService via RPC: one round-trip, one transaction, so a user
+-- never has zero or two active profiles. The user's rows are locked first to
+-- serialize concurrent switches for the same user.
+
+create or replace function switch_active_profile(p_user_id uuid, p_profile_id uuid)
+returns setof profiles
+language plpgsql
+set search_path = public
+as $$
+begin
+  perform 1 from profiles where user_id = p_user_id for update;
+
+  if not exists (select 1 from profiles where id = p_profile_id and user_id = p_user_id) then
+    return;  -- unknown profile: leave the current active profile alone
+  end if;
+
+  update profiles set is_active = false
+  where user_id = p_user_id and is_active and id <> p_profile_id;
+
+  return query
+    update profiles set is_active = true
+    where id = p_profile_id and user_id = p_user_id
+    returning *;
+end;
+$$;
+
+create or replace function create_profile(p_user_id uuid, p_profile jsonb)
+returns setof profiles
+language plpgsql
+set search_path = public
+as $$
+declare
+  v_active boolean := coalesce((p_profile->>'is_active')::boolean, true);
+begin
+  perform 1 from profiles where user_id = p_user_id for update;
+
+  if v_active then
+    update profiles set is_active = false
+    where user_id = p_user_id and is_active;
+  end if;
+
+  return query
+    insert into profiles (
+      user_id, profile_name, birth_date, birth_time, birth_place,
+      birth_lat, birth_lng, birth_timezone, is_active
+    ) values (
+      p_user_id,
+      coalesce(p_profile->>'profile_name', 'Main Profile'),
+      (p_profile->>'birth_date')::date,
+      (p_profile->>'birth_time')::time,
+      p_profile->>'birth_place',
+      (p_profile->>'birth_lat')::numeric,
+      (p_profile->>'birth_lng')::numeric,
+      p_profile->>'birth_timezone',
+      v_active
+    )
+    returning *;
+end;
+$$;
@@ -0,0 +1,73 @@
+-- Delta sync support for /api/sync (SyncService)
+-- Run this in Supabase SQL Editor after supabase_setup.sql and tasks_migration.sql
+
+-- ==================== UPDATED_AT ====================
+-- Sync finds changed rows by updated_at, so every write must bump it.
+-- update_updated_at_column() is defined in supabase_setup.sql.
+DROP TRIGGER IF EXISTS update_tasks_updated_at ON tasks;
+CREATE TRIGGER update_tasks_updated_at
+    BEFORE UPDATE ON tasks
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+DROP TRIGGER IF EXISTS update_projects_updated_at ON projects;
+CREATE TRIGGER update_projects_updated_at
+    BEFORE UPDATE ON projects
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Keyset scans on (updated_at, id) per user
+CREATE INDEX IF NOT EXISTS idx_tasks_user_updated ON tasks(user_id, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_projects_user_updated ON projects(user_id, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_profiles_user_updated ON profiles(user_id, updated_at, id);
+
+-- ==================== DELETION LOG ====================
+-- One tombstone per deleted row, so clients can drop it from their replica.
+CREATE TABLE IF NOT EXISTS deleted_records (
+    seq BIGSERIAL PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    record_id UUID NOT NULL,
+    user_id UUID NOT NULL,
+    deleted_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_deleted_records_user_seq ON deleted_records(user_id, seq);
+
+-- Tombstones older than any client's last sync are safe to prune, e.g.:
+--   DELETE FROM deleted_records WHERE deleted_at < NOW() - INTERVAL '90 days';
+-- A client whose cursor is older than that should resync from scratch.
+
+ALTER TABLE deleted_records ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view own deleted records" ON deleted_records
+    FOR SELECT USING (auth.uid()::text = user_id::text);
+
+CREATE POLICY "Service role full access to deleted_records" ON deleted_records
+    FOR ALL USING (auth.role() = 'service_role');
+
+CREATE OR REPLACE FUNCTION log_deleted_record()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO deleted_records (table_name, record_id, user_id)
+    VALUES (TG_TABLE_NAME, OLD.id, OLD.user_id);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS log_tasks_deleted ON tasks;
+CREATE TRIGGER log_tasks_deleted
+    AFTER DELETE ON tasks
+    FOR EACH ROW
+    EXECUTE FUNCTION log_deleted_record();
+
+DROP TRIGGER IF EXISTS log_projects_deleted ON projects;
+CREATE TRIGGER log_projects_deleted
+    AFTER DELETE ON projects
+    FOR EACH ROW
+    EXECUTE FUNCTION log_deleted_record();
+
+DROP TRIGGER IF EXISTS log_profiles_deleted ON profiles;
+CREATE TRIGGER log_profiles_deleted
+    AFTER DELETE ON profiles
+    FOR EACH ROW
+    EXECUTE FUNCTION log_deleted_record();
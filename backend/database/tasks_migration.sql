@@ -48,6 +48,11 @@ CREATE TABLE IF NOT EXISTS tasks (
     completed_at TIMESTAMPTZ
 );
 
+-- Recurring tasks: occurrences are rows with parent_task_id set (services/recurrence.py)
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS recurrence_id TIMESTAMPTZ;  -- occurrence start, fixed even if rescheduled
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS recurrence_expanded_until TIMESTAMPTZ;  -- templates: materialized up to here
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS timezone TEXT;  -- templates: IANA zone the rule is expanded in (NULL = UTC)
+
 -- ==================== INDEXES ====================
 -- Create indexes for common queries
 CREATE INDEX IF NOT EXISTS idx_tasks_user_id ON tasks(user_id);
@@ -57,6 +62,15 @@ CREATE INDEX IF NOT EXISTS idx_tasks_scheduled_at ON tasks(scheduled_at);
 CREATE INDEX IF NOT EXISTS idx_tasks_life_sphere ON tasks(life_sphere);
 CREATE INDEX IF NOT EXISTS idx_tasks_project_id ON tasks(project_id);
 
+-- Keyset pagination on (created_at, id) for task lists (TaskService.get_tasks_page)
+CREATE INDEX IF NOT EXISTS idx_tasks_user_created ON tasks(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_status_created ON tasks(user_id, status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_type_created ON tasks(user_id, task_type, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_project_created ON tasks(user_id, project_id, created_at DESC, id DESC);
+
+-- One row per occurrence; lets expansion upsert with ignore-duplicates
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_parent_recurrence ON tasks(parent_task_id, recurrence_id);
+
 CREATE INDEX IF NOT EXISTS idx_projects_user_id ON projects(user_id);
 CREATE INDEX IF NOT EXISTS idx_projects_status ON projects(status);
 
@@ -6,38 +6,27 @@ load_dotenv()
 # import opik
 # opik.configure(use_local=True) # Fails in production without OPIK_URL_OVERRIDE
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
-from agents.numerology_expert import NumerologyExpertAgent
-from agents.mayan_agent import MayanAgent
-from agents.jyotish_agent import JyotishAgent
-from orchestrator import StrategyOrchestrator
-from services.profile_service import ProfileService
+from typing import Optional, Dict, Any, List
+from registry import create_agent_registry
 from webhook_router import create_webhook_router
+from services.task_service import TaskCreate, TaskUpdate, TaskStatus, TaskType
 
-# Try to import pyswisseph-dependent agents
-try:
-    from agents.muhurtas_agent import MuhurtasAgent
-    from agents.transits_agent import TransitsAgent
-    SWISSEPH_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: pyswisseph not available, muhurtas and transits disabled: {e}")
-    MuhurtasAgent = None
-    TransitsAgent = None
-    SWISSEPH_AVAILABLE = False
-
-# Try to import task service (may fail if tables don't exist)
-try:
-    from services.task_service import TaskService, TaskCreate, TaskUpdate, TaskStatus, TaskType
-    TASK_SERVICE_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: TaskService import failed: {e}")
-    TaskService = None
-    TASK_SERVICE_AVAILABLE = False
-
-app = FastAPI(title="Calendar Orchestrator API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Drain buffered action logs before the worker exits
+    if registry.is_loaded("profile_service"):
+        await registry.get("profile_service").close()
+    if registry.is_loaded("transition_scheduler"):
+        await registry.get("transition_scheduler").close()
+    from services.db import close_db
+    await close_db()
+
+app = FastAPI(title="Calendar Orchestrator API", lifespan=lifespan)
 
 # Allow CORS for Frontend
 app.add_middleware(
@@ -48,31 +37,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize Agents and Services
-numerology_agent = NumerologyExpertAgent()
-mayan_agent = MayanAgent()
-jyotish_agent = JyotishAgent()
-orchestrator = StrategyOrchestrator()
+# Agents and Services are built lazily on first use (see registry.py).
+# The names below are LazyAgent proxies: falsy when unavailable
+# (e.g. pyswisseph not installed, Supabase credentials missing).
+registry = create_agent_registry()
 
-# Initialize pyswisseph-dependent agents (only if available)
-muhurtas_agent = MuhurtasAgent() if SWISSEPH_AVAILABLE and MuhurtasAgent else None
-transits_agent = TransitsAgent() if SWISSEPH_AVAILABLE and TransitsAgent else None
+numerology_agent = registry.proxy("numerology")
+mayan_agent = registry.proxy("mayan")
+jyotish_agent = registry.proxy("jyotish")
+orchestrator = registry.proxy("orchestrator")
 
-# Initialize Profile Service
-try:
-    profile_service = ProfileService()
-except ValueError as e:
-    print(f"Warning: ProfileService not initialized: {e}")
-    profile_service = None
+# pyswisseph-dependent agents
+muhurtas_agent = registry.proxy("muhurtas")
+transits_agent = registry.proxy("transits")
+SWISSEPH_AVAILABLE = bool(muhurtas_agent)
 
-# Initialize Task Service
-task_service = None
-if TASK_SERVICE_AVAILABLE and TaskService:
-    try:
-        task_service = TaskService()
-    except ValueError as e:
-        print(f"Warning: TaskService not initialized: {e}")
-        task_service = None
+profile_service = registry.proxy("profile_service")
+task_service = registry.proxy("task_service")
+sync_service = registry.proxy("sync_service")
+bootstrap_service = registry.proxy("bootstrap")
+forecast_service = registry.proxy("forecast")
+day_index_service = registry.proxy("day_index")
+bulk_muhurtas_service = registry.proxy("bulk_muhurtas")
+transition_scheduler = registry.proxy("transition_scheduler")
+live_hub = registry.proxy("live")
 
 # Initialize Webhook Router
 webhook_router = create_webhook_router(
@@ -81,7 +69,9 @@ webhook_router = create_webhook_router(
     jyotish_agent=jyotish_agent,
     mayan_agent=mayan_agent,
     numerology_agent=numerology_agent,
-    orchestrator=orchestrator
+    orchestrator=orchestrator,
+    forecast_service=forecast_service,
+    day_index_service=day_index_service
 )
 print(f"Webhook router initialized with {len(webhook_router._actions)} actions")
 
@@ -126,16 +116,123 @@ def health_check():
         "status": "ok", 
         "service": "Calendar Orchestrator",
         "services": {
-            "profile": profile_service is not None,
-            "tasks": task_service is not None,
-            "muhurtas": muhurtas_agent is not None,
-            "transits": transits_agent is not None,
+            "profile": bool(profile_service),
+            "tasks": bool(task_service),
+            "sync": bool(sync_service),
+            "forecast": bool(forecast_service),
+            "day_index": bool(day_index_service),
+            "bulk_muhurtas": bool(bulk_muhurtas_service),
+            "alerts": bool(transition_scheduler),
+            "live": bool(live_hub),
+            "muhurtas": bool(muhurtas_agent),
+            "transits": bool(transits_agent),
             "pyswisseph": SWISSEPH_AVAILABLE,
             "webhook": True,
             "webhook_actions": len(webhook_router._actions)
-        }
+        },
+        "agents": registry.status(),
+        "action_log": (
+            registry.get("profile_service").log_writer.get_stats()
+            if registry.is_loaded("profile_service") else None
+        ),
+        "profile_cache": (
+            registry.get("profile_service").cache.stats
+            if registry.is_loaded("profile_service") else None
+        )
     }
 
+# ==================== BOOTSTRAP ====================
+
+@app.get("/api/bootstrap")
+async def bootstrap(
+    user_id: str = Header(..., alias="X-User-Id"),
+    date: Optional[str] = None,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    language: str = "ru",
+    name: Optional[str] = None,
+    stream: bool = False
+):
+    """
+    First screen in one round-trip: active profile, today's tasks, numerology,
+    Mayan, Panchanga, birth chart, muhurtas and transits, computed concurrently.
+    
+    The AI strategy is included when cached. Otherwise strategy_status is
+    "pending"; with stream=true the response is NDJSON: a "bootstrap" event
+    right away and a "strategy" event when generation finishes.
+    """
+    if not bootstrap_service:
+        raise HTTPException(status_code=503, detail="Bootstrap service unavailable")
+    try:
+        payload, strategy_job = await bootstrap_service.assemble(
+            user_id, date=date, latitude=latitude, longitude=longitude, language=language, name=name
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if not stream:
+        return payload
+    
+    import json
+    from fastapi.responses import StreamingResponse
+    
+    async def events():
+        yield json.dumps({"type": "bootstrap", **payload}, default=str) + "\n"
+        if strategy_job is not None:
+            strategy = await strategy_job
+            yield json.dumps({
+                "type": "strategy",
+                "strategy": strategy,
+                "strategy_status": "ready" if strategy else "failed"
+            }) + "\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+# ==================== FORECAST ====================
+
+@app.get("/api/forecast")
+async def get_forecast(dob: str, start: Optional[str] = None, days: int = 30, language: str = "ru"):
+    """
+    Day-by-day scores for `days` days from `start` (default today): status,
+    score, notes and the underlying numerology/Mayan/Panchanga numbers, as
+    columns. Long horizons (90, 365) are cached server-side.
+    """
+    if not forecast_service:
+        raise HTTPException(status_code=503, detail="Forecast service unavailable")
+    try:
+        return await forecast_service.get_forecast(dob, start=start, days=days, language=language)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ==================== DATE SEARCH ====================
+
+class FindDatesRequest(BaseModel):
+    where: Optional[Dict[str, Any]] = None
+    any_of: Optional[List[Dict[str, Any]]] = None
+    exclude: Optional[Dict[str, Any]] = None
+    start: Optional[str] = None
+    end: Optional[str] = None
+    limit: int = 20
+    dob: Optional[str] = None
+
+@app.post("/api/dates/find")
+async def find_dates(request: FindDatesRequest):
+    """
+    Dates (1900-2100) matching day features, e.g.
+    {"where": {"tithi": "Ekadashi", "nakshatra": "Pushya", "tone": 1}} or
+    {"where": {"vibration": 8}, "exclude": {"yoga": "malefic"}, "dob": "1990-05-17"}.
+    """
+    if not day_index_service:
+        raise HTTPException(status_code=503, detail="Date search unavailable")
+    try:
+        return await day_index_service.find_dates(**request.dict())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ==================== WEBHOOK ====================
 
 class WebhookRequest(BaseModel):
@@ -172,13 +269,10 @@ def get_muhurtas(request: MuhurtasRequest):
     if not muhurtas_agent:
         raise HTTPException(status_code=503, detail="Muhurtas service unavailable (pyswisseph not installed)")
     
-    from datetime import datetime, timezone
+    from agents.muhurtas_agent import location_datetime
     
     try:
-        if request.datetime_str:
-            dt = datetime.fromisoformat(request.datetime_str.replace('Z', '+00:00'))
-        else:
-            dt = datetime.now(timezone.utc)
+        dt = location_datetime(request.datetime_str, request.latitude, request.longitude)
         
         result = muhurtas_agent.get_all_muhurtas(
             dt, 
@@ -198,15 +292,201 @@ def get_current_hora(latitude: float, longitude: float, language: str = "ru"):
     if not muhurtas_agent:
         raise HTTPException(status_code=503, detail="Hora service unavailable (pyswisseph not installed)")
     
-    from datetime import datetime, timezone
+    from agents.muhurtas_agent import location_datetime
     
     try:
-        dt = datetime.now(timezone.utc)
+        dt = location_datetime(None, latitude, longitude)
         hora = muhurtas_agent.get_current_hora(dt, latitude, longitude, language)
         return {"success": True, "hora": hora}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/muhurtas/timeline")
+def get_day_timeline(latitude: float, longitude: float, date: Optional[str] = None, language: str = "ru"):
+    """
+    The whole day as one sorted interval list (horas, choghadiyas, kalas,
+    Brahma and Abhijit muhurtas) with `next_transition`: fetch once, then
+    sleep until that timestamp instead of polling /api/hora.
+    """
+    if not muhurtas_agent:
+        raise HTTPException(status_code=503, detail="Muhurtas service unavailable (pyswisseph not installed)")
+    
+    from agents.muhurtas_agent import location_datetime
+    
+    try:
+        day = location_datetime(date, latitude, longitude)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="date must be ISO formatted (YYYY-MM-DD)")
+    try:
+        return {"success": True, "timeline": muhurtas_agent.get_day_timeline(day, latitude, longitude, language)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+MAX_CALENDAR_DAYS = int(os.getenv("MAX_CALENDAR_DAYS", "1096"))
+
+@app.get("/api/muhurtas/calendar")
+def get_muhurtas_calendar(
+    latitude: float,
+    longitude: float,
+    start: Optional[str] = None,
+    days: int = 365,
+    timezone: Optional[str] = None,
+    precise: bool = False
+):
+    """
+    Daily sunrise/sunset and muhurta windows for up to MAX_CALENDAR_DAYS
+    (annual calendars). Fast analytic sun times by default (within seconds
+    of Swiss Ephemeris); precise=true solves every day with Swiss Ephemeris.
+    Times are in `timezone`, by default the zone at the coordinates.
+    """
+    if not muhurtas_agent:
+        raise HTTPException(status_code=503, detail="Muhurtas service unavailable (pyswisseph not installed)")
+    
+    from datetime import datetime
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    from agents.muhurtas_agent import timezone_at
+    
+    if not 1 <= days <= MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail=f"days must be between 1 and {MAX_CALENDAR_DAYS}")
+    try:
+        tz = ZoneInfo(timezone or timezone_at(latitude, longitude))
+        day = datetime.fromisoformat(start).replace(tzinfo=tz) if start else datetime.now(tz)
+    except (ValueError, ZoneInfoNotFoundError):
+        raise HTTPException(status_code=400, detail="start must be YYYY-MM-DD and timezone an IANA name")
+    try:
+        return {"success": True, "calendar": muhurtas_agent.get_muhurtas_calendar(day, days, latitude, longitude, precise)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+class BulkMuhurtasUser(BaseModel):
+    user_id: str
+    latitude: float
+    longitude: float
+    timezone: str = "UTC"
+
+class BulkMuhurtasRequest(BaseModel):
+    users: List[BulkMuhurtasUser]
+    datetime_str: Optional[str] = None  # ISO format, defaults to now
+    language: str = "ru"
+    precision: Optional[int] = None  # geohash length, defaults to BULK_MUHURTAS_PRECISION
+
+@app.post("/api/muhurtas/bulk")
+def get_bulk_muhurtas(request: BulkMuhurtasRequest):
+    """
+    Muhurtas for many users (broadcast alerts), computed once per geohash
+    cluster and streamed as NDJSON: a "cluster" event with its approximation
+    error, one "user" event per member, then a "summary".
+    """
+    if not bulk_muhurtas_service:
+        raise HTTPException(status_code=503, detail="Muhurtas service unavailable (pyswisseph not installed)")
+    
+    import json
+    from datetime import datetime
+    from fastapi.responses import StreamingResponse
+    
+    try:
+        dt = datetime.fromisoformat(request.datetime_str.replace('Z', '+00:00')) if request.datetime_str else None
+        events = bulk_muhurtas_service.stream(
+            [user.dict() for user in request.users], dt, request.language, request.precision
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return StreamingResponse(
+        (json.dumps(event, default=str) + "\n" for event in events), media_type="application/x-ndjson"
+    )
+
+# ==================== ALERTS ====================
+
+class AlertSubscriptionRequest(BaseModel):
+    latitude: float
+    longitude: float
+    timezone: Optional[str] = None  # default: the zone at the coordinates
+    kinds: Optional[List[str]] = None  # default: hora, rahu_kala
+    lead_minutes: Optional[List[int]] = None  # e.g. [10, 0]: "starts in 10 min" and "started"
+    language: str = "ru"
+    webhook_url: Optional[str] = None
+
+@app.post("/api/alerts/subscribe")
+async def subscribe_alerts(request: AlertSubscriptionRequest, user_id: str = Header(..., alias="X-User-Id")):
+    """
+    Push hora / muhurta transitions for a location instead of polling
+    /api/hora: events are precomputed for the next 24h and POSTed to
+    webhook_url (and to live listeners) when they start.
+    """
+    if not transition_scheduler:
+        raise HTTPException(status_code=503, detail="Alerts unavailable (pyswisseph not installed)")
+    try:
+        # Called on the event loop so the firing task starts there; a new
+        # cell costs a few milliseconds of timeline math
+        result = transition_scheduler.subscribe(user_id, **request.dict())
+        return {"success": True, "subscription": result}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.delete("/api/alerts/subscribe")
+def unsubscribe_alerts(user_id: str = Header(..., alias="X-User-Id")):
+    if not transition_scheduler:
+        raise HTTPException(status_code=503, detail="Alerts unavailable (pyswisseph not installed)")
+    return {"success": True, "removed": transition_scheduler.unsubscribe(user_id)}
+
+@app.get("/api/alerts/upcoming")
+def upcoming_alerts(user_id: str = Header(..., alias="X-User-Id"), limit: int = 20):
+    """The user's next scheduled transition events"""
+    if not transition_scheduler:
+        raise HTTPException(status_code=503, detail="Alerts unavailable (pyswisseph not installed)")
+    return {"success": True, "events": transition_scheduler.upcoming(user_id, max(1, min(limit, 500)))}
+
+@app.get("/api/live")
+async def live_transitions(
+    latitude: float,
+    longitude: float,
+    timezone: Optional[str] = None,
+    kinds: Optional[str] = None,
+    language: str = "ru"
+):
+    """
+    Server-Sent Events instead of polling /api/hora: a "snapshot" event
+    with the intervals active now, then a "transition" event whenever a
+    hora changes or a window (Rahu Kala, Brahma Muhurta, ...) starts or
+    ends. kinds is comma separated (default: hora and all windows);
+    timezone defaults to the zone at the coordinates.
+    """
+    if not live_hub:
+        raise HTTPException(status_code=503, detail="Live updates unavailable (pyswisseph not installed)")
+    
+    import json
+    from fastapi.responses import StreamingResponse
+    from services.live import LiveLimitError, kinds_from_query
+    
+    try:
+        conn = await live_hub.connect(latitude, longitude, timezone, kinds_from_query(kinds), language)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LiveLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    async def stream():
+        try:
+            async for event in live_hub.events(conn):
+                if event is None:
+                    yield ": ping\n\n"  # keeps proxies from closing an idle stream
+                else:
+                    yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            live_hub.disconnect(conn)
+    
+    return StreamingResponse(
+        stream(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/transits")
 def get_transits(language: str = "ru"):
     """Get current planetary positions (transits)"""
@@ -253,8 +533,9 @@ def analyze_day(request: DateRequest):
         
         jyotish_data = jyotish_agent.calculate_panchanga(request.date)
 
-        # Calculate Birth Chart if data available
+        # Calculate Birth Chart (and the running dasha) if data available
         birth_chart = None
+        dasha = None
         if request.birth_time and request.latitude and request.longitude:
             try:
                 birth_chart = jyotish_agent.calculate_birth_chart(
@@ -263,6 +544,9 @@ def analyze_day(request: DateRequest):
                     latitude=request.latitude,
                     longitude=request.longitude
                 )
+                dasha = jyotish_agent.calculate_dasha(
+                    request.dob, request.birth_time, request.latitude, request.longitude, date=request.date
+                )
             except Exception as e:
                 print(f"Error calculating birth chart for analysis: {e}")
 
@@ -274,7 +558,8 @@ def analyze_day(request: DateRequest):
             jyotish=jyotish_data,
             user_name=request.name,
             language=request.language,
-            birth_chart=birth_chart
+            birth_chart=birth_chart,
+            dasha=dasha
         )
         
         # Handle backward compatibility if it returns just string (unlikely with recent change but safe)
@@ -318,6 +603,23 @@ def calculate_birth_chart(request: BirthChartRequest):
             "traceback": traceback.format_exc()
         }
 
+class DivisionalChartRequest(BirthChartRequest):
+    vargas: Optional[List[str]] = None
+
+@app.post("/api/birth-chart/vargas")
+def calculate_divisional_charts(request: DivisionalChartRequest):
+    """Divisional charts (D2/D3/D7/D9/D10/D12/D60) from the cached natal longitudes"""
+    if not jyotish_agent:
+        raise HTTPException(status_code=503, detail="Jyotish agent unavailable")
+    try:
+        return jyotish_agent.calculate_divisional_charts(
+            request.birth_date, request.birth_time, request.latitude, request.longitude, vargas=request.vargas
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/debug-jyotish")
 def debug_jyotish():
     """Manual trigger to test Birth Chart Calculation and see traceback"""
@@ -428,6 +730,31 @@ async def get_logs(user_id: str = Header(..., alias="X-User-Id"), limit: int = 5
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# ==================== DELTA SYNC ====================
+
+@app.get("/api/sync")
+async def sync_changes(
+    user_id: str = Header(..., alias="X-User-Id"),
+    since: Optional[str] = None,
+    limit: Optional[int] = None
+):
+    """
+    Tasks, projects and profiles changed since the cursor, with tombstones.
+    
+    Omit `since` for a full snapshot. Store `next_cursor` and send it on the
+    next poll; if `has_more` is true, poll again right away.
+    """
+    if not sync_service:
+        raise HTTPException(status_code=503, detail="Sync service unavailable")
+    if limit is not None and not 1 <= limit <= 1000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
+    try:
+        return await sync_service.get_changes(user_id, since=since, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ==================== TASK MANAGEMENT ====================
 
 class TaskCreateRequest(BaseModel):
@@ -451,6 +778,35 @@ class TaskUpdateRequest(BaseModel):
     project_id: Optional[str] = None
     life_sphere: Optional[str] = None
 
+def to_task_create(request: TaskCreateRequest) -> TaskCreate:
+    """Convert an API request (ISO strings) to the service model"""
+    from datetime import datetime, date as date_type
+    return TaskCreate(
+        title=request.title,
+        description=request.description,
+        task_type=TaskType(request.task_type),
+        scheduled_at=datetime.fromisoformat(request.scheduled_at) if request.scheduled_at else None,
+        due_date=date_type.fromisoformat(request.due_date) if request.due_date else None,
+        estimated_duration=request.estimated_duration,
+        project_id=request.project_id,
+        life_sphere=request.life_sphere
+    )
+
+def to_task_update(request: TaskUpdateRequest) -> TaskUpdate:
+    """Convert an API request (ISO strings) to the service model"""
+    from datetime import datetime, date as date_type
+    return TaskUpdate(
+        title=request.title,
+        description=request.description,
+        task_type=TaskType(request.task_type) if request.task_type else None,
+        status=TaskStatus(request.status) if request.status else None,
+        scheduled_at=datetime.fromisoformat(request.scheduled_at) if request.scheduled_at else None,
+        due_date=date_type.fromisoformat(request.due_date) if request.due_date else None,
+        estimated_duration=request.estimated_duration,
+        project_id=request.project_id,
+        life_sphere=request.life_sphere
+    )
+
 @app.get("/api/tasks")
 async def get_tasks(
     user_id: str = Header(..., alias="X-User-Id"),
@@ -458,18 +814,28 @@ async def get_tasks(
     task_type: Optional[str] = None,
     life_sphere: Optional[str] = None,
     project_id: Optional[str] = None,
-    limit: int = 100
+    limit: int = 100,
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
-    """Get user's tasks with optional filters"""
+    """Get user's tasks with optional filters.
+    
+    Paginate with `cursor` (from the previous page's `next_cursor`);
+    `fields` is a comma-separated column list, e.g. "title,status,due_date".
+    """
     if not task_service:
         raise HTTPException(status_code=503, detail="Task service unavailable")
     try:
         status_enum = TaskStatus(status) if status else None
         type_enum = TaskType(task_type) if task_type else None
-        tasks = await task_service.get_tasks(
-            user_id, status_enum, type_enum, life_sphere, project_id, limit
+        field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+        page = await task_service.get_tasks_page(
+            user_id, status_enum, type_enum, life_sphere, project_id, limit,
+            fields=field_list, cursor=cursor
         )
-        return {"tasks": tasks}
+        return {"tasks": page["tasks"], "next_cursor": page["next_cursor"]}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -482,19 +848,163 @@ async def create_task(
     if not task_service:
         raise HTTPException(status_code=503, detail="Task service unavailable")
     try:
-        from datetime import datetime, date as date_type
-        task_data = TaskCreate(
-            title=request.title,
-            description=request.description,
-            task_type=TaskType(request.task_type),
-            scheduled_at=datetime.fromisoformat(request.scheduled_at) if request.scheduled_at else None,
-            due_date=date_type.fromisoformat(request.due_date) if request.due_date else None,
-            estimated_duration=request.estimated_duration,
-            project_id=request.project_id,
-            life_sphere=request.life_sphere
-        )
+        task_data = to_task_create(request)
         task = await task_service.create_task(user_id, task_data)
-        return {"success": True, "task": task}
+        conflicts = await task_service.check_conflicts(user_id, task) if task else []
+        return {"success": True, "task": task, "conflicts": conflicts}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ==================== BULK TASKS ====================
+# Declared before /api/tasks/{task_id} so "bulk" is not taken for a task id.
+# Items are validated one by one: invalid items get an error result and
+# the valid ones are still written.
+
+MAX_BULK_ITEMS = int(os.getenv("MAX_BULK_ITEMS", "1000"))
+
+class BulkTaskCreateRequest(BaseModel):
+    tasks: List[Dict[str, Any]]
+
+class BulkTaskUpdateRequest(BaseModel):
+    tasks: List[Dict[str, Any]]  # each item: {"id": ..., <TaskUpdateRequest fields>}
+
+class BulkTaskStatusRequest(BaseModel):
+    task_ids: List[str]
+    status: str  # pending, in_progress, completed, cancelled, snoozed
+
+def bulk_response(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Attach item indexes and totals to per-item results"""
+    items = [{"index": i, **result} for i, result in enumerate(results)]
+    failed = sum(1 for item in items if not item["success"])
+    return {
+        "success": failed == 0,
+        "succeeded": len(items) - failed,
+        "failed": failed,
+        "results": items
+    }
+
+def check_bulk_size(items: List[Any]):
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Too many items (max {MAX_BULK_ITEMS})")
+
+@app.post("/api/tasks/bulk")
+async def bulk_create_tasks(
+    request: BulkTaskCreateRequest,
+    user_id: str = Header(..., alias="X-User-Id")
+):
+    """Create many tasks in as few database round-trips as possible"""
+    if not task_service:
+        raise HTTPException(status_code=503, detail="Task service unavailable")
+    check_bulk_size(request.tasks)
+    
+    results: List[Optional[Dict[str, Any]]] = [None] * len(request.tasks)
+    valid_indexes, valid_tasks = [], []
+    for i, item in enumerate(request.tasks):
+        try:
+            valid_tasks.append(to_task_create(TaskCreateRequest(**item)))
+            valid_indexes.append(i)
+        except Exception as e:
+            results[i] = {"success": False, "error": str(e)}
+    
+    created = await task_service.bulk_create_tasks(user_id, valid_tasks) if valid_tasks else []
+    for i, result in zip(valid_indexes, created):
+        results[i] = result
+    return bulk_response(results)
+
+@app.put("/api/tasks/bulk")
+async def bulk_update_tasks(
+    request: BulkTaskUpdateRequest,
+    user_id: str = Header(..., alias="X-User-Id")
+):
+    """Update many tasks; identical changes are applied in one request"""
+    if not task_service:
+        raise HTTPException(status_code=503, detail="Task service unavailable")
+    check_bulk_size(request.tasks)
+    
+    results: List[Optional[Dict[str, Any]]] = [None] * len(request.tasks)
+    valid_indexes, valid_updates = [], []
+    for i, item in enumerate(request.tasks):
+        try:
+            fields = dict(item)
+            task_id = fields.pop("id", None)
+            if not task_id:
+                raise ValueError("Missing 'id'")
+            valid_updates.append((str(task_id), to_task_update(TaskUpdateRequest(**fields))))
+            valid_indexes.append(i)
+        except Exception as e:
+            results[i] = {"success": False, "error": str(e)}
+    
+    updated = await task_service.bulk_update_tasks(user_id, valid_updates) if valid_updates else []
+    for i, result in zip(valid_indexes, updated):
+        results[i] = result
+    return bulk_response(results)
+
+@app.post("/api/tasks/bulk/status")
+async def bulk_set_task_status(
+    request: BulkTaskStatusRequest,
+    user_id: str = Header(..., alias="X-User-Id")
+):
+    """Move many tasks to one status (e.g. complete a whole list) in one request"""
+    if not task_service:
+        raise HTTPException(status_code=503, detail="Task service unavailable")
+    check_bulk_size(request.task_ids)
+    try:
+        status_enum = TaskStatus(request.status)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    results = await task_service.bulk_set_status(user_id, request.task_ids, status_enum) if request.task_ids else []
+    return bulk_response(results)
+
+# ==================== CONFLICTS & FREE SLOTS ====================
+
+def parse_range(start: Optional[str], end: Optional[str]):
+    """ISO strings -> aware datetimes (None stays None)"""
+    from datetime import datetime, timezone
+    
+    def parse(value):
+        if not value:
+            return None
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    return parse(start), parse(end)
+
+@app.get("/api/tasks/conflicts")
+async def get_task_conflicts(
+    user_id: str = Header(..., alias="X-User-Id"),
+    start: Optional[str] = None,
+    end: Optional[str] = None
+):
+    """Overlapping scheduled tasks (optionally within [start, end))"""
+    if not task_service:
+        raise HTTPException(status_code=503, detail="Task service unavailable")
+    try:
+        start_dt, end_dt = parse_range(start, end)
+        conflicts = await task_service.find_conflicts(user_id, start_dt, end_dt)
+        return {"conflicts": conflicts, "count": len(conflicts)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/tasks/free-slots")
+async def get_free_slots(
+    start: str,
+    end: str,
+    min_duration: int = 30,
+    user_id: str = Header(..., alias="X-User-Id")
+):
+    """Free time between scheduled tasks in [start, end), at least min_duration minutes"""
+    if not task_service:
+        raise HTTPException(status_code=503, detail="Task service unavailable")
+    try:
+        start_dt, end_dt = parse_range(start, end)
+        if end_dt <= start_dt:
+            raise ValueError("end must be after start")
+        slots = await task_service.find_free_slots(user_id, start_dt, end_dt, min_duration)
+        return {"slots": slots}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -526,20 +1036,10 @@ async def update_task(
     if not task_service:
         raise HTTPException(status_code=503, detail="Task service unavailable")
     try:
-        from datetime import datetime, date as date_type
-        updates = TaskUpdate(
-            title=request.title,
-            description=request.description,
-            task_type=TaskType(request.task_type) if request.task_type else None,
-            status=TaskStatus(request.status) if request.status else None,
-            scheduled_at=datetime.fromisoformat(request.scheduled_at) if request.scheduled_at else None,
-            due_date=date_type.fromisoformat(request.due_date) if request.due_date else None,
-            estimated_duration=request.estimated_duration,
-            project_id=request.project_id,
-            life_sphere=request.life_sphere
-        )
+        updates = to_task_update(request)
         task = await task_service.update_task(user_id, task_id, updates)
-        return {"success": True, "task": task}
+        conflicts = await task_service.check_conflicts(user_id, task) if task else []
+        return {"success": True, "task": task, "conflicts": conflicts}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -612,3 +1112,73 @@ async def get_today_tasks(user_id: str = Header(..., alias="X-User-Id")):
         return {"tasks": tasks}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+# ==================== SCHEDULING ====================
+
+class ScheduleRequest(BaseModel):
+    latitude: float
+    longitude: float
+    start: Optional[str] = None  # ISO datetime, defaults to now
+    days: int = 7
+    include_night: bool = False
+    reschedule_flexible: bool = False
+    apply: bool = False  # write the proposed times to scheduled_at
+
+@app.post("/api/schedule")
+async def schedule_tasks(
+    request: ScheduleRequest,
+    user_id: str = Header(..., alias="X-User-Id")
+):
+    """
+    Place flexible tasks into auspicious windows (favourable horas, away
+    from Rahu Kala, Gulika and Yamaghanda); rigid tasks stay fixed.
+    """
+    if not task_service:
+        raise HTTPException(status_code=503, detail="Task service unavailable")
+    if not muhurtas_agent:
+        raise HTTPException(status_code=503, detail="Muhurtas service unavailable (pyswisseph not installed)")
+    if not 1 <= request.days <= 31:
+        raise HTTPException(status_code=400, detail="days must be between 1 and 31")
+    
+    import asyncio
+    from datetime import datetime, timedelta, timezone
+    from services.slot_scheduler import schedule_tasks as solve_schedule, compute_sun_days
+    
+    try:
+        if request.start:
+            start = datetime.fromisoformat(request.start.replace('Z', '+00:00'))
+            if start.tzinfo is None:
+                start = start.replace(tzinfo=timezone.utc)
+        else:
+            start = datetime.now(timezone.utc)
+        end = start + timedelta(days=request.days)
+        
+        # Sunrise solves and the solver are CPU work: keep them off the event loop
+        tasks, sun_days = await asyncio.gather(
+            task_service.get_open_tasks(user_id),
+            asyncio.to_thread(compute_sun_days, muhurtas_agent, start, end, request.latitude, request.longitude)
+        )
+        plan = await asyncio.to_thread(
+            solve_schedule,
+            tasks,
+            sun_days,
+            request.longitude,
+            start,
+            days=request.days,
+            include_night=request.include_night,
+            reschedule_flexible=request.reschedule_flexible
+        )
+        
+        if request.apply and plan["scheduled"]:
+            updates = [
+                (item["task_id"], TaskUpdate(scheduled_at=datetime.fromisoformat(item["start"])))
+                for item in plan["scheduled"]
+            ]
+            results = await task_service.bulk_update_tasks(user_id, updates)
+            plan["applied"] = sum(1 for result in results if result["success"])
+        
+        return {"success": True, **plan}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -8,31 +8,25 @@ from mcp.server import Server, NotificationOptions
 from mcp.server.models import InitializationOptions
 import mcp.server.stdio
 
-from agents.numerology_expert import NumerologyExpertAgent
-from agents.mayan_agent import MayanAgent
-from agents.jyotish_agent import JyotishAgent
-from orchestrator import StrategyOrchestrator
-
-try:
-    from agents.muhurtas_agent import MuhurtasAgent
-    from agents.transits_agent import TransitsAgent
-    SWISSEPH_AVAILABLE = True
-except ImportError:
-    MuhurtasAgent = None
-    TransitsAgent = None
-    SWISSEPH_AVAILABLE = False
-
-
-# Initialize environment and agents
+from registry import create_agent_registry
+from tool_executor import ToolExecutor
+
+
+# Initialize environment and agents.
+# Agents are built lazily on first tool call (see registry.py), so spawning
+# a new stdio session does not pay for swisseph/timezonefinder/openai.
 load_dotenv()
 
-numerology_agent = NumerologyExpertAgent()
-mayan_agent = MayanAgent()
-jyotish_agent = JyotishAgent()
-orchestrator = StrategyOrchestrator()
+registry = create_agent_registry()
 
-muhurtas_agent = MuhurtasAgent() if SWISSEPH_AVAILABLE and MuhurtasAgent else None
-transits_agent = TransitsAgent() if SWISSEPH_AVAILABLE and TransitsAgent else None
+numerology_agent = registry.proxy("numerology")
+mayan_agent = registry.proxy("mayan")
+jyotish_agent = registry.proxy("jyotish")
+orchestrator = registry.proxy("orchestrator")
+
+muhurtas_agent = registry.proxy("muhurtas")
+transits_agent = registry.proxy("transits")
+SWISSEPH_AVAILABLE = bool(transits_agent)
 
 # Initialize MCP Server
 server = Server("cosmic-calendar-mcp")
@@ -155,108 +149,130 @@ async def handle_list_tools() -> list[types.Tool]:
         
     return tools
 
+# ==================== TOOL IMPLEMENTATIONS ====================
+# Synchronous bodies of each tool. They run in `tool_executor` threads so a
+# slow call (LLM, swisseph) does not block other calls on the same session.
+
+def _tool_get_panchanga(arguments: dict) -> str:
+    date_str = arguments.get("date")
+    return str(jyotish_agent.calculate_panchanga(date_str))
+
+def _tool_get_mayan_tzolkin(arguments: dict) -> str:
+    date_str = arguments.get("date")
+    return str(mayan_agent.calculate_tzolkin(date_str))
+
+def _tool_get_numerology_profile(arguments: dict) -> str:
+    dob = arguments.get("dob")
+    user_name = arguments.get("name", "User")
+    return str(numerology_agent.get_profile(dob, user_name))
+
+def _tool_get_current_transits(arguments: dict) -> str:
+    dt_iso = arguments.get("datetime_iso")
+    from datetime import datetime, timezone
+    if dt_iso:
+        dt = datetime.fromisoformat(dt_iso.replace('Z', '+00:00'))
+    else:
+        dt = datetime.now(timezone.utc)
+
+    positions = transits_agent.get_current_positions(dt, "ru")
+    return str(positions)
+
+def _tool_analyze_day_strategy(arguments: dict) -> str:
+    dob = arguments.get("dob")
+    date_str = arguments.get("date")
+    user_name = arguments.get("name")
+    lang = arguments.get("language", "ru")
+
+    b_time = arguments.get("birth_time")
+    lat = arguments.get("latitude")
+    lon = arguments.get("longitude")
+
+    num_profile = numerology_agent.get_profile(dob, user_name)
+    num_insight = numerology_agent.get_daily_insight(dob, date_str)
+    mayan_data = mayan_agent.calculate_tzolkin(date_str)
+    jyotish_data = jyotish_agent.calculate_panchanga(date_str)
+
+    birth_chart = None
+    dasha = None
+    if b_time and lat and lon:
+        birth_chart = jyotish_agent.calculate_birth_chart(dob, b_time, lat, lon)
+        dasha = jyotish_agent.calculate_dasha(dob, b_time, lat, lon, date=date_str)
+
+    numerology_full = {"profile": num_profile, "daily_insight": num_insight}
+
+    result = orchestrator.synthesize_daily_strategy(
+        numerology=numerology_full,
+        mayan=mayan_data,
+        jyotish=jyotish_data,
+        user_name=user_name,
+        language=lang,
+        birth_chart=birth_chart,
+        dasha=dasha
+    )
+    return str(result)
+
+# FILE OPERATIONS
+def _tool_read_file(arguments: dict) -> str:
+    filename = arguments.get("filename")
+    safe_path = resolve_workspace_path(filename)
+    if not os.path.exists(safe_path):
+        return f"Error: File '{filename}' not found in workspace."
+    with open(safe_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def _tool_write_file(arguments: dict) -> str:
+    filename = arguments.get("filename")
+    content = arguments.get("content")
+    safe_path = resolve_workspace_path(filename)
+    with open(safe_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return f"File '{filename}' successfully written."
+
+def _tool_list_workspace_files(arguments: dict) -> str:
+    files = os.listdir(WORKSPACE_DIR)
+    if not files:
+        return "Workspace is empty."
+    return "Files in workspace:\n" + "\n".join(files)
+
+TOOL_HANDLERS = {
+    "get_panchanga": _tool_get_panchanga,
+    "get_mayan_tzolkin": _tool_get_mayan_tzolkin,
+    "get_numerology_profile": _tool_get_numerology_profile,
+    "get_current_transits": _tool_get_current_transits,
+    "analyze_day_strategy": _tool_analyze_day_strategy,
+    "read_file": _tool_read_file,
+    "write_file": _tool_write_file,
+    "list_workspace_files": _tool_list_workspace_files,
+}
+
+# Per-tool concurrency: LLM synthesis is expensive and rate-limited upstream
+tool_executor = ToolExecutor(
+    default_limit=int(os.getenv("MCP_TOOL_CONCURRENCY", "4")),
+    limits={"analyze_day_strategy": int(os.getenv("MCP_STRATEGY_CONCURRENCY", "2"))},
+    timeout=float(os.getenv("MCP_TOOL_TIMEOUT")) if os.getenv("MCP_TOOL_TIMEOUT") else None,
+)
+
 @server.call_tool()
 async def handle_call_tool(
     name: str, arguments: dict | None
 ) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
     """
     Handle tool execution requests.
+
+    The tool body runs in a worker thread; if the client cancels the request,
+    the awaiting task is cancelled and the result is discarded.
     """
     if not arguments:
         arguments = {}
 
     try:
-        # get_panchanga
-        if name == "get_panchanga":
-            date_str = arguments.get("date")
-            result = jyotish_agent.calculate_panchanga(date_str)
-            return [types.TextContent(type="text", text=str(result))]
-
-        # get_mayan_tzolkin
-        elif name == "get_mayan_tzolkin":
-            date_str = arguments.get("date")
-            result = mayan_agent.calculate_tzolkin(date_str)
-            return [types.TextContent(type="text", text=str(result))]
-
-        # get_numerology_profile
-        elif name == "get_numerology_profile":
-            dob = arguments.get("dob")
-            user_name = arguments.get("name", "User")
-            result = numerology_agent.get_profile(dob, user_name)
-            return [types.TextContent(type="text", text=str(result))]
-            
-        # get_current_transits
-        elif name == "get_current_transits" and SWISSEPH_AVAILABLE:
-            dt_iso = arguments.get("datetime_iso")
-            from datetime import datetime, timezone
-            if dt_iso:
-                dt = datetime.fromisoformat(dt_iso.replace('Z', '+00:00'))
-            else:
-                dt = datetime.now(timezone.utc)
-                
-            positions = transits_agent.get_current_positions(dt, "ru")
-            return [types.TextContent(type="text", text=str(positions))]
-
-        # analyze_day_strategy
-        elif name == "analyze_day_strategy":
-            dob = arguments.get("dob")
-            date_str = arguments.get("date")
-            user_name = arguments.get("name")
-            lang = arguments.get("language", "ru")
-            
-            b_time = arguments.get("birth_time")
-            lat = arguments.get("latitude")
-            lon = arguments.get("longitude")
-
-            num_profile = numerology_agent.get_profile(dob, user_name)
-            num_insight = numerology_agent.get_daily_insight(dob, date_str)
-            mayan_data = mayan_agent.calculate_tzolkin(date_str)
-            jyotish_data = jyotish_agent.calculate_panchanga(date_str)
-            
-            birth_chart = None
-            if b_time and lat and lon:
-                birth_chart = jyotish_agent.calculate_birth_chart(dob, b_time, lat, lon)
-
-            numerology_full = {"profile": num_profile, "daily_insight": num_insight}
-            
-            result = orchestrator.synthesize_daily_strategy(
-                numerology=numerology_full,
-                mayan=mayan_data,
-                jyotish=jyotish_data,
-                user_name=user_name,
-                language=lang,
-                birth_chart=birth_chart
-            )
-            
-            return [types.TextContent(type="text", text=str(result))]
-
-        # FILE OPERATIONS
-        elif name == "read_file":
-            filename = arguments.get("filename")
-            safe_path = resolve_workspace_path(filename)
-            if not os.path.exists(safe_path):
-                return [types.TextContent(type="text", text=f"Error: File '{filename}' not found in workspace.")]
-            with open(safe_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            return [types.TextContent(type="text", text=content)]
-            
-        elif name == "write_file":
-            filename = arguments.get("filename")
-            content = arguments.get("content")
-            safe_path = resolve_workspace_path(filename)
-            with open(safe_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return [types.TextContent(type="text", text=f"File '{filename}' successfully written.")]
-            
-        elif name == "list_workspace_files":
-            files = os.listdir(WORKSPACE_DIR)
-            if not files:
-                return [types.TextContent(type="text", text="Workspace is empty.")]
-            return [types.TextContent(type="text", text="Files in workspace:\n" + "\n".join(files))]
-
-        else:
+        handler = TOOL_HANDLERS.get(name)
+        if handler is None or (name == "get_current_transits" and not SWISSEPH_AVAILABLE):
             raise ValueError(f"Unknown tool: {name}")
 
+        text = await tool_executor.run(name, handler, arguments)
+        return [types.TextContent(type="text", text=text)]
+
     except Exception as e:
         import traceback
         return [types.TextContent(type="text", text=f"Error: {str(e)}\n\n{traceback.format_exc()}")]
@@ -265,18 +281,22 @@ async def handle_call_tool(
 async def main():
     # Run the server using stdin/stdout streams
     async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="cosmic-calendar-mcp",
-                server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+        try:
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="cosmic-calendar-mcp",
+                    server_version="0.1.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+        finally:
+            tool_executor.shutdown()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,5 +1,4 @@
 import os
-from openai import OpenAI
 from typing import Dict
 
 class StrategyOrchestrator:
@@ -17,6 +16,8 @@ class StrategyOrchestrator:
         self.model_name = os.getenv("OPENROUTER_MODEL", "anthropic/claude-4.5-sonnet")
 
         if api_key:
+            # Imported here: openai is slow to import and only needed with a key
+            from openai import OpenAI
             self.client = OpenAI(
                 base_url=base_url,
                 api_key=api_key,
@@ -35,7 +36,8 @@ class StrategyOrchestrator:
                                   jyotish: Dict, 
                                   user_name: str,
                                   language: str = "ru",
-                                  birth_chart: Dict = None) -> str:
+                                  birth_chart: Dict = None,
+                                  dasha: Dict = None) -> str:
         
         if not self.client:
             return "AI Key missing. Please set OPENROUTER_API_KEY in Railway to receive real insights."
@@ -85,6 +87,15 @@ class StrategyOrchestrator:
            For example, if Moon is in {birth_chart.get('moon', {}).get('rashi')}, how does today's energy affect them personally?
         """
 
+        if dasha:
+            prompt += f"""
+        5. VIMSHOTTARI DASHA (current life period):
+           - Mahadasha: {dasha.get('mahadasha', {}).get('lord')} (until {dasha.get('mahadasha', {}).get('end', '')[:10]})
+           - Antardasha: {dasha.get('antardasha', {}).get('lord')} (until {dasha.get('antardasha', {}).get('end', '')[:10]})
+           - Pratyantardasha: {dasha.get('pratyantardasha', {}).get('lord')}
+           Frame today's advice within this longer period.
+        """
+
         """
         GOAL:
         Write a single paragraph (3-4 sentences) Strategic Advice.
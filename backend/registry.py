@@ -0,0 +1,254 @@
+"""
+Lazy Agent Registry for Cosmic Calendar.
+
+Agents and services are registered as factories and only constructed on
+first use. Heavy dependencies (swisseph, timezonefinder, supabase, openai)
+are imported inside the factories, so importing main.py or mcp_server.py
+stays cheap and each MCP session / Railway restart starts quickly.
+
+Usage:
+    registry = create_agent_registry()
+    muhurtas_agent = registry.proxy("muhurtas")   # nothing imported yet
+
+    if muhurtas_agent:                           # cheap availability check
+        muhurtas_agent.get_all_muhurtas(...)     # built on first attribute access
+"""
+
+import importlib.util
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+@dataclass
+class AgentSpec:
+    """Describes how to build a single agent or service."""
+    name: str
+    factory: Callable[[], Any]
+    requires: Tuple[str, ...] = field(default_factory=tuple)  # importable modules needed
+
+
+class AgentRegistry:
+    """
+    Holds agent factories and builds each instance once, on first use.
+
+    - `get(name)` builds (once) and returns the instance, or None if it failed
+    - `available(name)` answers without building when `requires` is declared
+    - `proxy(name)` returns a LazyAgent that can be passed around like the agent
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, AgentSpec] = {}
+        self._instances: Dict[str, Any] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any], requires: Tuple[str, ...] = ()):
+        """Register a factory. Any previously built instance is discarded."""
+        self._specs[name] = AgentSpec(name=name, factory=factory, requires=tuple(requires))
+        self._instances.pop(name, None)
+        self._errors.pop(name, None)
+
+    def get(self, name: str) -> Optional[Any]:
+        """Return the instance for `name`, building it on first call."""
+        if name in self._instances:
+            return self._instances[name]
+        if name in self._errors:
+            return None
+
+        spec = self._specs.get(name)
+        if spec is None:
+            raise KeyError(f"Unknown agent: '{name}'")
+
+        with self._lock:
+            # Another thread may have built it while we waited
+            if name in self._instances:
+                return self._instances[name]
+            if name in self._errors:
+                return None
+            try:
+                instance = spec.factory()
+            except (ImportError, ValueError) as e:
+                print(f"Warning: {name} not initialized: {e}")
+                self._errors[name] = str(e)
+                return None
+            self._instances[name] = instance
+            return instance
+
+    def available(self, name: str) -> bool:
+        """
+        Whether `name` can be used.
+
+        Agents that declare `requires` are checked with find_spec only, so the
+        heavy module is not imported. Agents without `requires` are built.
+        """
+        if name in self._instances:
+            return True
+        if name in self._errors:
+            return False
+
+        spec = self._specs.get(name)
+        if spec is None:
+            return False
+        if spec.requires:
+            return all(_module_available(module) for module in spec.requires)
+        return self.get(name) is not None
+
+    def is_loaded(self, name: str) -> bool:
+        """Whether the instance has already been built."""
+        return name in self._instances
+
+    def proxy(self, name: str) -> "LazyAgent":
+        """Return a lazy stand-in for the agent, built on first attribute access."""
+        return LazyAgent(self, name)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-agent state for health checks. Never builds anything."""
+        return {
+            name: {
+                "loaded": name in self._instances,
+                "error": self._errors.get(name),
+            }
+            for name in sorted(self._specs)
+        }
+
+
+class LazyAgent:
+    """
+    Stand-in for an agent held by an AgentRegistry.
+
+    Truthiness reports availability (like the old `agent or None` globals),
+    and attribute access builds the real instance on first use.
+    """
+
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry: AgentRegistry, name: str):
+        self._registry = registry
+        self._name = name
+
+    def __bool__(self) -> bool:
+        return self._registry.available(self._name)
+
+    def __getattr__(self, attr: str) -> Any:
+        instance = self._registry.get(self._name)
+        if instance is None:
+            raise RuntimeError(f"{self._name} is unavailable")
+        return getattr(instance, attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._registry.is_loaded(self._name) else "lazy"
+        return f"<LazyAgent: {self._name} ({state})>"
+
+
+def _module_available(module: str) -> bool:
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# ==================== FACTORIES ====================
+# Each factory imports its module on call, keeping heavy imports off the
+# import path of main.py and mcp_server.py.
+
+def _build_numerology():
+    from agents.numerology_expert import NumerologyExpertAgent
+    return NumerologyExpertAgent()
+
+
+def _build_mayan():
+    from agents.mayan_agent import MayanAgent
+    return MayanAgent()
+
+
+def _build_jyotish():
+    from agents.jyotish_agent import JyotishAgent
+    return JyotishAgent()
+
+
+def _build_muhurtas():
+    from agents.muhurtas_agent import MuhurtasAgent
+    return MuhurtasAgent()
+
+
+def _build_transits():
+    from agents.transits_agent import TransitsAgent
+    return TransitsAgent()
+
+
+def _build_orchestrator():
+    from orchestrator import StrategyOrchestrator
+    return StrategyOrchestrator()
+
+
+def _build_profile_service():
+    from services.profile_service import ProfileService
+    return ProfileService()
+
+
+def _build_task_service():
+    from services.task_service import TaskService
+    return TaskService()
+
+
+def _build_sync_service():
+    from services.sync_service import SyncService
+    return SyncService()
+
+
+def _build_bootstrap_service(registry: "AgentRegistry"):
+    from services.bootstrap import BootstrapService
+    names = ("numerology", "mayan", "jyotish", "muhurtas", "transits",
+             "orchestrator", "profile_service", "task_service")
+    return BootstrapService({name: registry.proxy(name) for name in names})
+
+
+def _build_forecast_service(registry: "AgentRegistry"):
+    from services.forecast import ForecastService
+    return ForecastService({name: registry.proxy(name) for name in ("numerology", "mayan", "jyotish")})
+
+
+def _build_day_index_service(registry: "AgentRegistry"):
+    from services.day_index import DayIndexService
+    return DayIndexService({name: registry.proxy(name) for name in ("numerology", "mayan", "jyotish")})
+
+
+def _build_bulk_muhurtas_service(registry: "AgentRegistry"):
+    from services.bulk_muhurtas import BulkMuhurtasService
+    return BulkMuhurtasService(registry.proxy("muhurtas"))
+
+
+def _build_transition_scheduler(registry: "AgentRegistry"):
+    from services.transition_scheduler import TransitionScheduler
+    return TransitionScheduler(registry.proxy("muhurtas"))
+
+
+def _build_live_hub(registry: "AgentRegistry"):
+    from services.live import LiveHub
+    return LiveHub(registry.proxy("transition_scheduler"), registry.proxy("muhurtas"))
+
+
+def create_agent_registry() -> AgentRegistry:
+    """
+    Factory: creates an AgentRegistry with every agent and service registered.
+
+    Nothing is imported or constructed here.
+    """
+    registry = AgentRegistry()
+    registry.register("numerology", _build_numerology, requires=("agents.numerology_expert",))
+    registry.register("mayan", _build_mayan, requires=("agents.mayan_agent",))
+    registry.register("jyotish", _build_jyotish, requires=("swisseph", "timezonefinder", "pytz"))
+    registry.register("muhurtas", _build_muhurtas, requires=("swisseph",))
+    registry.register("transits", _build_transits, requires=("swisseph",))
+    registry.register("orchestrator", _build_orchestrator, requires=("openai",))
+    registry.register("profile_service", _build_profile_service)
+    registry.register("task_service", _build_task_service)
+    registry.register("sync_service", _build_sync_service)
+    registry.register("bootstrap", lambda: _build_bootstrap_service(registry))
+    registry.register("forecast", lambda: _build_forecast_service(registry), requires=("swisseph", "timezonefinder", "pytz", "numpy"))
+    registry.register("day_index", lambda: _build_day_index_service(registry), requires=("swisseph", "timezonefinder", "pytz", "numpy"))
+    registry.register("bulk_muhurtas", lambda: _build_bulk_muhurtas_service(registry), requires=("swisseph",))
+    registry.register("transition_scheduler", lambda: _build_transition_scheduler(registry), requires=("swisseph",))
+    registry.register("live", lambda: _build_live_hub(registry), requires=("swisseph",))
+    return registry
@@ -0,0 +1,141 @@
+"""
+Action Log Writer - buffered, batched inserts into action_log.
+
+ProfileService used to insert one action_log row per operation, doubling
+the round-trips of every profile read. ActionLogWriter keeps rows in a
+bounded in-memory queue and a background task writes them as multi-row
+inserts when either threshold is reached:
+
+- batch_size rows are waiting, or
+- flush_interval seconds have passed since the last flush.
+
+When the queue is full new rows are dropped (counted in stats["dropped"])
+rather than slowing down requests. A batch whose insert fails (one bad
+row rejects the whole multi-row insert) is retried row by row, so only
+the bad rows are lost. close() drains the queue on shutdown.
+"""
+
+import asyncio
+import os
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+
+class ActionLogWriter:
+    """Background writer for action_log rows."""
+
+    def __init__(
+        self,
+        insert_rows: Callable[[List[Dict[str, Any]]], Awaitable[Any]],
+        max_queue: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        self._insert_rows = insert_rows
+        self.max_queue = max_queue or int(os.getenv("ACTION_LOG_MAX_QUEUE", "10000"))
+        self.batch_size = batch_size or int(os.getenv("ACTION_LOG_BATCH_SIZE", "100"))
+        self.flush_interval = flush_interval or float(os.getenv("ACTION_LOG_FLUSH_INTERVAL", "2.0"))
+
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._closed = False
+
+        self.stats: Dict[str, int] = {
+            "enqueued": 0,
+            "dropped": 0,
+            "written": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "failed_rows": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, row: Dict[str, Any]) -> bool:
+        """Queue a row for writing. Returns False if it was dropped."""
+        if self._closed or len(self._queue) >= self.max_queue:
+            self.stats["dropped"] += 1
+            return False
+
+        self._queue.append(row)
+        self.stats["enqueued"] += 1
+        self._ensure_started()
+        if len(self._queue) >= self.batch_size and self._wakeup:
+            self._wakeup.set()
+        return True
+
+    def _ensure_started(self):
+        """Start the flush loop on the running event loop (if any)."""
+        if self._task and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop yet: rows wait until the next enqueue/flush
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write everything queued so far, in batches. Returns rows written."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        written = 0
+        async with self._flush_lock:
+            while self._queue:
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                try:
+                    await self._insert_rows(batch)
+                except Exception as e:
+                    # Silently fail logging to avoid breaking main operations
+                    print(f"Failed to write {len(batch)} action log rows: {e}")
+                    self.stats["failed_batches"] += 1
+                    if len(batch) > 1:
+                        written += await self._insert_each(batch)
+                    else:
+                        self.stats["failed_rows"] += 1
+                    continue
+                self.stats["batches"] += 1
+                self.stats["written"] += len(batch)
+                written += len(batch)
+        return written
+
+    async def _insert_each(self, batch: List[Dict[str, Any]]) -> int:
+        """Fallback for a failed batch: insert its rows one at a time"""
+        written = 0
+        for row in batch:
+            try:
+                await self._insert_rows([row])
+            except Exception as e:
+                print(f"Failed to write action log row: {e}")
+                self.stats["failed_rows"] += 1
+                continue
+            self.stats["written"] += 1
+            written += 1
+        return written
+
+    async def close(self):
+        """Stop the background task and drain remaining rows."""
+        self._closed = True
+        if self._task and not self._task.done():
+            # Wake the loop instead of cancelling it, so an in-flight batch
+            # is not lost halfway through its insert
+            self._wakeup.set()
+            await self._task
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "queued": len(self._queue)}
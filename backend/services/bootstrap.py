@@ -0,0 +1,211 @@
+"""
+Bootstrap Service - everything the first screen needs, in one call.
+
+The frontend used to call /api/profiles/active, /api/tasks/today,
+/api/analyze, /api/muhurtas (or /api/hora) and /api/transits on load.
+BootstrapService runs the same work concurrently:
+
+- active profile and today's tasks (database, async)
+- Mayan, Panchanga, muhurtas and transits (agents, in worker threads)
+- numerology, the birth chart and the running dasha as soon as the
+  profile has arrived
+
+The LLM strategy is the slow part. It is attached when cached (per
+profile, date and language, for STRATEGY_CACHE_TTL seconds); otherwise
+its generation is started in the background and the caller either gets
+`strategy_status: "pending"` or, when streaming, a follow-up event.
+Concurrent requests for the same strategy share one generation.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .profile_cache import _MISSING, create_cache_backend
+
+STRATEGY_CACHE_TTL = float(os.getenv("STRATEGY_CACHE_TTL", str(6 * 3600)))
+
+
+class BootstrapService:
+    """Assembles the first-screen payload from the registry's agents and services"""
+
+    def __init__(self, agents: Dict[str, Any], cache_backend=None, ttl: Optional[float] = None):
+        # agents: registry proxies keyed like main.py globals
+        # (numerology, mayan, jyotish, muhurtas, transits, orchestrator, profile_service, task_service)
+        self.agents = agents
+        self.cache = cache_backend or create_cache_backend()
+        self.ttl = ttl or STRATEGY_CACHE_TTL
+        self._inflight: Dict[str, "asyncio.Task"] = {}
+        self.stats: Dict[str, int] = {"strategy_hits": 0, "strategy_misses": 0, "strategy_generated": 0}
+
+    def _agent(self, name: str):
+        agent = self.agents.get(name)
+        return agent if agent else None
+
+    async def assemble(
+        self,
+        user_id: str,
+        date: Optional[str] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        language: str = "ru",
+        name: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], Optional["asyncio.Task"]]:
+        """
+        Build the payload. Returns (payload, strategy_job): strategy_job is
+        the pending generation (None when the strategy is cached or unavailable).
+        """
+        requested = date
+        date = date or datetime.now(timezone.utc).date().isoformat()
+        errors: Dict[str, str] = {}
+
+        async def guarded(part: str, make: Callable[[], Awaitable[Any]]):
+            try:
+                return await make()
+            except Exception as e:
+                print(f"Error building bootstrap {part}: {e}")
+                errors[part] = str(e)
+                return None
+
+        def in_thread(func, *args):
+            return lambda: asyncio.to_thread(func, *args)
+
+        jobs: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        profile_service, task_service = self._agent("profile_service"), self._agent("task_service")
+        if profile_service:
+            jobs["profile"] = lambda: profile_service.get_active_profile(user_id)
+        if task_service:
+            jobs["tasks"] = lambda: task_service.get_pending_tasks_for_today(user_id)
+        if self._agent("mayan"):
+            jobs["mayan"] = in_thread(self.agents["mayan"].calculate_tzolkin, date)
+        if self._agent("jyotish"):
+            jobs["jyotish"] = in_thread(self.agents["jyotish"].calculate_panchanga, date)
+        if self._agent("muhurtas") and latitude is not None and longitude is not None:
+            jobs["muhurtas"] = in_thread(self._muhurtas, requested, latitude, longitude, language)
+        if self._agent("transits"):
+            jobs["transits"] = in_thread(self._transits, requested, latitude, longitude, language)
+
+        running = {part: asyncio.ensure_future(guarded(part, make)) for part, make in jobs.items()}
+
+        # Profile-dependent parts start as soon as the profile arrives
+        profile = await running["profile"] if "profile" in running else None
+        dob = (profile or {}).get("birth_date")
+        person = name or (profile or {}).get("profile_name") or "User"
+        if dob and self._agent("numerology"):
+            running["numerology"] = asyncio.ensure_future(
+                guarded("numerology", in_thread(self._numerology, dob, person, date))
+            )
+        if profile and self._agent("jyotish") and all(profile.get(k) for k in ("birth_time", "birth_lat", "birth_lng")):
+            running["birth_chart"] = asyncio.ensure_future(guarded("birth_chart", in_thread(
+                self._natal, dob, profile["birth_time"], float(profile["birth_lat"]), float(profile["birth_lng"]), date
+            )))
+
+        results = dict(zip(running, await asyncio.gather(*running.values())))
+        birth_chart, dasha = results.get("birth_chart") or (None, None)
+
+        payload = {
+            "date": date,
+            "profile": results.get("profile"),
+            "tasks": results.get("tasks") or [],
+            "data": {
+                "numerology": results.get("numerology"),
+                "mayan": results.get("mayan"),
+                "jyotish": results.get("jyotish"),
+                "birth_chart": birth_chart,
+                "dasha": dasha,
+            },
+            "muhurtas": results.get("muhurtas"),
+            "transits": results.get("transits"),
+            "errors": errors,
+        }
+
+        job = None
+        key = self.strategy_key(user_id, profile, date, language)
+        data = payload["data"]
+        cached = await self.cache.get(key)
+        if cached is not _MISSING:
+            self.stats["strategy_hits"] += 1
+            payload["strategy"], payload["strategy_status"] = cached["value"], "ready"
+        elif self._agent("orchestrator") and all(data[k] for k in ("numerology", "mayan", "jyotish")):
+            self.stats["strategy_misses"] += 1
+            job = self._start_strategy(key, data, person, language)
+            payload["strategy"], payload["strategy_status"] = None, "pending"
+        else:
+            payload["strategy"], payload["strategy_status"] = None, "unavailable"
+        return payload, job
+
+    @staticmethod
+    def strategy_key(user_id: str, profile: Optional[Dict[str, Any]], date: str, language: str) -> str:
+        profile_id = (profile or {}).get("id", "none")
+        return f"strategy:{user_id}:{profile_id}:{date}:{language}"
+
+    def _numerology(self, dob: str, name: str, date: str) -> Dict[str, Any]:
+        agent = self.agents["numerology"]
+        return {"profile": agent.get_profile(dob, name), "daily_insight": agent.get_daily_insight(dob, date)}
+
+    def _natal(self, dob: str, birth_time: str, lat: float, lng: float, date: str):
+        """Birth chart and the dasha running on `date` (the second call hits the chart cache)"""
+        agent = self.agents["jyotish"]
+        return agent.calculate_birth_chart(dob, birth_time, lat, lng), agent.calculate_dasha(dob, birth_time, lat, lng, date=date)
+
+    @staticmethod
+    def _moment(date: Optional[str], latitude: Optional[float], longitude: Optional[float]) -> datetime:
+        """The requested date (in the location's timezone when known), or now"""
+        if latitude is not None and longitude is not None:
+            from agents.muhurtas_agent import location_datetime
+            return location_datetime(date, latitude, longitude)
+        if not date:
+            return datetime.now(timezone.utc)
+        dt = datetime.fromisoformat(date.replace('Z', '+00:00'))
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+    def _muhurtas(self, date: Optional[str], latitude: float, longitude: float, language: str) -> Dict[str, Any]:
+        dt = self._moment(date, latitude, longitude)
+        return self.agents["muhurtas"].get_all_muhurtas(dt, latitude, longitude, language)
+
+    def _transits(self, date: Optional[str], latitude: Optional[float], longitude: Optional[float],
+                  language: str) -> Dict[str, Any]:
+        dt = self._moment(date, latitude, longitude)
+        agent = self.agents["transits"]
+        return {
+            "positions": agent.get_current_positions(dt, language),
+            "significant_transits": agent.get_significant_transits(dt, language),
+        }
+
+    def _start_strategy(self, key: str, data: Dict[str, Any], name: str, language: str) -> "asyncio.Task":
+        """Start (or join) the strategy generation for `key`"""
+        job = self._inflight.get(key)
+        if job is None or job.done():
+            job = asyncio.ensure_future(self._generate_strategy(key, data, name, language))
+            self._inflight[key] = job
+            job.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return job
+
+    async def _generate_strategy(self, key: str, data: Dict[str, Any], name: str, language: str) -> Optional[str]:
+        try:
+            return await self._synthesize(key, data, name, language)
+        except Exception as e:
+            # Nobody may be awaiting this job: report instead of raising
+            print(f"Error generating bootstrap strategy: {e}")
+            return None
+
+    async def _synthesize(self, key: str, data: Dict[str, Any], name: str, language: str) -> Optional[str]:
+        result = await asyncio.to_thread(
+            self.agents["orchestrator"].synthesize_daily_strategy,
+            numerology=data["numerology"],
+            mayan=data["mayan"],
+            jyotish=data["jyotish"],
+            user_name=name,
+            language=language,
+            birth_chart=data.get("birth_chart"),
+            dasha=data.get("dasha"),
+        )
+        # synthesize_daily_strategy returns a plain string when no API key is set
+        if not isinstance(result, dict):
+            return result
+        strategy = result.get("strategy")
+        if strategy and not strategy.startswith("Error gathering wisdom"):
+            await self.cache.set(key, {"value": strategy}, self.ttl)
+            self.stats["strategy_generated"] += 1
+        return strategy
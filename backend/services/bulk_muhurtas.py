@@ -0,0 +1,193 @@
+"""
+Bulk Muhurtas - hora / Rahu Kala for many users at once (broadcasts).
+
+Calling get_all_muhurtas per user repeats the sunrise math for people a
+few kilometers apart. Users are grouped by geohash cell (precision
+BULK_MUHURTAS_PRECISION, 5 = ~4.9 x 4.9 km cells) and timezone; muhurtas
+are computed once per group at the members' centroid and fanned out to
+every member as a stream of events:
+
+    {"type": "cluster", "cluster": ..., "center": ..., "users": n, "error": {...}}
+    {"type": "user", "user_id": ..., "cluster": ..., "muhurtas": {...}}
+    ...
+    {"type": "summary", "users": n, "clusters": m, "max_error_minutes": ...}
+
+Every cluster reports its approximation error: the largest shift of
+sunrise/sunset a member could see relative to the centroid. Sunrise moves
+4 minutes per degree of longitude; the latitude part is measured with one
+extra sun-times solve at the farthest member latitude. Muhurta boundaries
+(hora, Rahu Kala, ...) scale with sunrise/sunset, so they carry the same
+error.
+"""
+
+import math
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+BULK_MUHURTAS_PRECISION = int(os.getenv("BULK_MUHURTAS_PRECISION", "5"))
+MAX_BULK_USERS = int(os.getenv("MAX_BULK_USERS", "50000"))
+
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+MINUTES_PER_LONGITUDE_DEGREE = 4.0
+KM_PER_DEGREE = 111.32
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = BULK_MUHURTAS_PRECISION) -> str:
+    """Standard geohash of a point, `precision` characters long"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bit, ch, even = 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            ch |= 16 >> bit
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        if bit < 4:
+            bit += 1
+        else:
+            chars.append(GEOHASH_BASE32[ch])
+            bit, ch = 0, 0
+    return "".join(chars)
+
+
+def geohash_center(geohash: str) -> Tuple[float, float]:
+    """(latitude, longitude) of the center of a geohash cell"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        bits = GEOHASH_BASE32.index(char)
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            rng[0 if bits >> shift & 1 else 1] = mid
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+
+def _distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Equirectangular distance, accurate at cluster scale"""
+    x = (lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+    return math.hypot(x, lat2 - lat1) * KM_PER_DEGREE
+
+
+class BulkMuhurtasService:
+    def __init__(self, muhurtas_agent, precision: int = BULK_MUHURTAS_PRECISION):
+        self.muhurtas = muhurtas_agent
+        self.precision = precision
+
+    def cluster(
+        self, users: Iterable[Dict[str, Any]], precision: Optional[int] = None
+    ) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+        """
+        Group users ({user_id, latitude, longitude, timezone}) by geohash
+        cell and timezone. Raises ValueError on invalid input.
+        """
+        precision = precision or self.precision
+        if not 1 <= precision <= 12:
+            raise ValueError("precision must be between 1 and 12")
+        clusters: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        zones: Dict[str, ZoneInfo] = {}
+        count = 0
+        for user in users:
+            count += 1
+            if count > MAX_BULK_USERS:
+                raise ValueError(f"At most {MAX_BULK_USERS} users per request")
+            lat, lon = float(user["latitude"]), float(user["longitude"])
+            if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+                raise ValueError(f"Invalid coordinates for user {user.get('user_id')}: {lat}, {lon}")
+            tz = user.get("timezone") or "UTC"
+            if tz not in zones:
+                try:
+                    zones[tz] = ZoneInfo(tz)
+                except (ZoneInfoNotFoundError, ValueError):
+                    raise ValueError(f"Unknown timezone '{tz}' for user {user.get('user_id')}")
+            key = (geohash_encode(lat, lon, precision), tz)
+            clusters.setdefault(key, []).append({**user, "latitude": lat, "longitude": lon})
+        return clusters
+
+    def _estimate_error(
+        self, members: List[Dict[str, Any]], center: Tuple[float, float], local_now: datetime, sun_times
+    ) -> Dict[str, float]:
+        """Worst-case sunrise/sunset shift (minutes) of any member vs. the centroid"""
+        lat, lon = center
+        d_lat = max(abs(m["latitude"] - lat) for m in members)
+        d_lon = max(abs(m["longitude"] - lon) for m in members)
+        lat_minutes = 0.0
+        if d_lat > 0:
+            # Day length changes faster toward the pole the cluster reaches
+            far_lat = max(-90.0, min(90.0, lat + (d_lat if lat >= 0 else -d_lat)))
+            far = self.muhurtas.get_sun_times(local_now, far_lat, lon)
+            lat_minutes = max(
+                abs((far.sunrise - sun_times.sunrise).total_seconds()),
+                abs((far.sunset - sun_times.sunset).total_seconds()),
+            ) / 60
+        return {
+            "radius_km": round(max(_distance_km(lat, lon, m["latitude"], m["longitude"]) for m in members), 3),
+            "max_error_minutes": round(d_lon * MINUTES_PER_LONGITUDE_DEGREE + lat_minutes, 3),
+        }
+
+    def stream(
+        self,
+        users: Iterable[Dict[str, Any]],
+        dt: Optional[datetime] = None,
+        language: str = "ru",
+        precision: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Cluster users, then yield a "cluster" event followed by one "user"
+        event per member for every cluster, and a final "summary".
+        Input is validated before the first event (ValueError).
+        """
+        started = time.perf_counter()
+        dt = dt or datetime.now(timezone.utc)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        clusters = self.cluster(users, precision)
+        return self._events(clusters, dt, language, precision or self.precision, started)
+
+    def _events(self, clusters, dt, language, precision, started) -> Iterator[Dict[str, Any]]:
+        total_users = 0
+        max_error = 0.0
+        for (cell, tz), members in clusters.items():
+            center = (
+                sum(m["latitude"] for m in members) / len(members),
+                sum(m["longitude"] for m in members) / len(members),
+            )
+            local_now = dt.astimezone(ZoneInfo(tz))
+            try:
+                muhurtas = self.muhurtas.get_all_muhurtas(local_now, center[0], center[1], language)
+                sun_times = self.muhurtas.get_sun_times(local_now, center[0], center[1])
+                error = self._estimate_error(members, center, local_now, sun_times)
+            except Exception as e:
+                print(f"Warning: bulk muhurtas failed for cluster {cell}: {e}")
+                muhurtas, error = None, None
+            if error:
+                max_error = max(max_error, error["max_error_minutes"])
+
+            yield {
+                "type": "cluster",
+                "cluster": cell,
+                "timezone": tz,
+                "center": {"latitude": round(center[0], 6), "longitude": round(center[1], 6)},
+                "users": len(members),
+                "error": error,
+            }
+            for member in members:
+                total_users += 1
+                yield {"type": "user", "user_id": member.get("user_id"), "cluster": cell, "muhurtas": muhurtas}
+
+        yield {
+            "type": "summary",
+            "users": total_users,
+            "clusters": len(clusters),
+            "precision": precision,
+            "max_error_minutes": round(max_error, 3),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
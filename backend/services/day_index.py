@@ -0,0 +1,281 @@
+"""
+Day Index - precomputed day features for "find dates matching" queries.
+
+Questions like "next dates where the tithi is Ekadashi, the nakshatra is
+Pushya and the Mayan tone is 1" used to mean calling the agents day by day.
+DayIndex stores one small integer column per feature for every day from
+DAY_INDEX_START to DAY_INDEX_END (1900-2100, ~73k days, ~0.6 MB):
+
+    tithi (1-30), nakshatra (1-27), yoga (1-27), weekday (0 = Monday),
+    kin (1-260), tone (1-13), seal (1-20), moon (13-Moon month, 1-13)
+
+Leap days have 0 in every Mayan column and the Day Out of Time has 0 in
+moon only (it keeps its kin, tone and seal), as in MayanAgent. Panchanga
+values are taken at 00:00 UTC, like JyotishAgent.calculate_panchanga for
+a bare date.
+
+A query is turned into packed bitsets (one bit per day, built once per
+feature value and cached), combined with AND/OR/AND NOT, and unpacked only
+over the requested date range. Two centuries are answered in milliseconds.
+The personal vibration is not a stored column: it depends on the birth date
+and is computed for the whole range on demand (vectorized, cheap).
+
+Building the index takes a few seconds (two Swiss Ephemeris calls per
+day), so it is built on first use and saved to DAY_INDEX_PATH.
+"""
+
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from datetime import date as date_cls, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .forecast import MALEFIC_YOGAS
+
+DAY_INDEX_START = "1900-01-01"
+DAY_INDEX_END = "2100-12-31"
+DAY_INDEX_PATH = os.getenv("DAY_INDEX_PATH", "day_index.npz")
+MAX_FIND_DATES = 1000
+
+FEATURES = ("tithi", "nakshatra", "yoga", "weekday", "kin", "tone", "seal", "moon")
+PERSONAL_FEATURES = ("vibration",)
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+
+class DayIndex:
+    """Per-day feature columns over a fixed date span, with bitset queries"""
+
+    def __init__(self, start: str, columns: Dict[str, np.ndarray]):
+        self.start = np.datetime64(start, "D")
+        self.columns = columns
+        self.days = len(columns["tithi"])
+        self.end = self.start + (self.days - 1)
+        self._bitsets: Dict[tuple, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, mayan, jyotish, start: str = DAY_INDEX_START, end: str = DAY_INDEX_END) -> "DayIndex":
+        days = int((np.datetime64(end, "D") - np.datetime64(start, "D")).astype(np.int64)) + 1
+        tzolkin = mayan.calculate_tzolkin_range(start, days)
+        panchanga = jyotish.calculate_panchanga_range(start, days)
+        dates = np.datetime64(start, "D") + np.arange(days)
+        columns = {
+            "tithi": panchanga["tithi"].astype(np.uint8),
+            "nakshatra": panchanga["nakshatra"].astype(np.uint8),
+            "yoga": panchanga["yoga"].astype(np.uint8),
+            "weekday": ((dates.astype(np.int64) + 3) % 7).astype(np.uint8),  # 1970-01-01 was a Thursday
+            "kin": tzolkin["kin"].astype(np.uint16),
+            "tone": tzolkin["tone"].astype(np.uint8),
+            "seal": tzolkin["seal"].astype(np.uint8),
+            "moon": tzolkin["moon"].astype(np.uint8),
+        }
+        return cls(start, columns)
+
+    @classmethod
+    def load(cls, path: str, start: str = DAY_INDEX_START, end: str = DAY_INDEX_END) -> Optional["DayIndex"]:
+        """Load a saved index; None if missing, unreadable or for another span"""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                if str(data["start"]) != start or str(data["end"]) != end or any(f not in data for f in FEATURES):
+                    return None
+                return cls(start, {feature: data[feature] for feature in FEATURES})
+        except Exception as e:
+            print(f"Warning: could not load day index from {path}: {e}")
+            return None
+
+    def save(self, path: str):
+        try:
+            np.savez_compressed(path, start=str(self.start), end=str(self.end), **self.columns)
+        except Exception as e:
+            print(f"Warning: could not save day index to {path}: {e}")
+
+    def offset(self, day: str) -> int:
+        return int((np.datetime64(day, "D") - self.start).astype(np.int64))
+
+    def bitset(self, feature: str, values: Iterable[int], column: Optional[np.ndarray] = None) -> np.ndarray:
+        """Packed bits of the days where `feature` is any of `values`"""
+        result = None
+        for value in values:
+            key = (feature, value)
+            bits = self._bitsets.get(key) if column is None else None
+            if bits is None:
+                bits = np.packbits((self.columns[feature] if column is None else column) == value)
+                if column is None:
+                    with self._lock:
+                        self._bitsets[key] = bits
+            result = bits if result is None else result | bits
+        return result if result is not None else np.zeros((self.days + 7) // 8, dtype=np.uint8)
+
+    def dates_in(self, bits: np.ndarray, start: str, end: str, limit: int) -> Dict[str, Any]:
+        """Matching days in [start, end]: the first `limit` and the total count"""
+        lo, hi = max(self.offset(start), 0), min(self.offset(end), self.days - 1)
+        if hi < lo:
+            return {"offsets": np.array([], dtype=np.int64), "count": 0}
+        # Unpack only the bytes covering [lo, hi]
+        first_byte = lo // 8
+        window = np.unpackbits(bits[first_byte:hi // 8 + 1])
+        window = window[lo - first_byte * 8:hi - first_byte * 8 + 1]
+        matched = np.flatnonzero(window) + lo
+        return {"offsets": matched[:limit], "count": int(len(matched))}
+
+
+class DayIndexService:
+    """Builds (or loads) the day index on first use and answers find_dates queries"""
+
+    def __init__(self, agents: Dict[str, Any], path: Optional[str] = DAY_INDEX_PATH,
+                 start: str = DAY_INDEX_START, end: str = DAY_INDEX_END):
+        # agents: registry proxies for numerology, mayan and jyotish
+        self.agents = agents
+        self.path = path
+        self.span = (start, end)
+        self._index: Optional[DayIndex] = None
+        self._build_lock = threading.Lock()
+        self._vibrations: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._vibrations_lock = threading.Lock()
+
+    @property
+    def index(self) -> DayIndex:
+        if self._index is None:
+            with self._build_lock:
+                if self._index is None:
+                    index = DayIndex.load(self.path, *self.span)
+                    if index is None:
+                        index = DayIndex.build(self.agents["mayan"], self.agents["jyotish"], *self.span)
+                        if self.path:
+                            index.save(self.path)
+                    self._index = index
+        return self._index
+
+    async def find_dates(self, **query) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.query, **query)
+
+    def query(
+        self,
+        where: Optional[Dict[str, Any]] = None,
+        any_of: Optional[List[Dict[str, Any]]] = None,
+        exclude: Optional[Dict[str, Any]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: int = 20,
+        dob: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Dates matching every feature in `where`, at least one clause of
+        `any_of` and none of `exclude`, from `start` (default today) to
+        `end` (default the end of the index).
+
+        Feature values are a number, a name (tithi/nakshatra/yoga/weekday,
+        e.g. "Ekadashi" matches both pakshas; yoga "malefic" matches the nine
+        malefic yogas) or a list of those, meaning any of them.
+        """
+        if not (where or any_of or exclude):
+            raise ValueError("Give at least one condition in where, any_of or exclude")
+        if not 1 <= limit <= MAX_FIND_DATES:
+            raise ValueError(f"limit must be between 1 and {MAX_FIND_DATES}")
+        index = self.index
+        start = start or datetime.now(timezone.utc).date().isoformat()
+        end = end or str(index.end)
+        for day in (start, end):
+            try:
+                date_cls.fromisoformat(day)
+            except ValueError:
+                raise ValueError("Dates must be in YYYY-MM-DD format")
+        if not 0 <= index.offset(start) < index.days:
+            raise ValueError(f"start must be between {index.start} and {index.end}")
+
+        bits = None
+        if where:
+            bits = self._all_of(where, dob)
+        if any_of:
+            alternatives = None
+            for clause in any_of:
+                clause_bits = self._all_of(clause, dob)
+                alternatives = clause_bits if alternatives is None else alternatives | clause_bits
+            bits = alternatives if bits is None else bits & alternatives
+        if exclude:
+            excluded = None
+            for feature, values in exclude.items():
+                feature_bits = self._feature_bits(feature, values, dob)
+                excluded = feature_bits if excluded is None else excluded | feature_bits
+            bits = ~excluded if bits is None else bits & ~excluded
+
+        found = index.dates_in(bits, start, end, limit)
+        offsets = found["offsets"]
+        features = {feature: index.columns[feature][offsets].tolist() for feature in FEATURES}
+        if dob:
+            features["vibration"] = self._vibration_column(dob)[offsets].tolist()
+        return {
+            "start": start,
+            "end": end,
+            "dates": [str(index.start + int(i)) for i in offsets],
+            "count": found["count"],
+            "truncated": found["count"] > len(offsets),
+            "features": features,
+        }
+
+    def _all_of(self, clause: Dict[str, Any], dob: Optional[str]) -> np.ndarray:
+        bits = None
+        for feature, values in clause.items():
+            feature_bits = self._feature_bits(feature, values, dob)
+            bits = feature_bits if bits is None else bits & feature_bits
+        if bits is None:
+            raise ValueError("Empty condition")
+        return bits
+
+    def _feature_bits(self, feature: str, values: Any, dob: Optional[str]) -> np.ndarray:
+        numbers = self._resolve(feature, values)
+        if feature in PERSONAL_FEATURES:
+            if not dob:
+                raise ValueError(f"'{feature}' needs dob")
+            return self.index.bitset(feature, numbers, column=self._vibration_column(dob))
+        return self.index.bitset(feature, numbers)
+
+    def _resolve(self, feature: str, values: Any) -> List[int]:
+        """Feature values (numbers, names or a list of them) as numbers"""
+        if feature not in FEATURES and feature not in PERSONAL_FEATURES:
+            raise ValueError(f"Unknown feature '{feature}'. Use one of: {', '.join(FEATURES + PERSONAL_FEATURES)}")
+        names = {
+            "tithi": lambda: self.agents["jyotish"].TITHIS,
+            "nakshatra": lambda: self.agents["jyotish"].NAKSHATRAS,
+            "yoga": lambda: self.agents["jyotish"].YOGAS,
+        }
+        numbers = []
+        for value in values if isinstance(values, list) else [values]:
+            if isinstance(value, bool):
+                raise ValueError(f"Invalid value for '{feature}': {value}")
+            if isinstance(value, int):
+                numbers.append(value)
+            elif isinstance(value, str) and value.strip().lstrip("-").isdigit():
+                numbers.append(int(value))
+            elif isinstance(value, str) and feature == "yoga" and value.lower() == "malefic":
+                numbers.extend(MALEFIC_YOGAS)
+            elif isinstance(value, str) and feature == "weekday" and value.lower() in WEEKDAYS:
+                numbers.append(WEEKDAYS.index(value.lower()))
+            elif isinstance(value, str) and feature in names:
+                matches = [i + 1 for i, name in enumerate(names[feature]()) if name.lower() == value.lower()]
+                if not matches:
+                    raise ValueError(f"Unknown {feature} '{value}'")
+                numbers.extend(matches)
+            else:
+                raise ValueError(f"Invalid value for '{feature}': {value}")
+        return numbers
+
+    def _vibration_column(self, dob: str) -> np.ndarray:
+        with self._vibrations_lock:
+            column = self._vibrations.get(dob)
+            if column is not None:
+                self._vibrations.move_to_end(dob)
+                return column
+        # Computed outside the lock: a concurrent miss only repeats the work
+        index = self.index
+        column = self.agents["numerology"].engine.get_daily_vibrations(dob, str(index.start), index.days)
+        with self._vibrations_lock:
+            self._vibrations[dob] = column
+            while len(self._vibrations) > 16:
+                self._vibrations.popitem(last=False)
+        return column
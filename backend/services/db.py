@@ -0,0 +1,122 @@
+"""
+Shared database client for the services (Supabase PostgREST or local SQLite).
+
+ProfileService and TaskService used a synchronous supabase client from
+`async def` methods, so every query blocked the event loop. Both services
+now share one AsyncPostgrestClient backed by a pooled httpx.AsyncClient:
+
+- keep-alive connections are reused across requests and services
+- HTTP/2 is enabled when SUPABASE_HTTP2=1 and the `h2` package is installed
+- every call goes through `execute()`, which applies a per-call timeout
+
+Storage backends (STORAGE_BACKEND):
+    supabase (default)  remote Postgres through PostgREST
+    sqlite              embedded SQLite file (services/sqlite_store.py), for
+                        self-hosted nodes, offline use and benchmarks
+
+Environment:
+    STORAGE_BACKEND             "supabase" or "sqlite"
+    SQLITE_PATH                 database file for the sqlite backend (calendar.db)
+    SUPABASE_URL, SUPABASE_SERVICE_KEY / SUPABASE_ANON_KEY   (required for supabase)
+    SUPABASE_TIMEOUT            default per-call timeout in seconds (10)
+    SUPABASE_MAX_CONNECTIONS    connection pool size (20)
+    SUPABASE_HTTP2              "1" to negotiate HTTP/2 (0)
+"""
+
+import asyncio
+import importlib.util
+import os
+import threading
+from typing import Any, Optional
+
+_client = None
+_client_lock = threading.Lock()
+
+DEFAULT_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+
+
+class DatabaseTimeoutError(Exception):
+    """Raised when a database call exceeds its timeout."""
+    pass
+
+
+def get_credentials():
+    """Return (url, key) from the environment or raise ValueError."""
+    supabase_url = os.getenv('SUPABASE_URL')
+    supabase_key = os.getenv('SUPABASE_SERVICE_KEY') or os.getenv('SUPABASE_ANON_KEY')
+
+    if not supabase_url or not supabase_key:
+        raise ValueError("Missing Supabase credentials in environment variables")
+    return supabase_url, supabase_key
+
+
+def storage_backend() -> str:
+    """Configured backend name: 'supabase' or 'sqlite'. Raises ValueError otherwise."""
+    backend = os.getenv("STORAGE_BACKEND", "supabase").strip().lower()
+    if backend not in ("supabase", "sqlite"):
+        raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+    return backend
+
+
+def get_db():
+    """Return the process-wide storage client, creating it on first use."""
+    global _client
+    if _client is not None:
+        return _client
+
+    with _client_lock:
+        if _client is None:
+            if storage_backend() == "sqlite":
+                from .sqlite_store import SqliteClient
+                _client = SqliteClient(os.getenv("SQLITE_PATH", "calendar.db"))
+            else:
+                _client = _create_client(*get_credentials())
+    return _client
+
+
+def _create_client(supabase_url: str, supabase_key: str):
+    # Imported here so importing the services does not load httpx/postgrest
+    import httpx
+    from postgrest import AsyncPostgrestClient
+
+    max_connections = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "20"))
+    http2 = os.getenv("SUPABASE_HTTP2", "0") == "1" and importlib.util.find_spec("h2") is not None
+
+    headers = {
+        "apikey": supabase_key,
+        "Authorization": f"Bearer {supabase_key}",
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+    }
+    http_client = httpx.AsyncClient(
+        headers=headers,
+        timeout=httpx.Timeout(DEFAULT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=30.0,
+        ),
+        http2=http2,
+        follow_redirects=True,
+    )
+    return AsyncPostgrestClient(
+        f"{supabase_url.rstrip('/')}/rest/v1",
+        headers=headers,
+        http_client=http_client,
+    )
+
+
+async def execute(query, timeout: Optional[float] = None) -> Any:
+    """Run a PostgREST query builder with a per-call timeout."""
+    try:
+        return await asyncio.wait_for(query.execute(), timeout or DEFAULT_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise DatabaseTimeoutError(f"Database call timed out after {timeout or DEFAULT_TIMEOUT}s")
+
+
+async def close_db():
+    """Close pooled connections (call on shutdown)."""
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
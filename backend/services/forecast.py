@@ -0,0 +1,222 @@
+"""
+Forecast Service - day scores for 30/90/365-day horizons.
+
+Port of frontend/src/utils/forecastingEngine.js (analyzeDay /
+getMonthlyForecast). The browser scored one day at a time, recomputing
+numerology, Mayan and Panchanga for each day on every device. Here the
+series come from the agents' range APIs and the scoring runs on whole
+arrays:
+
+- Jyotish: critical tithis (Rikta 4/9/14 and Amavasya) -2, good tithis +1,
+  malefic yogas -1
+- Mayan: tone 1 or 13 +2, tone 7 +1
+- Numerology: master number vibrations (11/22/33) +1
+
+The result is columnar (one list per field) to stay small for a year of
+days. The sky series (Mayan and Panchanga) are shared by every user and
+memoized in-process; each full forecast is cached per birth date, start,
+horizon and language for FORECAST_CACHE_TTL seconds.
+"""
+
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from datetime import date as date_cls, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .profile_cache import _MISSING, create_cache_backend
+
+FORECAST_CACHE_TTL = float(os.getenv("FORECAST_CACHE_TTL", str(24 * 3600)))
+MAX_FORECAST_DAYS = int(os.getenv("MAX_FORECAST_DAYS", "366"))
+SKY_SERIES_CACHE_SIZE = 32
+
+CRITICAL_TITHIS = (4, 9, 14, 30)  # Rikta (empty) tithis and Amavasya
+GOOD_TITHIS = (2, 3, 5, 7, 10, 11, 13)
+# Vishkumbha, Atiganda, Shula, Ganda, Vyaghata, Vajra, Vyatipata, Parigha, Vaidhriti
+MALEFIC_YOGAS = (1, 6, 9, 10, 13, 15, 17, 19, 27)
+MASTER_NUMBERS = (11, 22, 33)
+
+STATUSES = ("Critical", "Caution", "Neutral", "Good", "Excellent")
+
+MEANINGS = {
+    1: {"ru": "День начинаний, лидерства и независимости. Сейте семена.", "en": "Day of beginnings, leadership and independence. Plant seeds.", "he": "יום של התחלות, מנהיגות ועצמאות. תזרעו זרעים."},
+    2: {"ru": "День сотрудничества, дипломатии и терпения. Слушайте других.", "en": "Day of cooperation, diplomacy and patience. Listen to others.", "he": "יום של שיתוף פעולה, דיפלומטיה וסבלנות. הקשיבו לאחרים."},
+    3: {"ru": "День самовыражения, общения и творчества. Будьте заметны.", "en": "Day of self-expression, communication and creativity. Be visible.", "he": "יום של ביטוי עצמי, תקשורת ויצירתיות. היו בולטים."},
+    4: {"ru": "День труда, организации и наведения порядка. Стройте фундамент.", "en": "Day of work, organization and order. Build a foundation.", "he": "יום של עבודה, ארגון וסדר. בנו יסודות."},
+    5: {"ru": "День перемен, свободы и приключений. Будьте гибки.", "en": "Day of change, freedom and adventure. Be flexible.", "he": "יום של שינוי, חופש והרפתקאות. היו גמישים."},
+    6: {"ru": "День ответственности, заботы и семьи. Гармонизируйте пространство.", "en": "Day of responsibility, care and family. Harmonize your space.", "he": "יום של אחריות, דאגה ומשפחה. הרמוניה במרחב."},
+    7: {"ru": "День анализа, размышлений и уединения. Ищите истину.", "en": "Day of analysis, reflection and solitude. Seek the truth.", "he": "יום של ניתוח, הרהור והתבודדות. חפשו את האמת."},
+    8: {"ru": "День силы, финансов и достижений. Управляйте ресурсами.", "en": "Day of power, finance and achievement. Manage resources.", "he": "יום של כוח, כספים והישגים. נהלו משאבים."},
+    9: {"ru": "День завершения, очищения и благотворительности. Отпустите старое.", "en": "Day of completion, cleansing and charity. Let go of the old.", "he": "יום של סיום, טיהור וצדקה. שחררו את הישן."},
+}
+
+NOTES = {
+    "tithiCritical": {"ru": "⚠️ Титхи {name}: Энергия пустых рук или завершения.", "en": "⚠️ Tithi {name}: Energy of empty hands or completion.", "he": "⚠️ טיטהי {name}: אנרגיה של ידיים ריקות או סיום."},
+    "yogaMalefic": {"ru": "🌪️ Йога {name}: Возможны препятствия.", "en": "🌪️ Yoga {name}: Obstacles possible.", "he": "🌪️ יוגה {name}: ייתכנו מכשולים."},
+    "mayan13": {"ru": "🏁 Майя Тон 13: Космическое завершение и полёт.", "en": "🏁 Mayan Tone 13: Cosmic completion and flight.", "he": "🏁 טון מאיה 13: סיום קוסמי ותעופה."},
+    "mayan1": {"ru": "🌱 Майя Тон 1: Магнитная цель, начало нового.", "en": "🌱 Mayan Tone 1: Magnetic purpose, new beginning.", "he": "🌱 טון מאיה 1: מטרה מגנטית, התחלה חדשה."},
+    "masterNum": {"ru": "⚡ Нумерология {number}: Мастер-число призывает к великому.", "en": "⚡ Numerology {number}: Master number calls for greatness.", "he": "⚡ נומרולוגיה {number}: מספר מאסטר קורא לגדולה."},
+    "cleanse9": {"ru": "🧹 День очищения (9).", "en": "🧹 Cleansing Day (9).", "he": "🧹 יום טיהור (9)."},
+    "start1": {"ru": "🚀 День старта (1).", "en": "🚀 Start Day (1).", "he": "🚀 יום זינוק (1)."},
+    "masterDay": {"ru": "Мастер-день высокой энергии.", "en": "Master day of high energy.", "he": "יום מאסטר באנרגיה גבוהה."},
+}
+
+NEUTRAL_SUMMARY = {
+    "ru": "День с ровной, нейтральной энергией. Благоприятен для текущих задач.",
+    "en": "Day with steady, neutral energy. Good for current tasks.",
+    "he": "יום עם אנרגיה יציבה ונייטרלית. טוב למשימות שוטפות.",
+}
+
+
+def _text(table: Dict[str, str], language: str) -> str:
+    return table.get(language) or table["ru"]
+
+
+def score_days(vibration: np.ndarray, tone: np.ndarray, tithi: np.ndarray, yoga: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Vectorized analyzeDay scoring. Takes aligned per-day arrays and returns
+    the score and status index (into STATUSES) plus the boolean note masks.
+    """
+    # Krishna paksha tithis fold onto Shukla ones; Amavasya (30) stays 30
+    folded = np.where((tithi > 15) & (tithi != 30), tithi - 15, tithi)
+    masks = {
+        "tithiCritical": np.isin(folded, CRITICAL_TITHIS),
+        "yogaMalefic": np.isin(yoga, MALEFIC_YOGAS),
+        "mayan13": tone == 13,
+        "mayan1": tone == 1,
+        "masterNum": np.isin(vibration, MASTER_NUMBERS),
+        "cleanse9": vibration == 9,
+        "start1": vibration == 1,
+    }
+    score = (
+        -2 * masks["tithiCritical"] + np.isin(folded, GOOD_TITHIS)
+        - masks["yogaMalefic"]
+        + 2 * (masks["mayan13"] | masks["mayan1"]) + (tone == 7)
+        + masks["masterNum"]
+    ).astype(np.int64)
+    # Critical <= -2 < Caution < 0 = Neutral < Good < 3 <= Excellent
+    status = np.select([score <= -2, score < 0, score == 0, score < 3], [0, 1, 2, 3], 4)
+    return {"score": score, "status": status, "masks": masks}
+
+
+class ForecastService:
+    """Scores day ranges with the registry's numerology, Mayan and Jyotish agents"""
+
+    def __init__(self, agents: Dict[str, Any], cache_backend=None, ttl: Optional[float] = None):
+        # agents: registry proxies for numerology, mayan and jyotish
+        self.agents = agents
+        self.cache = cache_backend or create_cache_backend()
+        self.ttl = ttl or FORECAST_CACHE_TTL
+        self._sky: "OrderedDict[Tuple[str, int], Dict[str, np.ndarray]]" = OrderedDict()
+        self._sky_lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    async def get_forecast(
+        self,
+        dob: str,
+        start: Optional[str] = None,
+        days: int = 30,
+        language: str = "ru"
+    ) -> Dict[str, Any]:
+        """
+        Forecast for `days` days from `start` (default: today, UTC).
+        Raises ValueError for malformed dates or an out-of-range horizon.
+        """
+        start = start or datetime.now(timezone.utc).date().isoformat()
+        try:
+            date_cls.fromisoformat(dob)
+            date_cls.fromisoformat(start)
+        except ValueError:
+            raise ValueError("Dates must be in YYYY-MM-DD format")
+        if not 1 <= days <= MAX_FORECAST_DAYS:
+            raise ValueError(f"days must be between 1 and {MAX_FORECAST_DAYS}")
+
+        key = f"forecast:{dob}:{start}:{days}:{language}"
+        cached = await self.cache.get(key)
+        if cached is not _MISSING:
+            self.stats["hits"] += 1
+            return cached
+
+        self.stats["misses"] += 1
+        forecast = await asyncio.to_thread(self.build_forecast, dob, start, days, language)
+        await self.cache.set(key, forecast, self.ttl)
+        return forecast
+
+    def build_forecast(self, dob: str, start: str, days: int, language: str = "ru") -> Dict[str, Any]:
+        """Compute the columnar forecast (no caching of the result)"""
+        sky = self._sky_series(start, days)
+        vibration = self.agents["numerology"].engine.get_daily_vibrations(dob, start, days)
+        scored = score_days(vibration, sky["tone"], sky["tithi"], sky["yoga"])
+
+        jyotish = self.agents["jyotish"]
+        notes = self._notes(scored["masks"], vibration, sky, jyotish, language)
+        dates = np.datetime64(start, "D") + np.arange(days)
+        statuses = [STATUSES[i] for i in scored["status"]]
+
+        return {
+            "start": start,
+            "days": days,
+            "language": language,
+            "columns": {
+                "date": [str(d) for d in dates],
+                "score": scored["score"].tolist(),
+                "status": statuses,
+                "vibration": vibration.tolist(),
+                "kin": sky["kin"].tolist(),
+                "tone": sky["tone"].tolist(),
+                "seal": sky["seal"].tolist(),
+                "tithi": sky["tithi"].tolist(),
+                "yoga": sky["yoga"].tolist(),
+                "nakshatra": sky["nakshatra"].tolist(),
+                "notes": notes,
+            },
+            "counts": {status: statuses.count(status) for status in STATUSES},
+            # Lookups for the numeric columns (1-based numbers index into these)
+            "legend": {
+                "tithis": list(jyotish.TITHIS),
+                "yogas": list(jyotish.YOGAS),
+                "nakshatras": list(jyotish.NAKSHATRAS),
+                "meanings": {n: _text(texts, language) for n, texts in MEANINGS.items()},
+                "master_day": _text(NOTES["masterDay"], language),
+                "neutral_summary": _text(NEUTRAL_SUMMARY, language),
+            },
+        }
+
+    def _sky_series(self, start: str, days: int) -> Dict[str, np.ndarray]:
+        """Mayan and Panchanga columns for the range, shared by every user"""
+        key = (start, days)
+        with self._sky_lock:
+            if key in self._sky:
+                self._sky.move_to_end(key)
+                return self._sky[key]
+
+        series = {
+            **self.agents["mayan"].calculate_tzolkin_range(start, days),
+            **self.agents["jyotish"].calculate_panchanga_range(start, days),
+        }
+        with self._sky_lock:
+            self._sky[key] = series
+            while len(self._sky) > SKY_SERIES_CACHE_SIZE:
+                self._sky.popitem(last=False)
+        return series
+
+    @staticmethod
+    def _notes(masks, vibration, sky, jyotish, language: str) -> List[List[str]]:
+        """Localized notes per day, in analyzeDay's order (only days with flags do work)"""
+        notes: List[List[str]] = [[] for _ in range(len(vibration))]
+        templates = {key: _text(texts, language) for key, texts in NOTES.items()}
+        for key in ("tithiCritical", "yogaMalefic", "mayan13", "mayan1", "masterNum", "cleanse9", "start1"):
+            for i in np.flatnonzero(masks[key]):
+                if key == "tithiCritical":
+                    text = templates[key].format(name=jyotish.TITHIS[sky["tithi"][i] - 1])
+                elif key == "yogaMalefic":
+                    text = templates[key].format(name=jyotish.YOGAS[sky["yoga"][i] - 1])
+                elif key == "masterNum":
+                    text = templates[key].format(number=int(vibration[i]))
+                else:
+                    text = templates[key]
+                notes[i].append(text)
+        return notes
@@ -0,0 +1,100 @@
+"""
+Interval Index - dynamic set of [start, end) intervals for conflict checks.
+
+Entries are kept sorted by start in a flat list, with the longest interval
+length tracked alongside. Every interval overlapping [s, e) starts in
+(s - max_length, e), so a query is two bisections plus a scan of that
+narrow band: O(log n + k) for k candidates, instead of comparing every
+pair of tasks.
+
+- add/remove: O(log n) search (plus a memmove for the list insert)
+- overlapping(s, e): intervals that intersect [s, e)
+- conflicts(): all overlapping pairs, by a sweep over the sorted entries
+- free_slots(s, e, min_length): gaps of at least min_length in [s, e)
+
+Times are plain floats (epoch seconds); TaskService does the conversion.
+"""
+
+import heapq
+from bisect import bisect_left, insort
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class IntervalIndex:
+    """Sorted intervals keyed by id, each with optional payload data."""
+
+    def __init__(self):
+        self._entries: List[Tuple[float, Hashable]] = []  # (start, key), sorted
+        self._intervals: Dict[Hashable, Tuple[float, float, Any]] = {}
+        # Upper bound on interval length: only grows, which keeps queries correct
+        self._max_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._intervals
+
+    def add(self, key: Hashable, start: float, end: float, data: Any = None):
+        """Insert or move an interval"""
+        if key in self._intervals:
+            self.remove(key)
+        insort(self._entries, (start, key))
+        self._intervals[key] = (start, end, data)
+        self._max_length = max(self._max_length, end - start)
+
+    def remove(self, key: Hashable) -> bool:
+        """Drop an interval; returns False if it was not indexed"""
+        interval = self._intervals.pop(key, None)
+        if interval is None:
+            return False
+        i = bisect_left(self._entries, (interval[0], key))
+        del self._entries[i]
+        return True
+
+    def get(self, key: Hashable) -> Optional[Tuple[float, float, Any]]:
+        return self._intervals.get(key)
+
+    def overlapping(self, start: float, end: float, exclude: Optional[Hashable] = None) -> List[Tuple[Hashable, float, float, Any]]:
+        """Intervals intersecting [start, end), ordered by start"""
+        lo = bisect_left(self._entries, (start - self._max_length,))
+        hi = bisect_left(self._entries, (end,))
+        found = []
+        for _, key in self._entries[lo:hi]:
+            s, e, data = self._intervals[key]
+            if e > start and key != exclude:
+                found.append((key, s, e, data))
+        return found
+
+    def conflicts(self, start: Optional[float] = None, end: Optional[float] = None) -> List[Tuple[Hashable, Hashable, float]]:
+        """
+        All overlapping pairs (a, b, overlap seconds) with a starting first,
+        optionally limited to intervals intersecting [start, end).
+        """
+        lo = 0 if start is None else bisect_left(self._entries, (start - self._max_length,))
+        hi = len(self._entries) if end is None else bisect_left(self._entries, (end,))
+
+        pairs = []
+        active: List[Tuple[float, Hashable]] = []  # min-heap of (end, key)
+        for s, key in self._entries[lo:hi]:
+            e = self._intervals[key][1]
+            if start is not None and e <= start:
+                continue
+            while active and active[0][0] <= s:
+                heapq.heappop(active)
+            for other_end, other in active:
+                pairs.append((other, key, min(e, other_end) - s))
+            heapq.heappush(active, (e, key))
+        return pairs
+
+    def free_slots(self, start: float, end: float, min_length: float = 0.0) -> List[Tuple[float, float]]:
+        """Gaps in [start, end) not covered by any interval, at least min_length long"""
+        slots = []
+        cursor = start
+        for _, s, e, _ in self.overlapping(start, end):
+            if s - cursor >= max(min_length, 1e-9):
+                slots.append((cursor, s))
+            cursor = max(cursor, e)
+        if end - cursor >= max(min_length, 1e-9):
+            slots.append((cursor, end))
+        return slots
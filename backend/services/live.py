@@ -0,0 +1,157 @@
+"""
+Live Hub - pushes hora / muhurta transitions to open connections (SSE).
+
+Frontends polled hora and Rahu Kala every minute to flip is_active flags.
+A client now opens GET /api/live with its location and keeps the
+connection idle: it gets a "snapshot" of the intervals active right now,
+then one event per transition (hora change, Rahu Kala start/end, Brahma
+Muhurta, ...) at the moment it happens.
+
+Each connection is a TransitionScheduler subscription (user id
+"live:<connection id>", end events on), so connections at the same
+location share the scheduler's timelines and event tracks; the hub is one
+scheduler listener that routes fired events into per-connection queues.
+A slow client whose queue (LIVE_QUEUE_SIZE) is full loses the oldest
+event rather than holding up everyone else.
+"""
+
+import asyncio
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from zoneinfo import ZoneInfo
+
+from .bulk_muhurtas import geohash_center
+
+LIVE_MAX_CONNECTIONS = int(os.getenv("LIVE_MAX_CONNECTIONS", "10000"))
+LIVE_QUEUE_SIZE = int(os.getenv("LIVE_QUEUE_SIZE", "100"))
+LIVE_HEARTBEAT = float(os.getenv("LIVE_HEARTBEAT", "15"))
+LIVE_PREFIX = "live:"
+DEFAULT_LIVE_KINDS = ("hora", "rahu_kala", "gulika_kala", "yamaghanda", "abhijit_muhurta", "brahma_muhurta")
+
+
+class LiveLimitError(Exception):
+    """Raised when LIVE_MAX_CONNECTIONS connections are already open."""
+
+
+@dataclass(eq=False)
+class LiveConnection:
+    id: str
+    queue: "asyncio.Queue[Dict[str, Any]]"
+    snapshot: Dict[str, Any]
+
+
+class LiveHub:
+    def __init__(self, scheduler, muhurtas_agent):
+        self.scheduler = scheduler
+        self.muhurtas = muhurtas_agent
+        self._connections: Dict[str, LiveConnection] = {}
+        self._listening = False
+        self.stats: Dict[str, int] = {"connected": 0, "disconnected": 0, "delivered": 0, "dropped": 0}
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    async def connect(
+        self,
+        latitude: float,
+        longitude: float,
+        timezone: Optional[str] = None,
+        kinds: Optional[Sequence[str]] = None,
+        language: str = "ru",
+    ) -> LiveConnection:
+        """
+        Open a connection: subscribe it to the scheduler and build its
+        snapshot (off the event loop). `timezone` defaults to the zone at
+        the coordinates. Raises ValueError on invalid input, LiveLimitError
+        when full.
+        """
+        if len(self._connections) >= LIVE_MAX_CONNECTIONS:
+            raise LiveLimitError(f"Too many live connections (max {LIVE_MAX_CONNECTIONS})")
+        kinds = tuple(kinds or DEFAULT_LIVE_KINDS)
+        if not timezone:
+            from agents.muhurtas_agent import timezone_at
+            timezone = timezone_at(latitude, longitude)
+        if not self._listening:
+            self.scheduler.add_listener(self._route)
+            self._listening = True
+
+        connection_id = uuid.uuid4().hex
+        conn = LiveConnection(
+            id=connection_id,
+            queue=asyncio.Queue(maxsize=LIVE_QUEUE_SIZE),
+            snapshot={},
+        )
+        self._connections[connection_id] = conn
+        try:
+            subscription = self.scheduler.subscribe(
+                LIVE_PREFIX + connection_id, latitude, longitude, timezone,
+                kinds=kinds, lead_minutes=[0], language=language, ends=True,
+            )
+            # Two day-timeline solves: keep them off the event loop
+            current = await asyncio.to_thread(self._current, subscription["cell"], timezone, kinds, language)
+            conn.snapshot = {
+                "type": "snapshot",
+                "connection_id": connection_id,
+                "cell": subscription["cell"],
+                "timezone": timezone,
+                "current": current,
+            }
+        except Exception:
+            self._connections.pop(connection_id, None)
+            self.scheduler.unsubscribe(LIVE_PREFIX + connection_id)
+            raise
+        self.stats["connected"] += 1
+        return conn
+
+    def disconnect(self, conn: LiveConnection):
+        if self._connections.pop(conn.id, None) is not None:
+            self.scheduler.unsubscribe(LIVE_PREFIX + conn.id)
+            self.stats["disconnected"] += 1
+
+    def _current(self, cell: str, timezone: str, kinds, language: str) -> List[Dict[str, Any]]:
+        """Intervals active now, from yesterday's and today's timelines"""
+        # Same point the scheduler computes the cell's timelines at
+        latitude, longitude = geohash_center(cell)
+        now = datetime.fromtimestamp(self.scheduler.clock(), ZoneInfo(timezone))
+        current = []
+        for day in (now - timedelta(days=1), now):
+            timeline = self.muhurtas.get_day_timeline(day, latitude, longitude, language, now=now)
+            current += [interval for interval in timeline["current"] if interval["type"] in kinds]
+        return current
+
+    def _route(self, event: Dict[str, Any]):
+        """Scheduler listener: hand live events to their connection's queue"""
+        user_id = event["user_id"]
+        if not user_id.startswith(LIVE_PREFIX):
+            return
+        conn = self._connections.get(user_id[len(LIVE_PREFIX):])
+        if conn is None:
+            return
+        payload = {"type": "transition", **{k: v for k, v in event.items() if k != "user_id"}}
+        if conn.queue.full():
+            conn.queue.get_nowait()
+            self.stats["dropped"] += 1
+        conn.queue.put_nowait(payload)
+        self.stats["delivered"] += 1
+
+    async def events(self, conn: LiveConnection, heartbeat: float = LIVE_HEARTBEAT) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """The snapshot, then transitions as they fire; None every `heartbeat` idle seconds"""
+        yield conn.snapshot
+        while conn.id in self._connections:
+            try:
+                yield await asyncio.wait_for(conn.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "open": len(self._connections)}
+
+
+def kinds_from_query(value: Optional[str]) -> Optional[List[str]]:
+    """"hora,rahu_kala" -> ["hora", "rahu_kala"] (validated by the scheduler)"""
+    if not value:
+        return None
+    return [kind.strip() for kind in value.split(",") if kind.strip()]
@@ -0,0 +1,165 @@
+"""
+Profile Cache - per-user read-through cache for ProfileService.
+
+The frontend asks for the active profile on nearly every page. ProfileCache
+keeps each user's active profile and profile list, bounded by TTL and LRU
+size, and ProfileService drops a user's entries after every write
+(create/update/switch/delete).
+
+Backends:
+- MemoryCacheBackend (default): per-process OrderedDict. With several
+  workers, another worker's writes show up after at most the TTL.
+- RedisCacheBackend: set PROFILE_CACHE_URL=redis://... to share entries and
+  invalidations across workers. Needs the optional `redis` package.
+
+A read that started before an invalidation does not store its (possibly
+stale) result: each user has a generation number that writes bump.
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+_MISSING = object()
+
+
+class CacheBackend(ABC):
+    """Key/value storage used by ProfileCache."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Any:
+        """Return the stored value or _MISSING."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float):
+        pass
+
+    @abstractmethod
+    async def delete(self, *keys: str):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU with per-entry expiry. With copy_values=True values are
+    copied in and out, so callers mutating a returned profile cannot change
+    the cached one (the Redis backend gets this from its JSON round trip).
+    Read-only values such as forecasts are stored as-is.
+    """
+
+    def __init__(self, max_entries: int = 10000, copy_values: bool = False):
+        self.max_entries = max_entries
+        self.copy_values = copy_values
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+        return copy.deepcopy(value) if self.copy_values else value
+
+    async def set(self, key: str, value: Any, ttl: float):
+        if self.copy_values:
+            value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    async def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis-backed cache shared by all workers. LRU is Redis' maxmemory policy."""
+
+    def __init__(self, url: str, prefix: str = "cosmic:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise ValueError("PROFILE_CACHE_URL is set but the 'redis' package is not installed")
+        self._redis = redis.from_url(url)
+        self._prefix = prefix
+
+    async def get(self, key: str) -> Any:
+        raw = await self._redis.get(self._prefix + key)
+        return _MISSING if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        await self._redis.set(self._prefix + key, json.dumps(value, default=str), px=int(ttl * 1000))
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self._redis.delete(*[self._prefix + key for key in keys])
+
+
+def create_cache_backend(copy_values: bool = False) -> CacheBackend:
+    """Pick the backend from PROFILE_CACHE_URL (memory if unset)."""
+    url = os.getenv("PROFILE_CACHE_URL")
+    if url:
+        try:
+            return RedisCacheBackend(url)
+        except ValueError as e:
+            print(f"Warning: {e}. Falling back to in-memory profile cache.")
+    return MemoryCacheBackend(
+        max_entries=int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "10000")), copy_values=copy_values
+    )
+
+
+class ProfileCache:
+    """Read-through cache of active profile and profile list, keyed by user."""
+
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl: Optional[float] = None):
+        # Profiles are mutable dicts handed to callers, so the memory backend copies them
+        self.backend = backend or create_cache_backend(copy_values=True)
+        self.ttl = ttl or float(os.getenv("PROFILE_CACHE_TTL", "300"))
+        self._generations: Dict[str, int] = {}
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @staticmethod
+    def active_key(user_id: str) -> str:
+        return f"profile:active:{user_id}"
+
+    @staticmethod
+    def list_key(user_id: str) -> str:
+        return f"profile:list:{user_id}"
+
+    async def get_or_load(self, key: str, user_id: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for `key`, or call `loader` and cache its result."""
+        cached = await self.backend.get(key)
+        if cached is not _MISSING:
+            self.stats["hits"] += 1
+            return cached["value"]
+
+        self.stats["misses"] += 1
+        generation = self._generations.get(user_id, 0)
+        value = await loader()
+        # Skip the store if a write invalidated this user while we were loading
+        if self._generations.get(user_id, 0) == generation:
+            await self.backend.set(key, {"value": value}, self.ttl)
+        return value
+
+    async def invalidate_user(self, user_id: str):
+        """Drop all cached entries for a user (call after every write)."""
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        self.stats["invalidations"] += 1
+        await self.backend.delete(self.active_key(user_id), self.list_key(user_id))
@@ -1,26 +1,27 @@
-import os
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from supabase import create_client, Client
+from .action_log_writer import ActionLogWriter
+from .db import get_db, execute
+from .profile_cache import ProfileCache
 
 class ProfileService:
     """Service for managing user birth profiles and action logging"""
     
-    def __init__(self):
-        supabase_url = os.getenv('SUPABASE_URL')
-        supabase_key = os.getenv('SUPABASE_SERVICE_KEY') or os.getenv('SUPABASE_ANON_KEY')
-        
-        if not supabase_url or not supabase_key:
-            raise ValueError("Missing Supabase credentials in environment variables")
-        
-        self.supabase: Client = create_client(supabase_url, supabase_key)
+    def __init__(self, db=None):
+        # Shared async PostgREST client (raises ValueError without credentials)
+        self.db = db or get_db()
+
+        # action_log rows are buffered and written in batches off the request path
+        self.log_writer = ActionLogWriter(self._insert_log_rows)
+
+        # Active profile and profile list per user, dropped after every write
+        self.cache = ProfileCache()
     
     async def create_profile(self, user_id: str, profile_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new profile for a user"""
         try:
             # Prepare profile data
             data = {
-                'user_id': user_id,
                 'profile_name': profile_data.get('profile_name', 'Main Profile'),
                 'birth_date': profile_data['birth_date'],
                 'birth_time': profile_data.get('birth_time'),
@@ -31,12 +32,11 @@ class ProfileService:
                 'is_active': profile_data.get('is_active', True)
             }
             
-            # If this is the first profile or explicitly set as active, deactivate others
-            if data['is_active']:
-                await self._deactivate_all_profiles(user_id)
-            
-            # Insert new profile
-            result = self.supabase.table('profiles').insert(data).execute()
+            # Insert (and deactivate the others if active) in one transaction,
+            # see create_profile() in database/supabase_setup.sql
+            result = await execute(
+                self.db.rpc('create_profile', {'p_user_id': user_id, 'p_profile': data})
+            )
             profile = result.data[0] if result.data else None
             
             if profile:
@@ -56,17 +56,16 @@ class ProfileService:
                 details={'error': str(e)}
             )
             raise
+        finally:
+            await self.cache.invalidate_user(user_id)
     
     async def get_active_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get the user's currently active profile"""
         try:
-            result = self.supabase.table('profiles') \
-                .select('*') \
-                .eq('user_id', user_id) \
-                .eq('is_active', True) \
-                .execute()
-            
-            profile = result.data[0] if result.data else None
+            profile = await self.cache.get_or_load(
+                self.cache.active_key(user_id), user_id,
+                lambda: self._fetch_active_profile(user_id)
+            )
             
             if profile:
                 await self.log_action(
@@ -89,13 +88,10 @@ class ProfileService:
     async def get_all_profiles(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all profiles for a user"""
         try:
-            result = self.supabase.table('profiles') \
-                .select('*') \
-                .eq('user_id', user_id) \
-                .order('created_at', desc=False) \
-                .execute()
-            
-            return result.data if result.data else []
+            return await self.cache.get_or_load(
+                self.cache.list_key(user_id), user_id,
+                lambda: self._fetch_all_profiles(user_id)
+            )
         except Exception as e:
             await self.log_action(
                 user_id=user_id,
@@ -108,15 +104,11 @@ class ProfileService:
     async def switch_profile(self, user_id: str, profile_id: str) -> Optional[Dict[str, Any]]:
         """Switch to a different profile"""
         try:
-            # Deactivate all profiles
-            await self._deactivate_all_profiles(user_id)
-            
-            # Activate selected profile
-            result = self.supabase.table('profiles') \
-                .update({'is_active': True}) \
-                .eq('id', profile_id) \
-                .eq('user_id', user_id) \
-                .execute()
+            # Deactivate the others and activate the selected one in one transaction,
+            # see switch_active_profile() in database/supabase_setup.sql
+            result = await execute(
+                self.db.rpc('switch_active_profile', {'p_user_id': user_id, 'p_profile_id': profile_id})
+            )
             
             profile = result.data[0] if result.data else None
             
@@ -137,6 +129,8 @@ class ProfileService:
                 details={'error': str(e)}
             )
             raise
+        finally:
+            await self.cache.invalidate_user(user_id)
     
     async def update_profile(self, user_id: str, profile_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update profile data"""
@@ -146,11 +140,12 @@ class ProfileService:
             updates.pop('user_id', None)
             updates.pop('created_at', None)
             
-            result = self.supabase.table('profiles') \
-                .update(updates) \
-                .eq('id', profile_id) \
-                .eq('user_id', user_id) \
-                .execute()
+            result = await execute(
+                self.db.table('profiles')
+                .update(updates)
+                .eq('id', profile_id)
+                .eq('user_id', user_id)
+            )
             
             profile = result.data[0] if result.data else None
             
@@ -171,31 +166,30 @@ class ProfileService:
                 details={'error': str(e)}
             )
             raise
+        finally:
+            await self.cache.invalidate_user(user_id)
     
     async def delete_profile(self, user_id: str, profile_id: str) -> bool:
         """Delete a profile"""
         try:
-            # Get profile info before deletion for logging
-            profile_result = self.supabase.table('profiles') \
-                .select('profile_name') \
-                .eq('id', profile_id) \
-                .eq('user_id', user_id) \
-                .execute()
-            
-            profile_name = profile_result.data[0]['profile_name'] if profile_result.data else 'Unknown'
-            
-            # Delete profile
-            self.supabase.table('profiles') \
-                .delete() \
-                .eq('id', profile_id) \
-                .eq('user_id', user_id) \
-                .execute()
+            # Write queued rows for this profile while it still exists
+            await self.log_writer.flush()
+            # Delete profile (PostgREST returns the deleted row, used for logging)
+            result = await execute(
+                self.db.table('profiles')
+                .delete()
+                .eq('id', profile_id)
+                .eq('user_id', user_id)
+            )
+            
+            profile_name = result.data[0]['profile_name'] if result.data else 'Unknown'
             
+            # The row is gone: a profile_id would fail the action_log foreign key
             await self.log_action(
                 user_id=user_id,
-                profile_id=profile_id,
+                profile_id=None,
                 action_type='profile_deleted',
-                details={'profile_name': profile_name}
+                details={'profile_id': profile_id, 'profile_name': profile_name}
             )
             
             return True
@@ -207,37 +201,60 @@ class ProfileService:
                 details={'error': str(e)}
             )
             raise
+        finally:
+            await self.cache.invalidate_user(user_id)
+    
+    async def _fetch_active_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Helper: Load the active profile from the database (cache loader)"""
+        result = await execute(
+            self.db.table('profiles')
+            .select('*')
+            .eq('user_id', user_id)
+            .eq('is_active', True)
+        )
+        return result.data[0] if result.data else None
     
-    async def _deactivate_all_profiles(self, user_id: str):
-        """Helper: Deactivate all profiles for a user"""
-        self.supabase.table('profiles') \
-            .update({'is_active': False}) \
-            .eq('user_id', user_id) \
-            .execute()
+    async def _fetch_all_profiles(self, user_id: str) -> List[Dict[str, Any]]:
+        """Helper: Load all profiles from the database (cache loader)"""
+        result = await execute(
+            self.db.table('profiles')
+            .select('*')
+            .eq('user_id', user_id)
+            .order('created_at', desc=False)
+        )
+        return result.data if result.data else []
     
     async def log_action(self, user_id: str, profile_id: Optional[str], action_type: str, details: Dict[str, Any]):
-        """Log an action to the action_log table"""
-        try:
-            self.supabase.table('action_log').insert({
-                'user_id': user_id,
-                'profile_id': profile_id,
-                'action_type': action_type,
-                'action_details': details,
-                'timestamp': datetime.utcnow().isoformat()
-            }).execute()
-        except Exception as e:
-            # Silently fail logging to avoid breaking main operations
-            print(f"Failed to log action: {e}")
+        """Queue an action for the action_log table (written in batches by log_writer)"""
+        self.log_writer.enqueue({
+            'user_id': user_id,
+            'profile_id': profile_id,
+            'action_type': action_type,
+            'action_details': details,
+            'timestamp': datetime.utcnow().isoformat()
+        })
+    
+    async def _insert_log_rows(self, rows: List[Dict[str, Any]]):
+        """Helper: Multi-row insert into action_log (called by log_writer)"""
+        await execute(self.db.table('action_log').insert(rows))
+    
+    async def close(self):
+        """Drain buffered action logs (call on shutdown)"""
+        await self.log_writer.close()
     
     async def get_recent_logs(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent action logs for a user"""
         try:
-            result = self.supabase.table('action_log') \
-                .select('*') \
-                .eq('user_id', user_id) \
-                .order('timestamp', desc=True) \
-                .limit(limit) \
-                .execute()
+            # Write out buffered rows first so the caller sees its own actions
+            await self.log_writer.flush()
+            
+            result = await execute(
+                self.db.table('action_log')
+                .select('*')
+                .eq('user_id', user_id)
+                .order('timestamp', desc=True)
+                .limit(limit)
+            )
             
             return result.data if result.data else []
         except Exception as e:
@@ -0,0 +1,145 @@
+"""
+Recurrence - RRULE expansion for recurring tasks.
+
+A recurring task is a template row: recurrence_rule is set and
+parent_task_id is NULL. Its occurrences are materialized as ordinary task
+rows (parent_task_id = template id, recurrence_id = occurrence start), but
+only inside a sliding window (RECURRENCE_WINDOW_DAYS, default 60) so an
+open-ended rule never produces unbounded rows.
+
+Expansion is incremental: each template remembers how far it has been
+materialized (recurrence_expanded_until), and the next expansion only
+generates [max(expanded_until, window start), window end).
+
+Rules are expanded in the template's timezone (tasks.timezone, default
+UTC) so "every Monday 09:00" stays at 09:00 local time across DST
+changes; occurrences are stored in UTC.
+
+This module holds the pure parts (compiling rules and generating
+occurrences); TaskService.expand_recurrences does the database work.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import islice, takewhile
+from typing import Iterator, Optional, Tuple, Any, Dict
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+RECURRENCE_WINDOW_DAYS = int(os.getenv("RECURRENCE_WINDOW_DAYS", "60"))
+
+# Guards against rules like FREQ=MINUTELY filling the table
+MAX_OCCURRENCES_PER_EXPANSION = int(os.getenv("RECURRENCE_MAX_OCCURRENCES", "500"))
+
+
+@lru_cache(maxsize=1024)
+def compile_rule(rule: str, dtstart: datetime):
+    """
+    Parse an RRULE once per (rule, dtstart).
+
+    Accepts "FREQ=..." or "RRULE:FREQ=..." (and multi-line rule sets with
+    RDATE/EXDATE). Raises ValueError for invalid rules.
+    """
+    from dateutil.rrule import rrulestr
+
+    text = rule.strip()
+    if '\n' not in text and not text.upper().startswith('RRULE:'):
+        text = 'RRULE:' + text
+    return rrulestr(text, dtstart=dtstart, forceset=True)
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """ISO string/date/datetime from a tasks row -> aware UTC datetime"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def template_zone(template: Dict[str, Any]):
+    """The template's timezone (tasks.timezone, default UTC). Raises ValueError."""
+    name = template.get('timezone') or 'UTC'
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone '{name}'")
+
+
+def template_anchor(template: Dict[str, Any]) -> Tuple[Optional[datetime], bool]:
+    """
+    DTSTART of a template, in its timezone, and whether its occurrences
+    carry a time.
+
+    scheduled_at wins (timed occurrences); otherwise due_date, then
+    created_at (date-only occurrences, anchored at local midnight).
+    """
+    tz = template_zone(template)
+    if template.get('scheduled_at'):
+        return parse_timestamp(template['scheduled_at']).astimezone(tz), True
+    if template.get('due_date'):
+        day = parse_timestamp(template['due_date']).date()
+    elif template.get('created_at'):
+        day = parse_timestamp(template['created_at']).astimezone(tz).date()
+    else:
+        return None, False
+    return datetime(day.year, day.month, day.day, tzinfo=tz), False
+
+
+def expansion_window(now: Optional[datetime] = None, days: Optional[int] = None) -> Tuple[datetime, datetime]:
+    """[start of today UTC, start of today + days)"""
+    now = now or datetime.now(timezone.utc)
+    start = now.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return start, start + timedelta(days=days or RECURRENCE_WINDOW_DAYS)
+
+
+def iter_occurrences(rule: str, dtstart: datetime, start: datetime, end: datetime) -> Iterator[datetime]:
+    """Lazily yield occurrences in [start, end), at most MAX_OCCURRENCES_PER_EXPANSION"""
+    compiled = compile_rule(rule, dtstart)
+    return islice(
+        takewhile(lambda occurrence: occurrence < end, compiled.xafter(start, inc=True)),
+        MAX_OCCURRENCES_PER_EXPANSION
+    )
+
+
+def iter_instance_rows(
+    template: Dict[str, Any],
+    window_start: datetime,
+    window_end: datetime
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield task rows for a template's occurrences not yet materialized.
+
+    Starts at the template's recurrence_expanded_until when that is inside
+    the window, so re-running over the same window yields nothing.
+    """
+    dtstart, timed = template_anchor(template)
+    if dtstart is None:
+        return
+
+    expanded_until = parse_timestamp(template.get('recurrence_expanded_until'))
+    start = max(expanded_until, window_start) if expanded_until else window_start
+    if start >= window_end:
+        return
+
+    for occurrence in iter_occurrences(template['recurrence_rule'], dtstart, start, window_end):
+        # Local wall-clock occurrence (DST-aware) -> stored in UTC
+        utc = occurrence.astimezone(timezone.utc)
+        yield {
+            'user_id': template['user_id'],
+            'parent_task_id': template['id'],
+            'recurrence_id': utc.isoformat(),
+            'title': template['title'],
+            'description': template.get('description'),
+            'task_type': template.get('task_type'),
+            'status': 'pending',
+            'scheduled_at': utc.isoformat() if timed else None,
+            'due_date': occurrence.date().isoformat() if not timed else None,
+            'estimated_duration': template.get('estimated_duration'),
+            'project_id': template.get('project_id'),
+            'life_sphere': template.get('life_sphere'),
+        }
@@ -0,0 +1,332 @@
+"""
+Slot Scheduler - places flexible tasks into auspicious time windows.
+
+For a location and horizon (default 7 days) the scheduler builds a
+SlotIndex: the horizon cut into elementary segments at every hora, Rahu
+Kala, Gulika, Yamaghanda and Abhijit boundary, each with a weight per task
+kind. Prefix sums over the segments give the weighted time of any
+[start, end) in O(log n), so a candidate start is scored without walking
+the segments it covers.
+
+Solver (greedy, ILP-lite):
+1. Rigid tasks (and already scheduled flexible tasks, unless rescheduling)
+   are fixed and mark their time busy.
+2. Flexible tasks are ordered by deadline, then longest first.
+3. Each task takes the best free candidate start: segment boundaries,
+   boundaries minus the duration (ending exactly at a window edge) and the
+   ends of busy intervals. All candidates are scored at once with NumPy.
+
+A few hundred tasks over a week take a few tens of milliseconds.
+"""
+
+import os
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Tuple
+
+from agents.muhurtas_agent import (
+    HORA_PLANETS, DAY_RULERS,
+    RAHU_KALA_PORTIONS, GULIKA_KALA_PORTIONS, YAMAGHANDA_PORTIONS,
+)
+from .recurrence import parse_timestamp
+
+DEFAULT_DURATION_MINUTES = int(os.getenv("SCHEDULER_DEFAULT_DURATION", "30"))
+
+# Horas that favour each life sphere (keys of the life_spheres table)
+SPHERE_HORAS = {
+    'career': ('Sun', 'Jupiter', 'Mars'),
+    'finance': ('Mercury', 'Jupiter', 'Venus'),
+    'trade': ('Mercury',),
+    'health': ('Sun', 'Mars'),
+    'relationships': ('Venus', 'Moon'),
+    'family': ('Moon', 'Jupiter'),
+    'creativity': ('Venus', 'Moon'),
+    'spirituality': ('Jupiter', 'Moon'),
+    'education': ('Mercury', 'Jupiter'),
+}
+BENEFIC_HORAS = ('Jupiter', 'Venus', 'Mercury', 'Moon')
+
+# Segment weights (per second of task time)
+WEIGHT_SPHERE_HORA = 2.0
+WEIGHT_BENEFIC_HORA = 1.0
+WEIGHT_ABHIJIT = 1.0
+WEIGHT_BAD_KALA = -10.0
+# Small pull towards earlier slots, per day of delay
+WEIGHT_DELAY_PER_DAY = 0.05
+
+BAD_KALAS = (
+    ('rahu_kala', RAHU_KALA_PORTIONS),
+    ('gulika_kala', GULIKA_KALA_PORTIONS),
+    ('yamaghanda', YAMAGHANDA_PORTIONS),
+)
+
+
+def compute_sun_days(muhurtas_agent, start: datetime, end: datetime, latitude: float, longitude: float) -> List[Tuple[datetime, datetime]]:
+    """
+    Consecutive (sunrise, sunset) pairs covering [start, end) with a day of
+    margin. Days are the location's own calendar days (by local mean solar
+    time), so each sunset belongs to the sunrise it is paired with.
+    """
+    local = start.astimezone(timezone.utc) + timedelta(hours=longitude / 15.0)
+    first = datetime(local.year, local.month, local.day, tzinfo=timezone.utc) - timedelta(days=1)
+    count = (end - start).days + 3
+    days = []
+    for sun in muhurtas_agent.get_sun_series(first, count, latitude, longitude):
+        if sun.sunset <= sun.sunrise:
+            print(f"Warning: skipping day with sunset {sun.sunset} before sunrise {sun.sunrise}")
+            continue
+        if not days or sun.sunrise - days[-1][0] > timedelta(hours=12):
+            days.append((sun.sunrise, sun.sunset))
+    return days
+
+
+def vedic_weekday(sunrise: datetime, longitude: float) -> int:
+    """Sunday = 0 weekday of a sunrise, by local mean solar time"""
+    local = sunrise.astimezone(timezone.utc) + timedelta(hours=longitude / 15.0)
+    return (local.weekday() + 1) % 7
+
+
+class SlotIndex:
+    """
+    Horizon split into segments labelled with hora planet, day/night,
+    inauspicious kala and Abhijit, with prefix sums per task kind.
+    """
+
+    def __init__(self, sun_days: List[Tuple[datetime, datetime]], longitude: float, start: datetime, end: datetime):
+        import numpy as np
+
+        self.start = start.timestamp()
+        self.end = end.timestamp()
+
+        horas: List[Tuple[float, float, str]] = []
+        bad: List[Tuple[float, float, str]] = []
+        good: List[Tuple[float, float, str]] = []
+        days: List[Tuple[float, float]] = []
+        for (sunrise, sunset), (next_sunrise, _) in zip(sun_days, sun_days[1:]):
+            rise, set_, next_rise = sunrise.timestamp(), sunset.timestamp(), next_sunrise.timestamp()
+            weekday = vedic_weekday(sunrise, longitude)
+            first = HORA_PLANETS.index(DAY_RULERS[weekday])
+            day_hora = (set_ - rise) / 12
+            night_hora = (next_rise - set_) / 12
+            for i in range(24):
+                hora_start = rise + i * day_hora if i < 12 else set_ + (i - 12) * night_hora
+                hora_len = day_hora if i < 12 else night_hora
+                horas.append((hora_start, hora_start + hora_len, HORA_PLANETS[(first + i) % 7]))
+            portion = (set_ - rise) / 8
+            for name, portions in BAD_KALAS:
+                kala_start = rise + portions[weekday] * portion
+                bad.append((kala_start, kala_start + portion, name))
+            muhurta = (set_ - rise) / 15
+            good.append((rise + 7 * muhurta, rise + 8 * muhurta, 'abhijit_muhurta'))
+            days.append((rise, set_))
+
+        points = {self.start, self.end}
+        for intervals in (horas, bad, good, days):
+            for a, b, *_ in intervals:
+                if self.start < a < self.end:
+                    points.add(a)
+                if self.start < b < self.end:
+                    points.add(b)
+        self.bounds = np.array(sorted(points))
+        mids = (self.bounds[:-1] + self.bounds[1:]) / 2
+
+        hora_starts = [h[0] for h in horas]
+        self.planets = [horas[max(bisect_right(hora_starts, m) - 1, 0)][2] for m in mids]
+        self.is_day = np.array([any(a <= m < b for a, b in days) for m in mids])
+        self.bad = [next((name for a, b, name in bad if a <= m < b), None) for m in mids]
+        self.abhijit = np.array([any(a <= m < b for a, b, _ in good) for m in mids])
+
+        self._np = np
+        self._lengths = np.diff(self.bounds)
+        self._prefix_cache: Dict[Tuple[str, ...], Any] = {}
+        self._night_prefix = self._prefix((~self.is_day).astype(float))
+        self._bad_prefix = self._prefix(np.array([b is not None for b in self.bad], dtype=float))
+
+    def _prefix(self, weights):
+        np = self._np
+        return weights, np.concatenate([[0.0], np.cumsum(weights * self._lengths)])
+
+    def weights_for(self, favoured: Tuple[str, ...]):
+        """(weights, prefix) for tasks that favour the given hora planets"""
+        if favoured not in self._prefix_cache:
+            np = self._np
+            weights = np.array([
+                (WEIGHT_SPHERE_HORA if planet in favoured else
+                 WEIGHT_BENEFIC_HORA if planet in BENEFIC_HORAS else 0.0)
+                + (WEIGHT_ABHIJIT if abhijit else 0.0)
+                + (WEIGHT_BAD_KALA if bad else 0.0)
+                for planet, abhijit, bad in zip(self.planets, self.abhijit, self.bad)
+            ])
+            self._prefix_cache[favoured] = self._prefix(weights)
+        return self._prefix_cache[favoured]
+
+    def integral(self, table, t):
+        """Weighted seconds in [start, t) for an array of times"""
+        np = self._np
+        weights, prefix = table
+        k = np.clip(np.searchsorted(self.bounds, t, side='right') - 1, 0, len(weights) - 1)
+        return prefix[k] + weights[k] * (t - self.bounds[k])
+
+    def night_seconds(self, s, e):
+        return self.integral(self._night_prefix, e) - self.integral(self._night_prefix, s)
+
+    def bad_seconds(self, s, e):
+        return self.integral(self._bad_prefix, e) - self.integral(self._bad_prefix, s)
+
+    def segment_at(self, t: float) -> int:
+        k = int(self._np.searchsorted(self.bounds, t, side='right')) - 1
+        return min(max(k, 0), len(self.planets) - 1)
+
+
+class BusyIntervals:
+    """Sorted, non-overlapping busy intervals with O(log n) overlap checks"""
+
+    def __init__(self, intervals: List[Tuple[float, float]]):
+        merged: List[List[float]] = []
+        for s, e in sorted(intervals):
+            if merged and s <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], e)
+            else:
+                merged.append([s, e])
+        self.starts = [s for s, _ in merged]
+        self.ends = [e for _, e in merged]
+
+    def add(self, s: float, e: float):
+        """Add an interval known not to overlap"""
+        k = bisect_right(self.starts, s)
+        self.starts.insert(k, s)
+        self.ends.insert(k, e)
+
+    def free_mask(self, np, starts, ends):
+        """True where [starts, ends) overlaps no busy interval"""
+        if not self.starts:
+            return np.ones(len(starts), dtype=bool)
+        busy_starts = np.array(self.starts)
+        busy_ends = np.array(self.ends)
+        # First busy interval ending after each candidate start
+        k = np.searchsorted(busy_ends, starts, side='right')
+        inside = k < len(busy_starts)
+        return ~inside | (busy_starts[np.minimum(k, len(busy_starts) - 1)] >= ends)
+
+
+def task_duration(task: Dict[str, Any]) -> float:
+    return float(task.get('estimated_duration') or DEFAULT_DURATION_MINUTES) * 60
+
+
+def task_deadline(task: Dict[str, Any]) -> Optional[float]:
+    due = parse_timestamp(task.get('due_date'))
+    return (due + timedelta(days=1)).timestamp() if due else None
+
+
+def favoured_horas(task: Dict[str, Any]) -> Tuple[str, ...]:
+    return SPHERE_HORAS.get((task.get('life_sphere') or '').lower(), ())
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+def schedule_tasks(
+    tasks: List[Dict[str, Any]],
+    sun_days: List[Tuple[datetime, datetime]],
+    longitude: float,
+    start: datetime,
+    days: int = 7,
+    include_night: bool = False,
+    reschedule_flexible: bool = False
+) -> Dict[str, Any]:
+    """
+    Place flexible tasks into the best free windows of [start, start + days).
+
+    Args:
+        tasks: Task rows (see TaskService)
+        sun_days: Consecutive (sunrise, sunset) pairs (see compute_sun_days)
+        include_night: Allow placements between sunset and sunrise
+        reschedule_flexible: Also move flexible tasks that already have a time
+
+    Returns:
+        {"scheduled": [...], "unscheduled": [...], "fixed": [...], "warnings": [...]}
+    """
+    import numpy as np
+
+    end = start + timedelta(days=days)
+    index = SlotIndex(sun_days, longitude, start, end)
+
+    fixed, flexible = [], []
+    for task in tasks:
+        placeable = task.get('task_type') == 'flexible' and (reschedule_flexible or not task.get('scheduled_at'))
+        if placeable:
+            flexible.append(task)
+        elif task.get('scheduled_at'):
+            fixed.append(task)
+
+    fixed_out, warnings, busy = [], [], []
+    for task in fixed:
+        s = parse_timestamp(task['scheduled_at']).timestamp()
+        e = s + task_duration(task)
+        busy.append((s, e))
+        if e <= index.start or s >= index.end:
+            continue
+        fixed_out.append({'task_id': task.get('id'), 'title': task.get('title'), 'start': _iso(s), 'end': _iso(e)})
+        s_in, e_in = max(s, index.start), min(e, index.end)
+        if index.bad_seconds(np.array([s_in]), np.array([e_in]))[0] > 0:
+            warnings.append({
+                'task_id': task.get('id'),
+                'message': f"Fixed task overlaps {index.bad[index.segment_at(s_in)] or 'an inauspicious period'}"
+            })
+    busy_intervals = BusyIntervals(busy)
+
+    base_candidates = np.unique(index.bounds)
+    flexible.sort(key=lambda t: (task_deadline(t) or float('inf'), -task_duration(t)))
+
+    scheduled, unscheduled = [], []
+    for task in flexible:
+        duration = task_duration(task)
+        candidates = np.unique(np.concatenate([
+            base_candidates,
+            base_candidates - duration,
+            np.array(busy_intervals.ends),
+        ]))
+        latest_end = min(index.end, task_deadline(task) or index.end)
+        candidates = candidates[(candidates >= index.start) & (candidates + duration <= latest_end)]
+        if len(candidates):
+            ends = candidates + duration
+            ok = busy_intervals.free_mask(np, candidates, ends)
+            if not include_night:
+                ok &= index.night_seconds(candidates, ends) <= 1e-6
+            candidates, ends = candidates[ok], ends[ok]
+
+        if not len(candidates):
+            unscheduled.append({
+                'task_id': task.get('id'),
+                'title': task.get('title'),
+                'reason': 'No free window before the deadline' if task_deadline(task) else 'No free window in horizon'
+            })
+            continue
+
+        table = index.weights_for(favoured_horas(task))
+        scores = (index.integral(table, ends) - index.integral(table, candidates)) / duration
+        scores -= WEIGHT_DELAY_PER_DAY * (candidates - index.start) / 86400
+        best = int(np.argmax(scores))
+        s, e = float(candidates[best]), float(ends[best])
+        busy_intervals.add(s, e)
+
+        segment = index.segment_at(s)
+        scheduled.append({
+            'task_id': task.get('id'),
+            'title': task.get('title'),
+            'start': _iso(s),
+            'end': _iso(e),
+            'score': round(float(scores[best]), 3),
+            'hora': index.planets[segment],
+            'avoids_bad_kala': bool(index.bad_seconds(np.array([s]), np.array([e]))[0] <= 0),
+        })
+
+    scheduled.sort(key=lambda item: item['start'])
+    return {
+        'horizon': {'start': _iso(index.start), 'end': _iso(index.end)},
+        'scheduled': scheduled,
+        'unscheduled': unscheduled,
+        'fixed': fixed_out,
+        'warnings': warnings,
+    }
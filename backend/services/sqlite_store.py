@@ -0,0 +1,669 @@
+"""
+SQLite storage backend - embedded drop-in for the Supabase PostgREST client.
+
+ProfileService, TaskService and SyncService talk to storage through the
+PostgREST query builder (`db.table(...).select(...).eq(...)`, `db.rpc(...)`)
+and `services.db.execute()`. SqliteClient implements the subset of that
+builder the services use on top of a local SQLite file, so the same
+service code runs offline, on self-hosted nodes and in benchmarks:
+
+    STORAGE_BACKEND=sqlite  SQLITE_PATH=/var/lib/cosmic/calendar.db
+
+It is an emulation of that builder, not a separate repository interface:
+the services keep a single query path and the two backends stay
+interchangeable. Supported subset:
+
+- table(...).select(columns) / insert / update / delete, and
+  upsert(on_conflict=..., ignore_duplicates=...)
+- Filters eq, neq, gt, gte, lt, lte, in_, is_ (null/true/false), each
+  negated by a preceding not_; all filters are ANDed
+- or_("...") with the PostgREST logic grammar: comma-separated
+  `column.op.value` conditions (op: eq, neq, gt, gte, lt, lte, is),
+  `column.not.op.value`, nested and(...) / or(...) groups and
+  double-quoted values
+- order(column, desc=..., nullsfirst=...) and limit(n)
+- rpc('create_profile' | 'switch_active_profile', params)
+
+Anything else raises SqliteError: other operators (like, ilike, in
+inside or_, ...), malformed filters, unknown tables, columns and
+functions. Builder methods outside the subset (range, single, ...) are
+not defined.
+
+- Schema mirrors database/*.sql (profiles, action_log, projects, tasks,
+  milestones, life_spheres, deleted_records), including the unique indexes
+  the services rely on, updated_at bumping and deletion tombstones
+- WAL journal, synchronous=NORMAL, foreign keys on
+- Statements use `?` parameters and the connection's statement cache, so
+  each query shape is compiled once and reused
+- RPCs create_profile and switch_active_profile run in one transaction,
+  like their plpgsql counterparts
+- Timestamps are stored as canonical UTC ISO strings, so text comparison
+  and ordering match time order
+
+Queries run inline on the event loop (under a lock): local SQLite calls
+take microseconds, far less than a thread hop.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, date, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Column types: uuid, text, timestamp, date, time, bool, int, real, json, serial
+SCHEMA: Dict[str, Dict[str, str]] = {
+    'profiles': {
+        'id': 'uuid', 'user_id': 'uuid', 'profile_name': 'text', 'birth_date': 'date',
+        'birth_time': 'time', 'birth_place': 'text', 'birth_lat': 'real', 'birth_lng': 'real',
+        'birth_timezone': 'text', 'is_active': 'bool',
+        'created_at': 'timestamp', 'updated_at': 'timestamp',
+    },
+    'action_log': {
+        'id': 'uuid', 'user_id': 'uuid', 'profile_id': 'uuid', 'action_type': 'text',
+        'action_details': 'json', 'timestamp': 'timestamp',
+    },
+    'projects': {
+        'id': 'uuid', 'user_id': 'uuid', 'name': 'text', 'description': 'text', 'status': 'text',
+        'progress': 'real', 'life_sphere': 'text', 'priority': 'int', 'start_date': 'date',
+        'target_end_date': 'date', 'actual_end_date': 'date',
+        'created_at': 'timestamp', 'updated_at': 'timestamp',
+    },
+    'tasks': {
+        'id': 'uuid', 'user_id': 'uuid', 'title': 'text', 'description': 'text',
+        'task_type': 'text', 'status': 'text', 'scheduled_at': 'timestamp', 'due_date': 'date',
+        'estimated_duration': 'int', 'project_id': 'uuid', 'life_sphere': 'text',
+        'recurrence_rule': 'text', 'timezone': 'text', 'parent_task_id': 'uuid', 'recurrence_id': 'timestamp',
+        'recurrence_expanded_until': 'timestamp',
+        'created_at': 'timestamp', 'updated_at': 'timestamp', 'completed_at': 'timestamp',
+    },
+    'milestones': {
+        'id': 'uuid', 'project_id': 'uuid', 'title': 'text', 'description': 'text', 'status': 'text',
+        'due_date': 'date', 'completed_at': 'timestamp', 'order_index': 'int', 'created_at': 'timestamp',
+    },
+    'life_spheres': {
+        'id': 'uuid', 'user_id': 'uuid', 'key': 'text', 'name': 'text', 'is_system': 'bool',
+        'priority': 'int', 'icon': 'text', 'color': 'text', 'created_at': 'timestamp',
+    },
+    'deleted_records': {
+        'seq': 'serial', 'table_name': 'text', 'record_id': 'uuid', 'user_id': 'uuid',
+        'deleted_at': 'timestamp',
+    },
+}
+
+DDL = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    profile_name TEXT NOT NULL,
+    birth_date TEXT NOT NULL,
+    birth_time TEXT,
+    birth_place TEXT,
+    birth_lat REAL,
+    birth_lng REAL,
+    birth_timezone TEXT,
+    is_active INTEGER DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS profiles_user_id_idx ON profiles(user_id);
+CREATE UNIQUE INDEX IF NOT EXISTS profiles_one_active_per_user_idx ON profiles(user_id) WHERE is_active;
+CREATE INDEX IF NOT EXISTS idx_profiles_user_updated ON profiles(user_id, updated_at, id);
+
+CREATE TABLE IF NOT EXISTS action_log (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    profile_id TEXT REFERENCES profiles(id) ON DELETE CASCADE,
+    action_type TEXT NOT NULL,
+    action_details TEXT,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS action_log_user_id_idx ON action_log(user_id, timestamp DESC);
+
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT,
+    status TEXT DEFAULT 'active' CHECK (status IN ('active', 'paused', 'completed', 'archived')),
+    progress REAL DEFAULT 0 CHECK (progress >= 0 AND progress <= 1),
+    life_sphere TEXT,
+    priority INTEGER DEFAULT 3 CHECK (priority >= 1 AND priority <= 5),
+    start_date TEXT,
+    target_end_date TEXT,
+    actual_end_date TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_projects_user_updated ON projects(user_id, updated_at, id);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    task_type TEXT DEFAULT 'flexible' CHECK (task_type IN ('rigid', 'flexible', 'recurring', 'intention')),
+    status TEXT DEFAULT 'pending' CHECK (status IN ('pending', 'in_progress', 'completed', 'cancelled', 'snoozed')),
+    scheduled_at TEXT,
+    due_date TEXT,
+    estimated_duration INTEGER,
+    project_id TEXT REFERENCES projects(id) ON DELETE SET NULL,
+    life_sphere TEXT,
+    recurrence_rule TEXT,
+    timezone TEXT,
+    parent_task_id TEXT REFERENCES tasks(id) ON DELETE CASCADE,
+    recurrence_id TEXT,
+    recurrence_expanded_until TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    completed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_created ON tasks(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_status_created ON tasks(user_id, status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_updated ON tasks(user_id, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_scheduled_at ON tasks(user_id, scheduled_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_parent_recurrence ON tasks(parent_task_id, recurrence_id);
+
+CREATE TABLE IF NOT EXISTS milestones (
+    id TEXT PRIMARY KEY,
+    project_id TEXT REFERENCES projects(id) ON DELETE CASCADE,
+    title TEXT NOT NULL,
+    description TEXT,
+    status TEXT DEFAULT 'pending' CHECK (status IN ('pending', 'in_progress', 'completed')),
+    due_date TEXT,
+    completed_at TEXT,
+    order_index INTEGER DEFAULT 0,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_milestones_project_id ON milestones(project_id);
+
+CREATE TABLE IF NOT EXISTS life_spheres (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_system INTEGER DEFAULT 0,
+    priority INTEGER DEFAULT 5 CHECK (priority >= 1 AND priority <= 10),
+    icon TEXT,
+    color TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_life_spheres_user_id ON life_spheres(user_id);
+
+CREATE TABLE IF NOT EXISTS deleted_records (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    deleted_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_deleted_records_user_seq ON deleted_records(user_id, seq);
+
+CREATE TRIGGER IF NOT EXISTS log_tasks_deleted AFTER DELETE ON tasks
+BEGIN
+    INSERT INTO deleted_records (table_name, record_id, user_id, deleted_at)
+    VALUES ('tasks', OLD.id, OLD.user_id, utc_now());
+END;
+CREATE TRIGGER IF NOT EXISTS log_projects_deleted AFTER DELETE ON projects
+BEGIN
+    INSERT INTO deleted_records (table_name, record_id, user_id, deleted_at)
+    VALUES ('projects', OLD.id, OLD.user_id, utc_now());
+END;
+CREATE TRIGGER IF NOT EXISTS log_profiles_deleted AFTER DELETE ON profiles
+BEGIN
+    INSERT INTO deleted_records (table_name, record_id, user_id, deleted_at)
+    VALUES ('profiles', OLD.id, OLD.user_id, utc_now());
+END;
+"""
+
+SYSTEM_SPHERES = [
+    ('career', 'Карьера'), ('health', 'Здоровье'), ('relationships', 'Отношения'),
+    ('finance', 'Финансы'), ('family', 'Семья'), ('creativity', 'Творчество'),
+    ('spirituality', 'Духовность'), ('education', 'Образование'),
+]
+
+# Filled on insert when missing (the migrations use column defaults for these)
+GENERATED_ON_INSERT = ('id', 'created_at', 'updated_at', 'timestamp', 'deleted_at')
+
+_OPERATORS = {'eq': '=', 'neq': '!=', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<='}
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='microseconds')
+
+
+def canonical_timestamp(value: Any) -> Any:
+    """Any ISO timestamp (naive = UTC) -> 'YYYY-MM-DDTHH:MM:SS.ffffff+00:00'"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return value
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat(timespec='microseconds')
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+class SqliteError(Exception):
+    """Raised for invalid queries (unknown table/column, malformed filter)."""
+    pass
+
+
+class SqliteResponse:
+    """Mimics postgrest's APIResponse (only .data and .count are used)."""
+
+    def __init__(self, data: List[Dict[str, Any]], count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+class SqliteClient:
+    """Local SQLite database with a PostgREST-builder-compatible surface."""
+
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            isolation_level=None,  # autocommit; transactions are explicit
+            cached_statements=512,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.create_function('utc_now', 0, utc_now)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        self._conn.execute('PRAGMA busy_timeout=5000')
+        self._create_schema()
+        self._rpcs = {
+            'create_profile': self._rpc_create_profile,
+            'switch_active_profile': self._rpc_switch_active_profile,
+        }
+
+    def _create_schema(self):
+        with self._lock:
+            self._conn.executescript(DDL)
+            if not self._conn.execute('SELECT 1 FROM life_spheres WHERE is_system LIMIT 1').fetchone():
+                now = utc_now()
+                self._conn.executemany(
+                    'INSERT INTO life_spheres (id, key, name, is_system, priority, created_at) VALUES (?, ?, ?, 1, 5, ?)',
+                    [(str(uuid.uuid4()), key, name, now) for key, name in SYSTEM_SPHERES]
+                )
+
+    # ----- PostgREST-compatible entry points -----
+
+    def table(self, name: str) -> 'SqliteQuery':
+        if name not in SCHEMA:
+            raise SqliteError(f"Unknown table: {name}")
+        return SqliteQuery(self, name)
+
+    from_ = table
+
+    def rpc(self, name: str, params: Optional[Dict[str, Any]] = None) -> 'SqliteRpc':
+        if name not in self._rpcs:
+            raise SqliteError(f"Unknown function: {name}")
+        return SqliteRpc(self, name, params or {})
+
+    async def aclose(self):
+        with self._lock:
+            self._conn.close()
+
+    # ----- execution -----
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+
+    def _query(self, table: str, sql: str, params: Sequence[Any]) -> List[Dict[str, Any]]:
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                raise SqliteError(str(e)) from e
+        return [decode_row(table, row) for row in rows]
+
+    # ----- RPCs (see database/supabase_setup.sql) -----
+
+    def _rpc_create_profile(self, p_user_id: str, p_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+        active = p_profile.get('is_active')
+        active = True if active is None else bool(active)
+        now = utc_now()
+        row = {
+            'id': str(uuid.uuid4()),
+            'user_id': p_user_id,
+            'profile_name': p_profile.get('profile_name') or 'Main Profile',
+            'birth_date': p_profile.get('birth_date'),
+            'birth_time': p_profile.get('birth_time'),
+            'birth_place': p_profile.get('birth_place'),
+            'birth_lat': p_profile.get('birth_lat'),
+            'birth_lng': p_profile.get('birth_lng'),
+            'birth_timezone': p_profile.get('birth_timezone'),
+            'is_active': int(active),
+            'created_at': now,
+            'updated_at': now,
+        }
+        with self._transaction() as conn:
+            if active:
+                conn.execute(
+                    'UPDATE profiles SET is_active = 0, updated_at = ? WHERE user_id = ? AND is_active',
+                    (now, p_user_id)
+                )
+            columns = ', '.join(row)
+            placeholders = ', '.join('?' for _ in row)
+            created = conn.execute(
+                f'INSERT INTO profiles ({columns}) VALUES ({placeholders}) RETURNING *',
+                list(row.values())
+            ).fetchall()
+        return [decode_row('profiles', r) for r in created]
+
+    def _rpc_switch_active_profile(self, p_user_id: str, p_profile_id: str) -> List[Dict[str, Any]]:
+        now = utc_now()
+        with self._transaction() as conn:
+            exists = conn.execute(
+                'SELECT 1 FROM profiles WHERE id = ? AND user_id = ?', (p_profile_id, p_user_id)
+            ).fetchone()
+            if not exists:
+                return []  # unknown profile: leave the current active profile alone
+            conn.execute(
+                'UPDATE profiles SET is_active = 0, updated_at = ? WHERE user_id = ? AND is_active AND id != ?',
+                (now, p_user_id, p_profile_id)
+            )
+            switched = conn.execute(
+                'UPDATE profiles SET is_active = 1, updated_at = ? WHERE id = ? AND user_id = ? RETURNING *',
+                (now, p_profile_id, p_user_id)
+            ).fetchall()
+        return [decode_row('profiles', r) for r in switched]
+
+
+def encode_value(table: str, column: str, value: Any) -> Any:
+    """Python/PostgREST value -> SQLite value for a column"""
+    kind = SCHEMA[table].get(column)
+    if value is None:
+        return None
+    if kind == 'bool':
+        if isinstance(value, str):
+            return 1 if value.lower() == 'true' else 0
+        return int(bool(value))
+    if kind == 'timestamp':
+        return canonical_timestamp(value)
+    if kind == 'json':
+        return json.dumps(value, default=str)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def decode_row(table: str, row: sqlite3.Row) -> Dict[str, Any]:
+    columns = SCHEMA[table]
+    result = {}
+    for key in row.keys():
+        value = row[key]
+        kind = columns.get(key)
+        if value is not None:
+            if kind == 'bool':
+                value = bool(value)
+            elif kind == 'json':
+                value = json.loads(value)
+        result[key] = value
+    return result
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split 'a,b,and(c,d)' on commas outside parentheses and quotes"""
+    parts, depth, quoted, current = [], 0, False, []
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == '(':
+            depth += 1
+        elif not quoted and ch == ')':
+            depth -= 1
+        if ch == ',' and depth == 0 and not quoted:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(ch)
+    if current:
+        parts.append(''.join(current))
+    return parts
+
+
+_GROUP = re.compile(r'^(and|or)\((.*)\)$', re.S)
+
+
+class SqliteQuery:
+    """One table query: operation (select/insert/upsert/update/delete) plus filters."""
+
+    def __init__(self, client: SqliteClient, table: str):
+        self.client = client
+        self.table = table
+        self.columns = SCHEMA[table]
+        self._operation = 'select'
+        self._select = '*'
+        self._payload: Any = None
+        self._on_conflict = ''
+        self._ignore_duplicates = False
+        self._filters: List[Tuple[str, List[Any]]] = []
+        self._order: List[str] = []
+        self._limit: Optional[int] = None
+        self._negate_next = False
+
+    # ----- operations -----
+
+    def select(self, columns: str = '*', *args, **kwargs) -> 'SqliteQuery':
+        self._operation = 'select'
+        self._select = columns
+        return self
+
+    def insert(self, json: Any, **kwargs) -> 'SqliteQuery':
+        self._operation = 'insert'
+        self._payload = json
+        return self
+
+    def upsert(self, json: Any, *, ignore_duplicates: bool = False, on_conflict: str = '', **kwargs) -> 'SqliteQuery':
+        self._operation = 'upsert'
+        self._payload = json
+        self._ignore_duplicates = ignore_duplicates
+        self._on_conflict = on_conflict
+        return self
+
+    def update(self, json: Dict[str, Any], **kwargs) -> 'SqliteQuery':
+        self._operation = 'update'
+        self._payload = json
+        return self
+
+    def delete(self, **kwargs) -> 'SqliteQuery':
+        self._operation = 'delete'
+        return self
+
+    # ----- filters -----
+
+    @property
+    def not_(self) -> 'SqliteQuery':
+        self._negate_next = True
+        return self
+
+    def _add_filter(self, sql: str, params: List[Any]) -> 'SqliteQuery':
+        if self._negate_next:
+            sql = f'NOT ({sql})'
+            self._negate_next = False
+        self._filters.append((sql, params))
+        return self
+
+    def _column(self, column: str) -> str:
+        if column not in self.columns:
+            raise SqliteError(f"Unknown column {self.table}.{column}")
+        return f'"{column}"'
+
+    def _comparison(self, column: str, op: str, value: Any) -> Tuple[str, List[Any]]:
+        if op == 'is':
+            keyword = {'null': 'NULL', 'true': 'TRUE', 'false': 'FALSE'}[str(value).lower() if value is not None else 'null']
+            return f'{self._column(column)} IS {keyword}', []
+        if op == 'in':
+            values = list(value)
+            if not values:
+                return '0', []
+            placeholders = ', '.join('?' for _ in values)
+            return (
+                f'{self._column(column)} IN ({placeholders})',
+                [encode_value(self.table, column, v) for v in values]
+            )
+        return f'{self._column(column)} {_OPERATORS[op]} ?', [encode_value(self.table, column, value)]
+
+    def eq(self, column, value): return self._add_filter(*self._comparison(column, 'eq', value))
+    def neq(self, column, value): return self._add_filter(*self._comparison(column, 'neq', value))
+    def gt(self, column, value): return self._add_filter(*self._comparison(column, 'gt', value))
+    def gte(self, column, value): return self._add_filter(*self._comparison(column, 'gte', value))
+    def lt(self, column, value): return self._add_filter(*self._comparison(column, 'lt', value))
+    def lte(self, column, value): return self._add_filter(*self._comparison(column, 'lte', value))
+    def in_(self, column, values): return self._add_filter(*self._comparison(column, 'in', values))
+    def is_(self, column, value): return self._add_filter(*self._comparison(column, 'is', value))
+
+    def or_(self, filters: str, reference_table: Optional[str] = None) -> 'SqliteQuery':
+        """PostgREST logic tree, e.g. 'a.lt."x",and(a.eq."x",id.lt.5)'"""
+        return self._add_filter(*self._logic('or', filters))
+
+    def _logic(self, operator: str, body: str) -> Tuple[str, List[Any]]:
+        fragments, params = [], []
+        for part in _split_top_level(body):
+            sql, part_params = self._condition(part.strip())
+            fragments.append(f'({sql})')
+            params.extend(part_params)
+        if not fragments:
+            raise SqliteError(f"Empty {operator} filter")
+        return f' {operator.upper()} '.join(fragments), params
+
+    def _condition(self, text: str) -> Tuple[str, List[Any]]:
+        group = _GROUP.match(text)
+        if group:
+            return self._logic(group.group(1), group.group(2))
+        try:
+            column, rest = text.split('.', 1)
+            negate = rest.startswith('not.')
+            if negate:
+                rest = rest[4:]
+            op, value = rest.split('.', 1)
+        except ValueError:
+            raise SqliteError(f"Malformed filter: {text}")
+        if op not in _OPERATORS and op != 'is':
+            raise SqliteError(f"Unsupported filter operator: {op}")
+        if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+            value = value[1:-1]
+        sql, params = self._comparison(column, op, value)
+        return (f'NOT ({sql})' if negate else sql), params
+
+    # ----- modifiers -----
+
+    def order(self, column: str, *, desc: bool = False, nullsfirst: Optional[bool] = None, **kwargs) -> 'SqliteQuery':
+        # PostgREST default: NULLS LAST ascending, NULLS FIRST descending
+        nulls_first = desc if nullsfirst is None else nullsfirst
+        self._order.append(
+            f'{self._column(column)} {"DESC" if desc else "ASC"} NULLS {"FIRST" if nulls_first else "LAST"}'
+        )
+        return self
+
+    def limit(self, size: int, **kwargs) -> 'SqliteQuery':
+        self._limit = int(size)
+        return self
+
+    # ----- execution -----
+
+    async def execute(self) -> SqliteResponse:
+        sql, params = self._build()
+        return SqliteResponse(self.client._query(self.table, sql, params))
+
+    def _where(self) -> Tuple[str, List[Any]]:
+        if not self._filters:
+            return '', []
+        params: List[Any] = []
+        for _, filter_params in self._filters:
+            params.extend(filter_params)
+        return ' WHERE ' + ' AND '.join(f'({sql})' for sql, _ in self._filters), params
+
+    def _build(self) -> Tuple[str, List[Any]]:
+        where, params = self._where()
+        if self._operation == 'select':
+            columns = '*' if self._select.strip() == '*' else ', '.join(
+                self._column(c.strip()) for c in self._select.split(',') if c.strip()
+            )
+            sql = f'SELECT {columns} FROM {self.table}{where}'
+            if self._order:
+                sql += ' ORDER BY ' + ', '.join(self._order)
+            if self._limit is not None:
+                sql += f' LIMIT {self._limit}'
+            return sql, params
+        if self._operation in ('insert', 'upsert'):
+            return self._build_insert()
+        if self._operation == 'update':
+            values = dict(self._payload)
+            if 'updated_at' in self.columns:
+                # Same as the update_updated_at_column() trigger
+                values['updated_at'] = utc_now()
+            assignments = ', '.join(f'{self._column(c)} = ?' for c in values)
+            update_params = [encode_value(self.table, c, v) for c, v in values.items()]
+            return f'UPDATE {self.table} SET {assignments}{where} RETURNING *', update_params + params
+        if self._operation == 'delete':
+            return f'DELETE FROM {self.table}{where} RETURNING *', params
+        raise SqliteError(f"Unsupported operation: {self._operation}")
+
+    def _build_insert(self) -> Tuple[str, List[Any]]:
+        rows = self._payload if isinstance(self._payload, list) else [self._payload]
+        if not rows:
+            raise SqliteError("Nothing to insert")
+        now = utc_now()
+        prepared = []
+        for row in rows:
+            row = dict(row)
+            for column in GENERATED_ON_INSERT:
+                if column in self.columns and row.get(column) is None:
+                    row[column] = str(uuid.uuid4()) if column == 'id' else now
+            prepared.append(row)
+
+        columns = list(dict.fromkeys(c for row in prepared for c in row))
+        column_sql = ', '.join(self._column(c) for c in columns)
+        row_sql = '(' + ', '.join('?' for _ in columns) + ')'
+        params = [encode_value(self.table, c, row.get(c)) for row in prepared for c in columns]
+        sql = f'INSERT INTO {self.table} ({column_sql}) VALUES ' + ', '.join(row_sql for _ in prepared)
+
+        if self._operation == 'upsert':
+            target = [c.strip() for c in (self._on_conflict or 'id').split(',')]
+            target_sql = ', '.join(self._column(c) for c in target)
+            if self._ignore_duplicates:
+                sql += f' ON CONFLICT ({target_sql}) DO NOTHING'
+            else:
+                updates = ', '.join(
+                    f'{self._column(c)} = excluded.{self._column(c)}' for c in columns if c not in target
+                )
+                sql += f' ON CONFLICT ({target_sql}) DO UPDATE SET {updates}' if updates else f' ON CONFLICT ({target_sql}) DO NOTHING'
+        return sql + ' RETURNING *', params
+
+
+class SqliteRpc:
+    """Deferred call of a database function (see SqliteClient._rpcs)."""
+
+    def __init__(self, client: SqliteClient, name: str, params: Dict[str, Any]):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    async def execute(self) -> SqliteResponse:
+        try:
+            return SqliteResponse(self.client._rpcs[self.name](**self.params))
+        except sqlite3.Error as e:
+            raise SqliteError(str(e)) from e
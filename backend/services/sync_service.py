@@ -0,0 +1,201 @@
+"""
+Sync Service - delta feed of tasks, projects and profiles.
+
+Clients keep a local replica and poll `/api/sync?since=<cursor>` instead of
+refetching full lists. Each call returns the rows created or updated after
+the cursor plus tombstones for deleted rows, and a new cursor to send next.
+
+- Changed rows are found by (updated_at, id) keyset on each table
+  (indexes in database/sync_migration.sql; triggers keep updated_at current)
+- Deletions come from the deleted_records log, filled by an AFTER DELETE
+  trigger, and are paged by its serial id
+- The cursor is opaque to clients: per-table positions, so a table that
+  hit the page size continues where it stopped while the others advance
+
+Rows newer than SYNC_SETTLE_SECONDS are held back until the next poll:
+updated_at is stamped when a transaction starts, so a slow transaction can
+commit a timestamp older than rows another poll has already passed.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any
+
+from .db import get_db, execute
+
+# Tables replicated to clients (all have user_id and updated_at)
+SYNC_TABLES = ['tasks', 'projects', 'profiles']
+
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "500"))
+SYNC_SETTLE_SECONDS = float(os.getenv("SYNC_SETTLE_SECONDS", "2"))
+
+# Row ids in cursors: UUIDs (or other plain tokens), never filter syntax
+ROW_ID_PATTERN = re.compile(r'^[\w-]+$')
+
+
+def encode_sync_cursor(positions: Dict[str, Any]) -> str:
+    """Encode per-table positions as an opaque cursor"""
+    raw = json.dumps(positions, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _valid_position(position: Any) -> bool:
+    """[updated_at ISO timestamp, row id]: both end up in a PostgREST filter"""
+    if not (isinstance(position, list) and len(position) == 2):
+        return False
+    updated_at, row_id = position
+    if not isinstance(row_id, str) or not ROW_ID_PATTERN.match(row_id):
+        return False
+    try:
+        datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return False
+    return True
+
+
+def decode_sync_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor from encode_sync_cursor. Raises ValueError if malformed."""
+    try:
+        positions = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid sync cursor")
+    if not isinstance(positions, dict):
+        raise ValueError("Invalid sync cursor")
+    deleted = positions.get('deleted')
+    if not isinstance(deleted, int) or isinstance(deleted, bool):
+        raise ValueError("Invalid sync cursor")
+    for table in SYNC_TABLES:
+        position = positions.get(table)
+        if position is not None and not _valid_position(position):
+            raise ValueError("Invalid sync cursor")
+    return positions
+
+
+class SyncService:
+    """Builds delta sync pages for one user"""
+
+    def __init__(self, db=None):
+        self.db = db or get_db()
+
+    async def get_changes(
+        self,
+        user_id: str,
+        since: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Rows changed since `since` (None = full snapshot).
+
+        Returns:
+            {
+                "tasks": [...], "projects": [...], "profiles": [...],
+                "deleted": [{"table", "id", "deleted_at"}],
+                "next_cursor": "...",
+                "has_more": bool   # poll again right away with next_cursor
+            }
+
+        Raises ValueError for a malformed cursor.
+        """
+        limit = limit or SYNC_PAGE_SIZE
+        positions = decode_sync_cursor(since) if since else None
+        settle_before = (
+            datetime.now(timezone.utc) - timedelta(seconds=SYNC_SETTLE_SECONDS)
+        ).isoformat()
+
+        table_pages = asyncio.gather(*[
+            self._fetch_changed_rows(
+                table, user_id, positions.get(table) if positions else None, settle_before, limit
+            )
+            for table in SYNC_TABLES
+        ])
+        if positions:
+            deleted_page = self._fetch_deletions(user_id, positions['deleted'], settle_before, limit)
+        else:
+            # A snapshot has nothing to delete locally: start after the latest tombstone
+            deleted_page = self._latest_deletion_id(user_id, settle_before)
+        pages, deletions = await asyncio.gather(table_pages, deleted_page)
+
+        response: Dict[str, Any] = {}
+        next_positions: Dict[str, Any] = {}
+        has_more = False
+        for table, (rows, more) in zip(SYNC_TABLES, pages):
+            response[table] = rows
+            has_more = has_more or more
+            if rows:
+                next_positions[table] = [rows[-1]['updated_at'], rows[-1]['id']]
+            else:
+                next_positions[table] = positions.get(table) if positions else None
+
+        if positions:
+            tombstones, more = deletions
+            has_more = has_more or more
+            next_positions['deleted'] = tombstones[-1]['seq'] if tombstones else positions['deleted']
+            response['deleted'] = [
+                {'table': t['table_name'], 'id': t['record_id'], 'deleted_at': t['deleted_at']}
+                for t in tombstones
+            ]
+        else:
+            next_positions['deleted'] = deletions
+            response['deleted'] = []
+
+        response['next_cursor'] = encode_sync_cursor(next_positions)
+        response['has_more'] = has_more
+        return response
+
+    async def _fetch_changed_rows(
+        self,
+        table: str,
+        user_id: str,
+        position: Optional[List[str]],
+        settle_before: str,
+        limit: int
+    ):
+        """Helper: One keyset page of rows changed after `position`; returns (rows, has_more)"""
+        query = (
+            self.db.table(table)
+            .select('*')
+            .eq('user_id', user_id)
+            .lt('updated_at', settle_before)
+            .order('updated_at')
+            .order('id')
+            .limit(limit + 1)
+        )
+        if position:
+            updated_at, row_id = position
+            query = query.or_(
+                f'updated_at.gt."{updated_at}",'
+                f'and(updated_at.eq."{updated_at}",id.gt."{row_id}")'
+            )
+        result = await execute(query)
+        rows = result.data or []
+        return rows[:limit], len(rows) > limit
+
+    async def _fetch_deletions(self, user_id: str, after_seq: int, settle_before: str, limit: int):
+        """Helper: Tombstones logged after `after_seq`; returns (tombstones, has_more)"""
+        result = await execute(
+            self.db.table('deleted_records')
+            .select('seq,table_name,record_id,deleted_at')
+            .eq('user_id', user_id)
+            .gt('seq', after_seq)
+            .lt('deleted_at', settle_before)
+            .order('seq')
+            .limit(limit + 1)
+        )
+        rows = result.data or []
+        return rows[:limit], len(rows) > limit
+
+    async def _latest_deletion_id(self, user_id: str, settle_before: str) -> int:
+        """Helper: seq of the user's newest settled tombstone (0 if none)"""
+        result = await execute(
+            self.db.table('deleted_records')
+            .select('seq')
+            .eq('user_id', user_id)
+            .lt('deleted_at', settle_before)
+            .order('seq', desc=True)
+            .limit(1)
+        )
+        return result.data[0]['seq'] if result.data else 0
@@ -7,15 +7,24 @@ Supports:
 - RECURRING tasks (repeating)
 - INTENTION tasks (goals without deadline)
 
-Uses Supabase for storage.
+Uses Supabase for storage, through the shared async PostgREST client
+in services/db.py.
 """
 
+import asyncio
+import base64
+import json
 import os
-from typing import Optional, List, Dict, Any, Literal
-from datetime import datetime, date
-from supabase import create_client, Client
+import re
+import time
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Literal, Tuple
+from datetime import datetime, date, timedelta, timezone
 from pydantic import BaseModel
 from enum import Enum
+from .db import get_db, execute
+from . import recurrence
+from .interval_index import IntervalIndex
 
 
 class TaskType(str, Enum):
@@ -43,6 +52,7 @@ class TaskCreate(BaseModel):
     project_id: Optional[str] = None
     life_sphere: Optional[str] = None
     recurrence_rule: Optional[str] = None  # RRULE format
+    timezone: Optional[str] = None  # IANA zone the rule is expanded in (default UTC)
 
 
 class TaskUpdate(BaseModel):
@@ -55,39 +65,100 @@ class TaskUpdate(BaseModel):
     estimated_duration: Optional[int] = None
     project_id: Optional[str] = None
     life_sphere: Optional[str] = None
+    recurrence_rule: Optional[str] = None
+    timezone: Optional[str] = None
+
+
+# Columns a caller may request via `fields` (list views fetch only what they render)
+TASK_COLUMNS = {
+    'id', 'user_id', 'title', 'description', 'task_type', 'status',
+    'scheduled_at', 'due_date', 'estimated_duration', 'project_id',
+    'life_sphere', 'recurrence_rule', 'timezone', 'parent_task_id', 'recurrence_id',
+    'created_at', 'updated_at', 'completed_at',
+}
+
+# Template fields that change the occurrences (update_task re-expands the template)
+RECURRENCE_FIELDS = {'recurrence_rule', 'timezone', 'scheduled_at', 'due_date'}
+
+# Largest page get_tasks_page serves
+MAX_PAGE_SIZE = int(os.getenv("TASKS_MAX_PAGE_SIZE", "500"))
+
+# Rows per multi-row insert in bulk_create_tasks
+BULK_CHUNK_SIZE = 500
+
+# Conflict index (see find_conflicts): duration assumed for tasks without
+# estimated_duration, and how long a per-user index is trusted before it is
+# rebuilt (picks up writes made by other workers)
+CONFLICT_DEFAULT_DURATION = int(os.getenv("TASK_DEFAULT_DURATION", "30"))
+CONFLICT_INDEX_TTL = float(os.getenv("TASK_CONFLICT_INDEX_TTL", "60"))
+# Users whose conflict index / expansion window a worker keeps (least recently used go first)
+CONFLICT_INDEX_MAX_USERS = int(os.getenv("TASK_CONFLICT_INDEX_MAX_USERS", "1000"))
+EXPANDED_WINDOWS_MAX_USERS = int(os.getenv("TASK_EXPANDED_WINDOWS_MAX_USERS", "10000"))
+OPEN_STATUSES = [TaskStatus.PENDING.value, TaskStatus.IN_PROGRESS.value]
+
+# Always selected: the keyset cursor is built from them
+CURSOR_COLUMNS = ['created_at', 'id']
+# Task ids in cursors: UUIDs (or other plain tokens), never filter syntax
+CURSOR_ID_PATTERN = re.compile(r'^[\w-]+$')
+
+
+def encode_cursor(task: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just after `task` in (created_at, id) desc order."""
+    raw = json.dumps([task['created_at'], task['id']]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> List[str]:
+    """
+    Inverse of encode_cursor. Raises ValueError for malformed cursors,
+    including values that are not a timestamp and a task id (they end up
+    in a PostgREST filter).
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(task_id, str) or not CURSOR_ID_PATTERN.match(task_id):
+        raise ValueError("Invalid cursor")
+    return [created_at, task_id]
+
+
+def build_select(fields: Optional[List[str]] = None) -> str:
+    """PostgREST select clause for a projection. Raises ValueError for unknown columns."""
+    if not fields:
+        return '*'
+    unknown = [f for f in fields if f not in TASK_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown task fields: {unknown}")
+    columns = list(dict.fromkeys(list(fields) + CURSOR_COLUMNS))
+    return ','.join(columns)
 
 
 class TaskService:
     """Service for managing user tasks"""
     
-    def __init__(self):
-        supabase_url = os.getenv('SUPABASE_URL')
-        supabase_key = os.getenv('SUPABASE_SERVICE_KEY') or os.getenv('SUPABASE_ANON_KEY')
-        
-        if not supabase_url or not supabase_key:
-            raise ValueError("Missing Supabase credentials in environment variables")
-        
-        self.supabase: Client = create_client(supabase_url, supabase_key)
+    def __init__(self, db=None):
+        # Shared async PostgREST client (raises ValueError without credentials)
+        self.db = db or get_db()
+        # user_id -> window end of the last recurrence expansion (see expand_recurrences)
+        self._expanded_windows: "OrderedDict[str, datetime]" = OrderedDict()
+        # user_id -> (built at, IntervalIndex of open scheduled tasks)
+        self._conflict_indexes: "OrderedDict[str, Tuple[float, IntervalIndex]]" = OrderedDict()
     
     async def create_task(self, user_id: str, task_data: TaskCreate) -> Dict[str, Any]:
         """Create a new task"""
         try:
-            data = {
-                'user_id': user_id,
-                'title': task_data.title,
-                'description': task_data.description,
-                'task_type': task_data.task_type.value,
-                'status': TaskStatus.PENDING.value,
-                'scheduled_at': task_data.scheduled_at.isoformat() if task_data.scheduled_at else None,
-                'due_date': task_data.due_date.isoformat() if task_data.due_date else None,
-                'estimated_duration': task_data.estimated_duration,
-                'project_id': task_data.project_id,
-                'life_sphere': task_data.life_sphere,
-                'recurrence_rule': task_data.recurrence_rule,
-            }
+            data = self._build_task_row(user_id, task_data)
             
-            result = self.supabase.table('tasks').insert(data).execute()
-            return result.data[0] if result.data else None
+            result = await execute(self.db.table('tasks').insert(data))
+            if task_data.recurrence_rule:
+                # New template: materialize it on the next read
+                self._expanded_windows.pop(user_id, None)
+            task = result.data[0] if result.data else None
+            self._track_task(user_id, task)
+            return task
         except Exception as e:
             print(f"Error creating task: {e}")
             raise
@@ -99,12 +170,47 @@ class TaskService:
         task_type: Optional[TaskType] = None,
         life_sphere: Optional[str] = None,
         project_id: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        fields: Optional[List[str]] = None,
+        cursor: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get tasks with optional filters"""
+        """Get tasks with optional filters (first page only, see get_tasks_page)"""
+        page = await self.get_tasks_page(
+            user_id, status, task_type, life_sphere, project_id, limit, fields, cursor
+        )
+        return page['tasks']
+    
+    async def get_tasks_page(
+        self, 
+        user_id: str,
+        status: Optional[TaskStatus] = None,
+        task_type: Optional[TaskType] = None,
+        life_sphere: Optional[str] = None,
+        project_id: Optional[str] = None,
+        limit: int = 100,
+        fields: Optional[List[str]] = None,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get one page of tasks, newest first.
+        
+        Uses keyset pagination on (created_at, id): pass the returned
+        `next_cursor` back as `cursor` for the next page. Every page is an
+        index range scan, so deep pages cost the same as the first one.
+        `fields` limits the selected columns (id and created_at are always included).
+        
+        Returns:
+            {"tasks": [...], "next_cursor": str or None}
+        """
+        # Validate before the try: bad input should reach the caller
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        select = build_select(fields)
+        after = decode_cursor(cursor) if cursor else None
+        
         try:
-            query = self.supabase.table('tasks') \
-                .select('*') \
+            query = self.db.table('tasks') \
+                .select(select) \
                 .eq('user_id', user_id)
             
             if status:
@@ -115,21 +221,40 @@ class TaskService:
                 query = query.eq('life_sphere', life_sphere)
             if project_id:
                 query = query.eq('project_id', project_id)
+            if after:
+                created_at, task_id = after
+                query = query.or_(
+                    f'created_at.lt."{created_at}",'
+                    f'and(created_at.eq."{created_at}",id.lt."{task_id}")'
+                )
             
-            result = query.order('created_at', desc=True).limit(limit).execute()
-            return result.data if result.data else []
+            # Fetch one extra row to know whether another page exists
+            result = await execute(
+                query.order('created_at', desc=True)
+                .order('id', desc=True)
+                .limit(limit + 1)
+            )
+            tasks = result.data if result.data else []
+            
+            next_cursor = None
+            if len(tasks) > limit:
+                tasks = tasks[:limit]
+                next_cursor = encode_cursor(tasks[-1])
+            
+            return {"tasks": tasks, "next_cursor": next_cursor}
         except Exception as e:
             print(f"Error getting tasks: {e}")
-            return []
+            return {"tasks": [], "next_cursor": None}
     
     async def get_task(self, user_id: str, task_id: str) -> Optional[Dict[str, Any]]:
         """Get a single task by ID"""
         try:
-            result = self.supabase.table('tasks') \
-                .select('*') \
-                .eq('id', task_id) \
-                .eq('user_id', user_id) \
-                .execute()
+            result = await execute(
+                self.db.table('tasks')
+                .select('*')
+                .eq('id', task_id)
+                .eq('user_id', user_id)
+            )
             
             return result.data[0] if result.data else None
         except Exception as e:
@@ -144,30 +269,34 @@ class TaskService:
     ) -> Optional[Dict[str, Any]]:
         """Update a task"""
         try:
-            # Convert to dict and remove None values
-            update_data = {k: v for k, v in updates.dict().items() if v is not None}
-            
-            # Convert enums to string values
-            if 'task_type' in update_data:
-                update_data['task_type'] = update_data['task_type'].value
-            if 'status' in update_data:
-                update_data['status'] = update_data['status'].value
+            update_data = self._build_update_row(updates)
+            recurrence_changed = bool(RECURRENCE_FIELDS & update_data.keys())
+            if recurrence_changed:
+                # Re-expand the template from the window start on the next read
+                update_data['recurrence_expanded_until'] = None
             
-            # Convert dates to ISO format
-            if 'scheduled_at' in update_data and update_data['scheduled_at']:
-                update_data['scheduled_at'] = update_data['scheduled_at'].isoformat()
-            if 'due_date' in update_data and update_data['due_date']:
-                update_data['due_date'] = update_data['due_date'].isoformat()
-            
-            update_data['updated_at'] = datetime.utcnow().isoformat()
-            
-            result = self.supabase.table('tasks') \
-                .update(update_data) \
-                .eq('id', task_id) \
-                .eq('user_id', user_id) \
-                .execute()
+            result = await execute(
+                self.db.table('tasks')
+                .update(update_data)
+                .eq('id', task_id)
+                .eq('user_id', user_id)
+            )
             
-            return result.data[0] if result.data else None
+            task = result.data[0] if result.data else None
+            if recurrence_changed and task and task.get('recurrence_rule'):
+                # Pending occurrences follow the old rule: drop them so they are regenerated
+                await execute(
+                    self.db.table('tasks')
+                    .delete()
+                    .eq('user_id', user_id)
+                    .eq('parent_task_id', task_id)
+                    .eq('status', TaskStatus.PENDING.value)
+                    .gte('recurrence_id', recurrence.expansion_window()[0].isoformat())
+                )
+                self._expanded_windows.pop(user_id, None)
+                self._conflict_indexes.pop(user_id, None)
+            self._track_task(user_id, task)
+            return task
         except Exception as e:
             print(f"Error updating task: {e}")
             raise
@@ -175,11 +304,13 @@ class TaskService:
     async def delete_task(self, user_id: str, task_id: str) -> bool:
         """Delete a task"""
         try:
-            self.supabase.table('tasks') \
-                .delete() \
-                .eq('id', task_id) \
-                .eq('user_id', user_id) \
-                .execute()
+            await execute(
+                self.db.table('tasks')
+                .delete()
+                .eq('id', task_id)
+                .eq('user_id', user_id)
+            )
+            self._untrack_task(user_id, task_id)
             return True
         except Exception as e:
             print(f"Error deleting task: {e}")
@@ -188,17 +319,20 @@ class TaskService:
     async def complete_task(self, user_id: str, task_id: str) -> Optional[Dict[str, Any]]:
         """Mark a task as completed"""
         try:
-            result = self.supabase.table('tasks') \
+            result = await execute(
+                self.db.table('tasks')
                 .update({
                     'status': TaskStatus.COMPLETED.value,
                     'completed_at': datetime.utcnow().isoformat(),
                     'updated_at': datetime.utcnow().isoformat()
-                }) \
-                .eq('id', task_id) \
-                .eq('user_id', user_id) \
-                .execute()
+                })
+                .eq('id', task_id)
+                .eq('user_id', user_id)
+            )
             
-            return result.data[0] if result.data else None
+            task = result.data[0] if result.data else None
+            self._track_task(user_id, task)
+            return task
         except Exception as e:
             print(f"Error completing task: {e}")
             raise
@@ -206,16 +340,19 @@ class TaskService:
     async def start_task(self, user_id: str, task_id: str) -> Optional[Dict[str, Any]]:
         """Mark a task as in progress"""
         try:
-            result = self.supabase.table('tasks') \
+            result = await execute(
+                self.db.table('tasks')
                 .update({
                     'status': TaskStatus.IN_PROGRESS.value,
                     'updated_at': datetime.utcnow().isoformat()
-                }) \
-                .eq('id', task_id) \
-                .eq('user_id', user_id) \
-                .execute()
+                })
+                .eq('id', task_id)
+                .eq('user_id', user_id)
+            )
             
-            return result.data[0] if result.data else None
+            task = result.data[0] if result.data else None
+            self._track_task(user_id, task)
+            return task
         except Exception as e:
             print(f"Error starting task: {e}")
             raise
@@ -236,29 +373,446 @@ class TaskService:
             if snooze_until:
                 update_data['scheduled_at'] = snooze_until.isoformat()
             
-            result = self.supabase.table('tasks') \
-                .update(update_data) \
-                .eq('id', task_id) \
-                .eq('user_id', user_id) \
-                .execute()
+            result = await execute(
+                self.db.table('tasks')
+                .update(update_data)
+                .eq('id', task_id)
+                .eq('user_id', user_id)
+            )
             
-            return result.data[0] if result.data else None
+            task = result.data[0] if result.data else None
+            self._track_task(user_id, task)
+            return task
         except Exception as e:
             print(f"Error snoozing task: {e}")
             raise
     
+    # ==================== BULK OPERATIONS ====================
+    
+    async def bulk_create_tasks(self, user_id: str, tasks: List[TaskCreate]) -> List[Dict[str, Any]]:
+        """
+        Create many tasks with multi-row inserts (BULK_CHUNK_SIZE rows per request).
+        A chunk whose insert fails (one bad row rejects it all) is retried row
+        by row, so only the bad rows fail.
+        
+        Returns one result per input task, in order:
+            {"success": True, "task": row} or {"success": False, "error": "..."}
+        """
+        rows = [self._build_task_row(user_id, task) for task in tasks]
+        chunks = [rows[i:i + BULK_CHUNK_SIZE] for i in range(0, len(rows), BULK_CHUNK_SIZE)]
+        outcomes = await asyncio.gather(
+            *[execute(self.db.table('tasks').insert(chunk)) for chunk in chunks],
+            return_exceptions=True
+        )
+        
+        results = []
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"Error bulk creating tasks: {outcome}")
+                if len(chunk) > 1:
+                    results.extend(await self._insert_each(user_id, chunk))
+                else:
+                    results.append({"success": False, "error": str(outcome)})
+                continue
+            created = outcome.data or []
+            for n in range(len(chunk)):
+                if n < len(created):
+                    self._track_task(user_id, created[n])
+                    results.append({"success": True, "task": created[n]})
+                else:
+                    results.append({"success": False, "error": "Task was not created"})
+        return results
+    
+    async def bulk_update_tasks(
+        self, 
+        user_id: str, 
+        updates: List[Tuple[str, TaskUpdate]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply many (task_id, TaskUpdate) pairs.
+        
+        Updates with identical payloads share one PATCH ... where id in (...),
+        so e.g. moving 200 tasks to the same project is a single request.
+        A failed group is retried task by task.
+        
+        Returns one result per input pair, in order (see bulk_create_tasks).
+        """
+        now = datetime.utcnow().isoformat()
+        groups: Dict[str, Tuple[Dict[str, Any], List[str]]] = {}
+        for task_id, task_update in updates:
+            update_data = self._build_update_row(task_update, now)
+            key = json.dumps(update_data, sort_keys=True)
+            groups.setdefault(key, (update_data, []))[1].append(task_id)
+        
+        outcomes = await asyncio.gather(
+            *[
+                self._update_many(user_id, task_ids, update_data)
+                for update_data, task_ids in groups.values()
+            ],
+            return_exceptions=True
+        )
+        
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for (update_data, task_ids), outcome in zip(groups.values(), outcomes):
+            if isinstance(outcome, Exception):
+                print(f"Error bulk updating tasks: {outcome}")
+                by_id.update(await self._update_each(user_id, task_ids, update_data, outcome))
+            else:
+                by_id.update(outcome)
+        return [by_id[task_id] for task_id, _ in updates]
+    
+    async def bulk_set_status(
+        self, 
+        user_id: str, 
+        task_ids: List[str], 
+        status: TaskStatus
+    ) -> List[Dict[str, Any]]:
+        """
+        Move many tasks to `status` in one request (sets completed_at when completing).
+        
+        Returns one result per task id, in order (see bulk_create_tasks).
+        """
+        now = datetime.utcnow().isoformat()
+        update_data = {'status': status.value, 'updated_at': now}
+        if status == TaskStatus.COMPLETED:
+            update_data['completed_at'] = now
+        
+        try:
+            by_id = await self._update_many(user_id, task_ids, update_data)
+        except Exception as e:
+            print(f"Error bulk setting task status: {e}")
+            by_id = await self._update_each(user_id, task_ids, update_data, e)
+        return [by_id[task_id] for task_id in task_ids]
+    
+    async def _update_many(
+        self, 
+        user_id: str, 
+        task_ids: List[str], 
+        update_data: Dict[str, Any]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Helper: One PATCH for several tasks; returns a result per task id"""
+        result = await execute(
+            self.db.table('tasks')
+            .update(update_data)
+            .in_('id', list(dict.fromkeys(task_ids)))
+            .eq('user_id', user_id)
+        )
+        updated = {row['id']: row for row in (result.data or [])}
+        for row in updated.values():
+            self._track_task(user_id, row)
+        return {
+            task_id: (
+                {"success": True, "task": updated[task_id]}
+                if task_id in updated
+                else {"success": False, "error": "Task not found"}
+            )
+            for task_id in task_ids
+        }
+    
+    async def _insert_each(self, user_id: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Helper: Fallback for a failed multi-row insert, one row per request"""
+        results = []
+        for row in rows:
+            try:
+                result = await execute(self.db.table('tasks').insert(row))
+            except Exception as e:
+                results.append({"success": False, "error": str(e)})
+                continue
+            task = result.data[0] if result.data else None
+            self._track_task(user_id, task)
+            results.append({"success": True, "task": task} if task else {"success": False, "error": "Task was not created"})
+        return results
+    
+    async def _update_each(
+        self, 
+        user_id: str, 
+        task_ids: List[str], 
+        update_data: Dict[str, Any],
+        error: Exception
+    ) -> Dict[str, Dict[str, Any]]:
+        """Helper: Fallback for a failed _update_many, one task per request"""
+        if len(set(task_ids)) < 2:
+            return {task_id: {"success": False, "error": str(error)} for task_id in task_ids}
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for task_id in dict.fromkeys(task_ids):
+            try:
+                by_id.update(await self._update_many(user_id, [task_id], update_data))
+            except Exception as e:
+                by_id[task_id] = {"success": False, "error": str(e)}
+        return by_id
+    
+    def _build_task_row(self, user_id: str, task_data: TaskCreate) -> Dict[str, Any]:
+        """Helper: TaskCreate -> tasks row"""
+        return {
+            'user_id': user_id,
+            'title': task_data.title,
+            'description': task_data.description,
+            'task_type': task_data.task_type.value,
+            'status': TaskStatus.PENDING.value,
+            'scheduled_at': task_data.scheduled_at.isoformat() if task_data.scheduled_at else None,
+            'due_date': task_data.due_date.isoformat() if task_data.due_date else None,
+            'estimated_duration': task_data.estimated_duration,
+            'project_id': task_data.project_id,
+            'life_sphere': task_data.life_sphere,
+            'recurrence_rule': task_data.recurrence_rule,
+            'timezone': task_data.timezone,
+        }
+    
+    def _build_update_row(self, updates: TaskUpdate, now: Optional[str] = None) -> Dict[str, Any]:
+        """Helper: TaskUpdate -> partial tasks row (None values are skipped)"""
+        # Convert to dict and remove None values
+        update_data = {k: v for k, v in updates.model_dump().items() if v is not None}
+        
+        # Convert enums to string values
+        if 'task_type' in update_data:
+            update_data['task_type'] = update_data['task_type'].value
+        if 'status' in update_data:
+            update_data['status'] = update_data['status'].value
+        
+        # Convert dates to ISO format
+        if 'scheduled_at' in update_data and update_data['scheduled_at']:
+            update_data['scheduled_at'] = update_data['scheduled_at'].isoformat()
+        if 'due_date' in update_data and update_data['due_date']:
+            update_data['due_date'] = update_data['due_date'].isoformat()
+        
+        update_data['updated_at'] = now or datetime.utcnow().isoformat()
+        return update_data
+    
+    # ==================== CONFLICTS ====================
+    
+    async def find_conflicts(
+        self, 
+        user_id: str, 
+        start: Optional[datetime] = None, 
+        end: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Pairs of open scheduled tasks whose [scheduled_at, + estimated_duration)
+        overlap, optionally only those touching [start, end).
+        """
+        index = await self._get_conflict_index(user_id)
+        pairs = index.conflicts(
+            start.timestamp() if start else None, 
+            end.timestamp() if end else None
+        )
+        return [
+            {
+                'tasks': [self._interval_summary(index, a), self._interval_summary(index, b)],
+                'overlap_minutes': round(overlap / 60, 1),
+            }
+            for a, b, overlap in pairs
+        ]
+    
+    async def check_conflicts(self, user_id: str, task: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Open scheduled tasks that overlap `task` (a tasks row)"""
+        interval = self._task_interval(task)
+        if interval is None:
+            return []
+        try:
+            index = await self._get_conflict_index(user_id)
+        except Exception as e:
+            print(f"Warning: conflict check skipped: {e}")
+            return []
+        return [
+            self._interval_summary(index, key)
+            for key, *_ in index.overlapping(*interval, exclude=task.get('id'))
+        ]
+    
+    async def find_free_slots(
+        self, 
+        user_id: str, 
+        start: datetime, 
+        end: datetime, 
+        min_duration: int = 30
+    ) -> List[Dict[str, Any]]:
+        """Gaps of at least min_duration minutes between open scheduled tasks in [start, end)"""
+        index = await self._get_conflict_index(user_id)
+        return [
+            {
+                'start': datetime.fromtimestamp(s, start.tzinfo).isoformat(),
+                'end': datetime.fromtimestamp(e, start.tzinfo).isoformat(),
+                'duration_minutes': round((e - s) / 60, 1),
+            }
+            for s, e in index.free_slots(start.timestamp(), end.timestamp(), min_duration * 60)
+        ]
+    
+    async def _get_conflict_index(self, user_id: str) -> IntervalIndex:
+        """Helper: The user's index, loaded from the database when missing or stale"""
+        cached = self._conflict_indexes.get(user_id)
+        if cached and time.monotonic() - cached[0] < CONFLICT_INDEX_TTL:
+            self._conflict_indexes.move_to_end(user_id)
+            return cached[1]
+        self._conflict_indexes.pop(user_id, None)
+        
+        result = await execute(
+            self.db.table('tasks')
+            .select('id,title,status,task_type,scheduled_at,estimated_duration,recurrence_rule')
+            .eq('user_id', user_id)
+            .in_('status', OPEN_STATUSES)
+            .not_.is_('scheduled_at', 'null')
+            .is_('recurrence_rule', 'null')
+        )
+        index = IntervalIndex()
+        for task in result.data or []:
+            interval = self._task_interval(task)
+            if interval:
+                index.add(task['id'], *interval, data=task.get('title'))
+        self._conflict_indexes[user_id] = (time.monotonic(), index)
+        while len(self._conflict_indexes) > CONFLICT_INDEX_MAX_USERS:
+            self._conflict_indexes.popitem(last=False)
+        return index
+    
+    def _track_task(self, user_id: str, task: Optional[Dict[str, Any]]):
+        """Helper: Reflect a written row in the user's index (if one is loaded)"""
+        cached = self._conflict_indexes.get(user_id)
+        if not cached or not task or 'id' not in task:
+            return
+        index = cached[1]
+        interval = self._task_interval(task)
+        if interval and task.get('status', TaskStatus.PENDING.value) in OPEN_STATUSES and not task.get('recurrence_rule'):
+            index.add(task['id'], *interval, data=task.get('title'))
+        else:
+            index.remove(task['id'])
+    
+    def _untrack_task(self, user_id: str, task_id: str):
+        cached = self._conflict_indexes.get(user_id)
+        if cached:
+            cached[1].remove(task_id)
+    
+    @staticmethod
+    def _task_interval(task: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+        """Helper: (start, end) epoch seconds of a scheduled task"""
+        start = recurrence.parse_timestamp(task.get('scheduled_at'))
+        if start is None:
+            return None
+        minutes = task.get('estimated_duration') or CONFLICT_DEFAULT_DURATION
+        return start.timestamp(), start.timestamp() + minutes * 60
+    
+    @staticmethod
+    def _interval_summary(index: IntervalIndex, key: str) -> Dict[str, Any]:
+        start, end, title = index.get(key)
+        return {
+            'id': key,
+            'title': title,
+            'start': datetime.fromtimestamp(start, timezone.utc).isoformat(),
+            'end': datetime.fromtimestamp(end, timezone.utc).isoformat(),
+        }
+    
+    # ==================== RECURRENCE ====================
+    
+    async def expand_recurrences(self, user_id: str, now: Optional[datetime] = None) -> int:
+        """
+        Materialize occurrences of the user's recurring templates in the
+        sliding window (see services/recurrence.py).
+        
+        Incremental: each template continues from recurrence_expanded_until,
+        and a user is skipped when the window has not moved since the last
+        call. Instances are upserted in bulk and ignored if they already
+        exist, so concurrent expansions cannot duplicate them.
+        
+        Returns the number of instance rows written.
+        """
+        window_start, window_end = recurrence.expansion_window(now)
+        if self._expanded_windows.get(user_id) == window_end:
+            return 0
+        
+        result = await execute(
+            self.db.table('tasks')
+            .select('*')
+            .eq('user_id', user_id)
+            .is_('parent_task_id', 'null')
+            .not_.is_('recurrence_rule', 'null')
+            .in_('status', [TaskStatus.PENDING.value, TaskStatus.IN_PROGRESS.value])
+            .or_(f'recurrence_expanded_until.is.null,recurrence_expanded_until.lt."{window_end.isoformat()}"')
+        )
+        
+        rows: List[Dict[str, Any]] = []
+        expanded_until: Dict[datetime, List[str]] = {}
+        for template in result.data or []:
+            try:
+                instances = list(recurrence.iter_instance_rows(template, window_start, window_end))
+            except ValueError as e:
+                print(f"Warning: skipping recurrence of task {template.get('id')}: {e}")
+                continue
+            until = window_end
+            if len(instances) >= recurrence.MAX_OCCURRENCES_PER_EXPANSION:
+                # Capped: continue right after the last occurrence next time
+                last = recurrence.parse_timestamp(instances[-1]['recurrence_id'])
+                until = last + timedelta(microseconds=1)
+            rows.extend(instances)
+            expanded_until.setdefault(until, []).append(template['id'])
+        
+        chunks = [rows[i:i + BULK_CHUNK_SIZE] for i in range(0, len(rows), BULK_CHUNK_SIZE)]
+        await asyncio.gather(*[
+            execute(
+                self.db.table('tasks')
+                .upsert(chunk, on_conflict='parent_task_id,recurrence_id', ignore_duplicates=True)
+            )
+            for chunk in chunks
+        ])
+        # Advance the templates only after their instances are stored
+        await asyncio.gather(*[
+            execute(
+                self.db.table('tasks')
+                .update({'recurrence_expanded_until': until.isoformat()})
+                .in_('id', template_ids)
+                .eq('user_id', user_id)
+            )
+            for until, template_ids in expanded_until.items()
+        ])
+        
+        self._expanded_windows[user_id] = window_end
+        self._expanded_windows.move_to_end(user_id)
+        while len(self._expanded_windows) > EXPANDED_WINDOWS_MAX_USERS:
+            self._expanded_windows.popitem(last=False)
+        if rows:
+            self._conflict_indexes.pop(user_id, None)
+        return len(rows)
+    
+    async def get_open_tasks(self, user_id: str) -> List[Dict[str, Any]]:
+        """Pending and in-progress tasks, with recurring occurrences instead of templates"""
+        try:
+            await self.expand_recurrences(user_id)
+        except Exception as e:
+            print(f"Warning: recurring tasks not expanded: {e}")
+        
+        result = await execute(
+            self.db.table('tasks')
+            .select('*')
+            .eq('user_id', user_id)
+            .in_('status', [TaskStatus.PENDING.value, TaskStatus.IN_PROGRESS.value])
+            .is_('recurrence_rule', 'null')
+        )
+        return result.data if result.data else []
+    
     async def get_pending_tasks_for_today(self, user_id: str) -> List[Dict[str, Any]]:
-        """Get pending and in-progress tasks for today"""
+        """Get pending and in-progress tasks for today (including recurring occurrences)"""
         try:
-            today = date.today().isoformat()
+            try:
+                await self.expand_recurrences(user_id)
+            except Exception as e:
+                print(f"Warning: recurring tasks not expanded: {e}")
+            
+            today = date.today()
+            tomorrow = (today + timedelta(days=1)).isoformat()
+            today = today.isoformat()
             
-            result = self.supabase.table('tasks') \
-                .select('*') \
-                .eq('user_id', user_id) \
-                .in_('status', [TaskStatus.PENDING.value, TaskStatus.IN_PROGRESS.value]) \
-                .or_(f"due_date.eq.{today},scheduled_at.gte.{today}T00:00:00,due_date.is.null") \
-                .order('scheduled_at', desc=False) \
-                .execute()
+            # Templates are excluded (occurrences carry no recurrence_rule).
+            # Occurrences only count on their own day: the window holds weeks of them.
+            result = await execute(
+                self.db.table('tasks')
+                .select('*')
+                .eq('user_id', user_id)
+                .in_('status', [TaskStatus.PENDING.value, TaskStatus.IN_PROGRESS.value])
+                .is_('recurrence_rule', 'null')
+                .or_(
+                    f"and(parent_task_id.is.null,"
+                    f"or(due_date.eq.{today},scheduled_at.gte.{today}T00:00:00,due_date.is.null)),"
+                    f"and(parent_task_id.not.is.null,"
+                    f"or(due_date.eq.{today},and(scheduled_at.gte.{today}T00:00:00,scheduled_at.lt.{tomorrow}T00:00:00)))"
+                )
+                .order('scheduled_at', desc=False)
+            )
             
             return result.data if result.data else []
         except Exception as e:
@@ -0,0 +1,482 @@
+"""
+Transition Scheduler - pushes hora / muhurta transitions instead of polling.
+
+Clients used to poll /api/hora to notice "Jupiter hora now" or "Rahu Kala
+starts in 10 min". Users subscribe once (location, timezone, interval
+kinds, lead times, optional webhook, optional end events); the scheduler precomputes their
+transitions for the next TRANSITION_HORIZON seconds from the day timeline
+(MuhurtasAgent.get_day_timeline). A background task sleeps until the
+earliest event, fires it to the registered listeners and the user's
+webhook, and extends every track incrementally (only the new part of the
+horizon) every TRANSITION_REFILL_INTERVAL seconds.
+
+Memory: subscribers in the same geohash cell (BULK_MUHURTAS_PRECISION),
+timezone and language with the same kinds and leads share one Track - the
+sorted list of their upcoming (fire time, interval, lead) events. Each
+subscription is only a cursor into its track, and the min-heap holds one
+entry per subscription (its next fire time), not one per event, so memory
+grows with subscribers and distinct locations rather than with pending
+events: 100k subscriptions in ~1.9k cells (4M pending events) take about
+150 MB, mostly the shared timelines. Unsubscribing marks the subscription inactive; its heap entry is
+dropped lazily when it surfaces.
+
+Webhooks must be https URLs on public addresses: private, loopback,
+link-local and reserved targets are refused at subscribe time and again
+(after DNS resolution) before every POST. TRANSITION_WEBHOOK_ALLOWED_HOSTS
+(comma-separated) restricts them further to an allowlist.
+"""
+
+import asyncio
+import heapq
+import inspect
+import ipaddress
+import itertools
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from .bulk_muhurtas import BULK_MUHURTAS_PRECISION, geohash_center, geohash_encode
+
+TRANSITION_HORIZON = float(os.getenv("TRANSITION_HORIZON", str(24 * 3600)))
+TRANSITION_REFILL_INTERVAL = float(os.getenv("TRANSITION_REFILL_INTERVAL", str(6 * 3600)))
+TRANSITION_WEBHOOK_TIMEOUT = float(os.getenv("TRANSITION_WEBHOOK_TIMEOUT", "5"))
+TRANSITION_WEBHOOK_ALLOWED_HOSTS = {
+    host.strip().lower() for host in os.getenv("TRANSITION_WEBHOOK_ALLOWED_HOSTS", "").split(",") if host.strip()
+}
+TIMELINE_CACHE_SIZE = 4096
+
+ALERT_KINDS = ("hora", "choghadiya", "rahu_kala", "gulika_kala", "yamaghanda", "abhijit_muhurta", "brahma_muhurta")
+DEFAULT_ALERT_KINDS = ("hora", "rahu_kala")
+# Horas and choghadiyas are contiguous: a start already means the previous one ended
+WINDOW_KINDS = ("rahu_kala", "gulika_kala", "yamaghanda", "abhijit_muhurta", "brahma_muhurta")
+MAX_LEAD_MINUTES = 24 * 60
+
+
+def _is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def check_webhook_url(url: str) -> str:
+    """
+    Validate a subscription webhook URL without resolving it: https only,
+    no credentials, no local names or non-public IP literals, and in the
+    allowlist when one is set. Returns the host; raises ValueError.
+    """
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower().rstrip(".")
+    if parts.scheme != "https" or not host:
+        raise ValueError("webhook_url must be an https URL")
+    if parts.username or parts.password:
+        raise ValueError("webhook_url must not contain credentials")
+    if TRANSITION_WEBHOOK_ALLOWED_HOSTS and host not in TRANSITION_WEBHOOK_ALLOWED_HOSTS:
+        raise ValueError(f"webhook host '{host}' is not allowed")
+    if host == "localhost" or host.endswith((".localhost", ".local", ".internal")):
+        raise ValueError(f"webhook host '{host}' is not public")
+    try:
+        public = _is_public_address(host)
+    except ValueError:
+        return host  # A name: resolved and checked before each POST
+    if not public:
+        raise ValueError(f"webhook host '{host}' is not public")
+    return host
+
+
+@dataclass(eq=False)
+class Track:
+    """Sorted upcoming events shared by subscriptions with the same settings"""
+    cell: str
+    timezone: str
+    tz: Any
+    language: str
+    kinds: Tuple[str, ...]
+    lead_minutes: Tuple[int, ...]
+    ends: bool = False
+    # (fire_ts, interval, lead); lead None marks an "ended" event
+    events: List[Tuple[float, Dict[str, Any], Optional[int]]] = field(default_factory=list)
+    base: int = 0  # absolute index of events[0] (older events are trimmed)
+    until: float = 0.0
+    subscribers: int = 0
+
+    @property
+    def end(self) -> int:
+        return self.base + len(self.events)
+
+
+@dataclass(eq=False, slots=True)
+class Subscription:
+    user_id: str
+    latitude: float
+    longitude: float
+    webhook_url: Optional[str]
+    track: Track
+    cursor: int = 0  # absolute index of the next event in track
+    queued: bool = False
+    active: bool = True
+
+
+class TransitionScheduler:
+    """Heap of upcoming per-user transitions with a background firing task."""
+
+    def __init__(
+        self,
+        muhurtas_agent,
+        horizon: float = TRANSITION_HORIZON,
+        refill_interval: float = TRANSITION_REFILL_INTERVAL,
+        precision: int = BULK_MUHURTAS_PRECISION,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.muhurtas = muhurtas_agent
+        self.horizon = horizon
+        self.refill_interval = refill_interval
+        self.precision = precision
+        self.clock = clock
+
+        # (next fire_ts, seq, subscription): one entry per queued subscription
+        self._heap: List[Tuple[float, int, Subscription]] = []
+        self._seq = itertools.count()
+        self._subscriptions: Dict[str, Subscription] = {}
+        self._tracks: Dict[tuple, Track] = {}
+        self._timelines: "OrderedDict[tuple, List[Tuple[float, Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[Dict[str, Any]], Any]] = []
+        self._last_refill = 0.0
+
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._http = None
+        self._closed = False
+
+        self.stats: Dict[str, int] = {
+            "scheduled": 0,
+            "fired": 0,
+            "stale": 0,
+            "timelines": 0,
+            "listener_errors": 0,
+            "webhooks": 0,
+            "webhook_failures": 0,
+        }
+
+    def __len__(self) -> int:
+        """Pending events over all active subscriptions"""
+        with self._lock:
+            return sum(sub.track.end - sub.cursor for sub in self._subscriptions.values())
+
+    # ==================== SUBSCRIPTIONS ====================
+
+    def subscribe(
+        self,
+        user_id: str,
+        latitude: float,
+        longitude: float,
+        timezone: Optional[str] = None,
+        kinds: Optional[Sequence[str]] = None,
+        lead_minutes: Optional[Sequence[int]] = None,
+        language: str = "ru",
+        webhook_url: Optional[str] = None,
+        ends: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Create or replace a user's subscription and schedule its next
+        horizon of transitions. `timezone` defaults to the zone at the
+        coordinates. With ends=True, windows (WINDOW_KINDS) also fire an
+        "ended" event. Raises ValueError on invalid input.
+        """
+        kinds = tuple(kinds or DEFAULT_ALERT_KINDS)
+        unknown = [k for k in kinds if k not in ALERT_KINDS]
+        if unknown:
+            raise ValueError(f"Unknown kinds {unknown}. Use: {', '.join(ALERT_KINDS)}")
+        leads = tuple(sorted(set(lead_minutes or (0,))))
+        if any(not 0 <= lead <= MAX_LEAD_MINUTES for lead in leads):
+            raise ValueError(f"lead_minutes must be between 0 and {MAX_LEAD_MINUTES}")
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError(f"Invalid coordinates: {latitude}, {longitude}")
+        if webhook_url:
+            check_webhook_url(webhook_url)
+        if not timezone:
+            from agents.muhurtas_agent import timezone_at
+            timezone = timezone_at(latitude, longitude)
+        try:
+            tz = ZoneInfo(timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown timezone '{timezone}'")
+
+        cell = geohash_encode(latitude, longitude, self.precision)
+        key = (cell, timezone, language, kinds, leads, ends)
+        now = self.clock()
+        with self._lock:
+            track = self._tracks.get(key)
+            if track is None:
+                track = self._tracks[key] = Track(cell, timezone, tz, language, kinds, leads, ends, until=now)
+        self._extend(track, now + self.horizon)
+
+        with self._lock:
+            previous = self._subscriptions.get(user_id)
+            if previous:
+                previous.active = False
+                previous.track.subscribers -= 1
+            fires = [fire for fire, _, _ in track.events]
+            sub = Subscription(user_id, latitude, longitude, webhook_url, track,
+                               cursor=track.base + bisect_left(fires, now))
+            track.subscribers += 1
+            self._subscriptions[user_id] = sub
+            self._queue(sub)
+        self._ensure_started()
+        if self._wakeup:
+            self._wakeup.set()
+        return {
+            "user_id": user_id,
+            "cell": cell,
+            "scheduled": track.end - sub.cursor,
+            "scheduled_until": datetime.fromtimestamp(track.until, tz).isoformat(),
+        }
+
+    def unsubscribe(self, user_id: str) -> bool:
+        with self._lock:
+            sub = self._subscriptions.pop(user_id, None)
+            if sub:
+                sub.active = False
+                sub.track.subscribers -= 1
+        return sub is not None
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], Any]):
+        """callback(event) for every fired event; may be sync or async"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict[str, Any]], Any]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    # ==================== SCHEDULING ====================
+
+    def _timeline(self, track: Track, day: datetime) -> List[Tuple[float, float, Dict[str, Any]]]:
+        """(start_ts, end_ts, interval) of one Vedic day, shared by every track of the cell"""
+        key = (track.cell, track.timezone, day.date(), track.language)
+        with self._lock:
+            if key in self._timelines:
+                self._timelines.move_to_end(key)
+                return self._timelines[key]
+
+        latitude, longitude = geohash_center(track.cell)
+        timeline = self.muhurtas.get_day_timeline(day, latitude, longitude, track.language)
+        intervals = [
+            (
+                datetime.fromisoformat(interval["start"]).timestamp(),
+                datetime.fromisoformat(interval["end"]).timestamp(),
+                interval,
+            )
+            for interval in timeline["intervals"]
+            if interval["type"] in ALERT_KINDS
+        ]
+        with self._lock:
+            self.stats["timelines"] += 1
+            self._timelines[key] = intervals
+            while len(self._timelines) > TIMELINE_CACHE_SIZE:
+                self._timelines.popitem(last=False)
+        return intervals
+
+    def _extend(self, track: Track, end: float) -> int:
+        """Append the track's events firing in [track.until, end)"""
+        start = track.until
+        if end <= start:
+            return 0
+        # Vedic days that can hold intervals starting in the window (the
+        # previous day's night runs past midnight, leads reach further back)
+        first = datetime.fromtimestamp(start, track.tz).replace(hour=0, minute=0, second=0, microsecond=0)
+        last = datetime.fromtimestamp(end + max(track.lead_minutes) * 60, track.tz)
+        day = first - timedelta(days=1)
+        entries = []
+        while day.date() <= last.date():
+            for start_ts, end_ts, interval in self._timeline(track, day):
+                if interval["type"] not in track.kinds:
+                    continue
+                for lead in track.lead_minutes:
+                    fire = start_ts - lead * 60
+                    if start <= fire < end:
+                        entries.append((fire, interval, lead))
+                if track.ends and interval["type"] in WINDOW_KINDS and start <= end_ts < end:
+                    entries.append((end_ts, interval, None))
+            day += timedelta(days=1)
+        entries.sort(key=lambda e: e[0])
+
+        with self._lock:
+            if track.until == start:  # not extended concurrently
+                track.events.extend(entries)
+                track.until = end
+                self.stats["scheduled"] += len(entries)
+        return len(entries)
+
+    def _queue(self, sub: Subscription):
+        """Push the subscription's next event time (lock held)"""
+        track = sub.track
+        sub.cursor = max(sub.cursor, track.base)
+        if sub.active and not sub.queued and sub.cursor < track.end:
+            heapq.heappush(self._heap, (track.events[sub.cursor - track.base][0], next(self._seq), sub))
+            sub.queued = True
+
+    def refill(self, now: Optional[float] = None) -> int:
+        """Extend every track to now + horizon (only the missing part) and drop fired events"""
+        now = self.clock() if now is None else now
+        with self._lock:
+            for key in [key for key, track in self._tracks.items() if track.subscribers <= 0]:
+                del self._tracks[key]
+            tracks = list(self._tracks.values())
+        added = 0
+        for track in tracks:
+            with self._lock:
+                track.until = max(track.until, now)
+            added += self._extend(track, now + self.horizon)
+        with self._lock:
+            for track in tracks:
+                # Keep a horizon of history so late cursors still find their events
+                fires = [fire for fire, _, _ in track.events]
+                drop = bisect_left(fires, now - self.horizon)
+                del track.events[:drop]
+                track.base += drop
+            for sub in self._subscriptions.values():
+                self._queue(sub)
+        self._last_refill = now
+        return added
+
+    def pop_due(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Remove and return the events due at `now` (skipping unsubscribed users)"""
+        now = self.clock() if now is None else now
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, sub = heapq.heappop(self._heap)
+                sub.queued = False
+                if not sub.active:
+                    self.stats["stale"] += 1
+                    continue
+                track = sub.track
+                sub.cursor = max(sub.cursor, track.base)
+                fire, interval, lead = track.events[sub.cursor - track.base]
+                due.append(self._event(sub, interval, lead, fire))
+                sub.cursor += 1
+                self._queue(sub)
+            self.stats["fired"] += len(due)
+        return due
+
+    @staticmethod
+    def _event(sub: Subscription, interval: Dict[str, Any], lead: Optional[int], fire: float) -> Dict[str, Any]:
+        tz = sub.track.tz
+        return {
+            "user_id": sub.user_id,
+            "event": "ended" if lead is None else "starts_in" if lead else "started",
+            "lead_minutes": lead,
+            "fire_at": datetime.fromtimestamp(fire, tz).isoformat(),
+            "interval": {
+                **interval,
+                "start": datetime.fromisoformat(interval["start"]).astimezone(tz).isoformat(),
+                "end": datetime.fromisoformat(interval["end"]).astimezone(tz).isoformat(),
+            },
+        }
+
+    def upcoming(self, user_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """The user's next pending events, earliest first"""
+        with self._lock:
+            sub = self._subscriptions.get(user_id)
+            if not sub:
+                return []
+            offset = max(sub.cursor, sub.track.base) - sub.track.base
+            mine = sub.track.events[offset:offset + limit]
+        return [self._event(sub, interval, lead, fire) for fire, interval, lead in mine]
+
+    # ==================== DELIVERY ====================
+
+    async def dispatch(self, events: List[Dict[str, Any]]):
+        """Deliver events to listeners and webhooks"""
+        for event in events:
+            for listener in list(self._listeners):
+                try:
+                    result = listener(event)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    self.stats["listener_errors"] += 1
+                    print(f"Transition listener failed: {e}")
+        webhooks = [(self._subscriptions.get(e["user_id"]), e) for e in events]
+        webhooks = [(sub.webhook_url, e) for sub, e in webhooks if sub and sub.webhook_url]
+        if webhooks:
+            await asyncio.gather(*(self._post(url, event) for url, event in webhooks))
+
+    async def _resolves_public(self, url: str) -> bool:
+        """Every address the webhook host resolves to is public"""
+        parts = urlsplit(url)
+        infos = await asyncio.get_running_loop().getaddrinfo(parts.hostname, parts.port or 443)
+        return bool(infos) and all(_is_public_address(info[4][0]) for info in infos)
+
+    async def _post(self, url: str, event: Dict[str, Any]):
+        if self._http is None:
+            import httpx
+            self._http = httpx.AsyncClient(timeout=TRANSITION_WEBHOOK_TIMEOUT)
+        try:
+            if not await self._resolves_public(url):
+                raise ValueError("host resolves to a non-public address")
+            response = await self._http.post(url, json=event)
+            response.raise_for_status()
+            self.stats["webhooks"] += 1
+        except Exception as e:
+            self.stats["webhook_failures"] += 1
+            print(f"Transition webhook to {url} failed: {e}")
+
+    def _ensure_started(self):
+        """Start the firing loop on the running event loop (if any)."""
+        if self._closed or (self._task and not self._task.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop yet: started by the next subscribe
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        self._last_refill = self.clock()
+        while not self._closed:
+            now = self.clock()
+            next_refill = self._last_refill + self.refill_interval
+            with self._lock:
+                next_fire = self._heap[0][0] if self._heap else next_refill
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(0.0, min(next_fire, next_refill) - now))
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._closed:
+                break
+            try:
+                events = self.pop_due()
+                if events:
+                    await self.dispatch(events)
+                if self.clock() >= self._last_refill + self.refill_interval:
+                    await asyncio.to_thread(self.refill)
+            except Exception as e:
+                print(f"Transition scheduler error: {e}")
+
+    async def close(self):
+        """Stop the firing loop and the webhook client."""
+        self._closed = True
+        if self._task and not self._task.done():
+            self._wakeup.set()
+            await self._task
+        if self._http is not None:
+            await self._http.aclose()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            **self.stats,
+            "pending": len(self),
+            "subscriptions": len(self._subscriptions),
+            "tracks": len(self._tracks),
+        }
@@ -0,0 +1,78 @@
+import asyncio
+
+from services.action_log_writer import ActionLogWriter
+
+
+class FakeTable:
+    def __init__(self):
+        self.batches = []
+
+    async def insert_rows(self, rows):
+        self.batches.append(list(rows))
+
+
+def test_flushes_in_batches_on_size():
+    table = FakeTable()
+    writer = ActionLogWriter(table.insert_rows, batch_size=10, flush_interval=60)
+
+    async def scenario():
+        for i in range(25):
+            writer.enqueue({"n": i})
+        await asyncio.sleep(0.01)  # let the size trigger run
+        await writer.close()
+
+    asyncio.run(scenario())
+    assert [len(b) for b in table.batches] == [10, 10, 5]
+    assert writer.stats["written"] == 25
+
+
+def test_flushes_on_interval():
+    table = FakeTable()
+    writer = ActionLogWriter(table.insert_rows, batch_size=100, flush_interval=0.05)
+
+    async def scenario():
+        writer.enqueue({"n": 1})
+        await asyncio.sleep(0.15)
+        flushed = list(table.batches)
+        await writer.close()
+        return flushed
+
+    assert asyncio.run(scenario()) == [[{"n": 1}]]
+
+
+def test_sheds_load_when_full_and_survives_failures():
+    async def failing(rows):
+        raise RuntimeError("db down")
+
+    writer = ActionLogWriter(failing, max_queue=3, batch_size=100, flush_interval=60)
+
+    async def scenario():
+        results = [writer.enqueue({"n": i}) for i in range(5)]
+        await writer.close()
+        return results
+
+    assert asyncio.run(scenario()) == [True, True, True, False, False]
+    assert writer.get_stats()["dropped"] == 2
+    assert writer.get_stats()["failed_rows"] == 3
+    assert writer.get_stats()["queued"] == 0
+
+
+def test_failed_batch_is_retried_row_by_row():
+    table = FakeTable()
+
+    async def insert_rows(rows):
+        if any(row.get("bad") for row in rows):
+            raise RuntimeError("foreign key violation")
+        await table.insert_rows(rows)
+
+    writer = ActionLogWriter(insert_rows, batch_size=10, flush_interval=60)
+
+    async def scenario():
+        for i in range(4):
+            writer.enqueue({"n": i, "bad": i == 2})
+        await writer.close()
+
+    asyncio.run(scenario())
+    assert [row["n"] for batch in table.batches for row in batch] == [0, 1, 3]
+    stats = writer.get_stats()
+    assert stats["written"] == 3 and stats["failed_rows"] == 1 and stats["failed_batches"] == 1
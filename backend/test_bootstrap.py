@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+from services.bootstrap import BootstrapService
+from services.profile_cache import MemoryCacheBackend
+
+PROFILE = {"id": "p1", "profile_name": "Me", "birth_date": "1990-01-01"}
+
+
+class SlowProfiles:
+    async def get_active_profile(self, user_id):
+        await asyncio.sleep(0.1)
+        return PROFILE
+
+
+class SlowTasks:
+    async def get_pending_tasks_for_today(self, user_id):
+        await asyncio.sleep(0.1)
+        return [{"id": "t1"}]
+
+
+class SlowAgent:
+    """Every method sleeps (in a worker thread) and echoes its name."""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+
+    def __getattr__(self, method):
+        def call(*args, **kwargs):
+            time.sleep(self.delay)
+            return {"method": method}
+        return call
+
+
+class Orchestrator:
+    def __init__(self, delay=0.05):
+        self.calls = 0
+        self.delay = delay
+
+    def synthesize_daily_strategy(self, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        return {"strategy": f"Act boldly, {kwargs['user_name']}", "debug_prompt": "..."}
+
+
+def make_service(orchestrator):
+    return BootstrapService({
+        "profile_service": SlowProfiles(),
+        "task_service": SlowTasks(),
+        "numerology": SlowAgent(),
+        "mayan": SlowAgent(),
+        "jyotish": SlowAgent(),
+        "muhurtas": SlowAgent(),
+        "transits": SlowAgent(),
+        "orchestrator": orchestrator,
+    }, cache_backend=MemoryCacheBackend())
+
+
+def test_parts_run_concurrently():
+    service = make_service(Orchestrator())
+
+    async def scenario():
+        started = time.perf_counter()
+        payload, job = await service.assemble("u1", date="2026-03-02", latitude=55.7, longitude=37.6)
+        elapsed = time.perf_counter() - started
+        await job
+        return payload, elapsed
+
+    payload, elapsed = asyncio.run(scenario())
+    assert payload["profile"] == PROFILE and payload["tasks"] == [{"id": "t1"}]
+    assert payload["muhurtas"] == {"method": "get_all_muhurtas"}
+    assert payload["data"]["numerology"]["profile"] == {"method": "get_profile"}
+    assert payload["errors"] == {}
+    # profile (0.1) then numerology (0.2): well under the ~0.9s of running them in turn
+    assert elapsed < 0.6
+
+
+def test_strategy_is_generated_once_then_cached():
+    orchestrator = Orchestrator(delay=1.0)  # outlives the second assemble
+    service = make_service(orchestrator)
+
+    async def scenario():
+        first, job1 = await service.assemble("u1", date="2026-03-02")
+        second, job2 = await service.assemble("u1", date="2026-03-02")
+        assert job1 is job2  # joined the in-flight generation
+        strategy = await job1
+        third, job3 = await service.assemble("u1", date="2026-03-02")
+        return first, strategy, third, job3
+
+    first, strategy, third, job3 = asyncio.run(scenario())
+    assert first["strategy_status"] == "pending"
+    assert strategy == "Act boldly, Me"
+    assert third["strategy_status"] == "ready" and third["strategy"] == strategy
+    assert job3 is None
+    assert orchestrator.calls == 1
+
+
+class RecordingAgent:
+    """Records the datetime each method is called with."""
+
+    def __init__(self):
+        self.calls = {}
+
+    def __getattr__(self, method):
+        def call(*args, **kwargs):
+            self.calls[method] = args[0]
+            return {"method": method}
+        return call
+
+
+def test_muhurtas_and_transits_use_the_requested_date():
+    muhurtas, transits = RecordingAgent(), RecordingAgent()
+    service = BootstrapService({"muhurtas": muhurtas, "transits": transits}, cache_backend=MemoryCacheBackend())
+
+    asyncio.run(service.assemble("u1", date="2026-12-01", latitude=34.05, longitude=-118.24))
+    when = muhurtas.calls["get_all_muhurtas"]
+    assert when.date().isoformat() == "2026-12-01" and str(when.tzinfo) == "America/Los_Angeles"
+    assert transits.calls["get_current_positions"] == when
+
+    asyncio.run(service.assemble("u1", date="2026-12-01"))
+    assert transits.calls["get_current_positions"].isoformat() == "2026-12-01T00:00:00+00:00"
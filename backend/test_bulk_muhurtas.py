@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from services.bulk_muhurtas import BulkMuhurtasService, geohash_encode
+
+NOW = datetime(2026, 10, 19, 9, 0, tzinfo=timezone.utc)
+
+
+class CountingMuhurtas:
+    """Wraps MuhurtasAgent and counts get_all_muhurtas calls"""
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.calls = []
+
+    def get_all_muhurtas(self, dt, latitude, longitude, language="ru"):
+        self.calls.append((latitude, longitude))
+        return self.agent.get_all_muhurtas(dt, latitude, longitude, language)
+
+    def get_sun_times(self, *args):
+        return self.agent.get_sun_times(*args)
+
+
+def test_geohash_matches_reference_values():
+    assert geohash_encode(42.605, -5.603, 5) == "ezs42"
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+def test_nearby_users_share_one_computation():
+    pytest.importorskip("swisseph")
+    from agents.muhurtas_agent import MuhurtasAgent
+
+    agent = CountingMuhurtas(MuhurtasAgent())
+    users = [
+        {"user_id": "a", "latitude": 55.7510, "longitude": 37.6180, "timezone": "Europe/Moscow"},
+        {"user_id": "b", "latitude": 55.7530, "longitude": 37.6220, "timezone": "Europe/Moscow"},
+        {"user_id": "c", "latitude": 59.9390, "longitude": 30.3150, "timezone": "Europe/Moscow"},
+    ]
+    events = list(BulkMuhurtasService(agent, precision=5).stream(users, NOW, "en"))
+
+    clusters = [e for e in events if e["type"] == "cluster"]
+    fanned = {e["user_id"]: e for e in events if e["type"] == "user"}
+    assert len(agent.calls) == len(clusters) == 2
+    assert fanned["a"]["cluster"] == fanned["b"]["cluster"] != fanned["c"]["cluster"]
+    assert fanned["a"]["muhurtas"] is fanned["b"]["muhurtas"]
+    # Times come back in the users' timezone
+    assert fanned["a"]["muhurtas"]["sun_times"]["sunrise"].endswith("+03:00")
+
+    moscow = next(c for c in clusters if c["users"] == 2)
+    assert 0 < moscow["error"]["max_error_minutes"] < 1 and moscow["error"]["radius_km"] < 1
+    assert next(c for c in clusters if c["users"] == 1)["error"]["max_error_minutes"] == 0
+
+    summary = events[-1]
+    assert summary["type"] == "summary" and summary["users"] == 3 and summary["clusters"] == 2
+
+
+def test_coarser_precision_trades_accuracy_for_fewer_clusters():
+    pytest.importorskip("swisseph")
+    from agents.muhurtas_agent import MuhurtasAgent
+
+    service = BulkMuhurtasService(MuhurtasAgent())
+    users = [
+        {"user_id": str(i), "latitude": 55.5 + i * 0.05, "longitude": 37.3 + i * 0.05, "timezone": "Europe/Moscow"}
+        for i in range(10)
+    ]
+    fine = list(service.stream(users, NOW, precision=5))[-1]
+    coarse = list(service.stream(users, NOW, precision=3))[-1]
+    assert coarse["clusters"] < fine["clusters"]
+    assert coarse["max_error_minutes"] > fine["max_error_minutes"]
+
+
+def test_invalid_input_fails_before_streaming():
+    service = BulkMuhurtasService(muhurtas_agent=None)
+    with pytest.raises(ValueError):
+        service.stream([{"user_id": "x", "latitude": 55.0, "longitude": 37.0, "timezone": "Mars/Olympus"}], NOW)
+    with pytest.raises(ValueError):
+        service.stream([{"user_id": "x", "latitude": 95.0, "longitude": 37.0}], NOW)
@@ -0,0 +1,69 @@
+"""
+Import-time budget for main.py and mcp_server.py.
+
+Each module is imported in a fresh interpreter (like a new MCP stdio session
+or a Railway restart). Fails if a heavy dependency is imported eagerly or if
+the import takes longer than the budget.
+
+Override the budget with COLD_START_BUDGET_MS (e.g. on slow CI machines).
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+BUDGET_MS = float(os.getenv("COLD_START_BUDGET_MS", "1500"))
+
+# Must only be imported when an agent/service is first used
+HEAVY_MODULES = ["swisseph", "timezonefinder", "supabase", "openai", "google.generativeai"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{
+    "elapsed_ms": elapsed_ms,
+    "loaded": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def _cold_import(module: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", ["main", "mcp_server"])
+def test_cold_start(module):
+    pytest.importorskip("fastapi" if module == "main" else "mcp")
+    probe = _cold_import(module)
+
+    assert probe["loaded"] == [], f"{module} eagerly imports {probe['loaded']}"
+    assert probe["elapsed_ms"] < BUDGET_MS, (
+        f"{module} cold import took {probe['elapsed_ms']:.0f}ms (budget {BUDGET_MS:.0f}ms)"
+    )
+
+
+def test_registry_builds_on_first_use():
+    from registry import create_agent_registry
+
+    registry = create_agent_registry()
+    mayan = registry.proxy("mayan")
+
+    assert mayan
+    assert not registry.is_loaded("mayan")
+    assert mayan.calculate_tzolkin("2026-01-10")["kin"] == 32
+    assert registry.is_loaded("mayan")
+    assert registry.get("mayan") is registry.get("mayan")
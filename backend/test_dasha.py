@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from agents.vimshottari import CYCLE_YEARS, YEAR_SECONDS, DashaTimeline
+
+BIRTH = datetime(1990, 5, 17, 10, 30, tzinfo=timezone.utc)
+
+
+def test_first_period_follows_the_moon_nakshatra():
+    # 297.89 deg is in Dhanishtha (Mars), 0.342 of the way through
+    timeline = DashaTimeline(297.89, BIRTH)
+    assert timeline.balance_at_birth["lord"] == "Mars"
+    assert timeline.balance_at_birth["years"] == pytest.approx(7 * (1 - (297.89 % (360 / 27)) / (360 / 27)), abs=1e-4)
+
+    mahadashas = timeline.periods("mahadasha")
+    assert [p["lord"] for p in mahadashas[:3]] == ["Mars", "Rahu", "Jupiter"]
+    assert len(mahadashas) == 10
+    assert timeline.end - timeline.birth >= CYCLE_YEARS * YEAR_SECONDS
+
+
+def test_subperiods_nest_inside_their_parents():
+    timeline = DashaTimeline(123.4, BIRTH)
+    antardashas = timeline.periods("antardasha")
+    assert len(antardashas) == 90 and len(timeline.periods("pratyantardasha")) == 810
+    # Each mahadasha opens with its own antardasha and is exactly covered by nine of them
+    for i, maha in enumerate(timeline.periods("mahadasha")):
+        subs = antardashas[i * 9:(i + 1) * 9]
+        assert subs[0]["lord"] == maha["lord"]
+        assert subs[0]["start"] == maha["start"] and subs[-1]["end"] == maha["end"]
+
+
+def test_lookup_matches_a_linear_scan():
+    timeline = DashaTimeline(12.0, BIRTH)
+    pratyantardashas = timeline.periods("pratyantardasha")
+    for days in range(0, 120 * 365, 997):
+        when = BIRTH + timedelta(days=days)
+        found = timeline.at(when)["pratyantardasha"]
+        expected = next(p for p in pratyantardashas if p["start"] <= when.isoformat() < p["end"])
+        assert found == expected
+
+    with pytest.raises(ValueError):
+        timeline.at(BIRTH + timedelta(days=200 * 365))
+
+
+def test_jyotish_agent_caches_dasha_with_the_chart():
+    pytest.importorskip("swisseph")
+    from agents.jyotish_agent import JyotishAgent
+
+    agent = JyotishAgent()
+    chart = agent.calculate_birth_chart("1990-05-17", "14:30", 55.75, 37.62)
+    dasha = agent.calculate_dasha("1990-05-17", "14:30", 55.75, 37.62, date="2026-10-19")
+
+    assert chart["dasha_balance"] == dasha["balance_at_birth"]
+    assert dasha["mahadasha"]["start"] <= "2026-10-19" < dasha["mahadasha"]["end"]
+    assert agent.get_dasha_timeline("1990-05-17", "14:30", 55.75, 37.62) is agent.get_dasha_timeline(
+        "1990-05-17", "14:30", 55.75, 37.62
+    )
+    assert len(agent._natal_cache) == 1
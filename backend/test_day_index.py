@@ -0,0 +1,77 @@
+import time
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip("swisseph")
+
+from agents.jyotish_agent import JyotishAgent
+from agents.mayan_agent import MayanAgent
+from agents.numerology_expert import NumerologyExpertAgent
+from services.day_index import DayIndexService
+
+AGENTS = {"numerology": NumerologyExpertAgent(), "mayan": MayanAgent(), "jyotish": JyotishAgent()}
+
+
+def make_service(tmp_path, start="2024-01-01", end="2026-12-31"):
+    return DayIndexService(AGENTS, path=str(tmp_path / "day_index.npz"), start=start, end=end)
+
+
+def test_find_dates_matches_the_agents(tmp_path):
+    service = make_service(tmp_path)
+    result = service.query(where={"tithi": "Ekadashi", "tone": [1, 13]}, start="2024-01-01", limit=5)
+
+    assert result["dates"] and result["count"] >= len(result["dates"])
+    for day in result["dates"]:
+        assert AGENTS["jyotish"].calculate_panchanga(day)["tithi"]["name"] == "Ekadashi"
+        assert AGENTS["mayan"].calculate_tzolkin(day)["tone"] in (1, 13)
+
+
+def test_exclude_and_personal_vibration(tmp_path):
+    service = make_service(tmp_path)
+    result = service.query(
+        where={"vibration": 8, "weekday": "friday"}, exclude={"yoga": "malefic"},
+        dob="1990-05-17", start="2025-01-01", end="2025-12-31", limit=100
+    )
+
+    assert result["count"] == len(result["dates"]) > 0
+    engine = AGENTS["numerology"].engine
+    for day, yoga in zip(result["dates"], result["features"]["yoga"]):
+        assert date.fromisoformat(day).weekday() == 4
+        assert engine.get_daily_vibration("1990-05-17", day) == 8
+        assert yoga not in (1, 6, 9, 10, 13, 15, 17, 19, 27)
+
+    with pytest.raises(ValueError):
+        service.query(where={"vibration": 8}, start="2025-01-01")  # needs dob
+    with pytest.raises(ValueError):
+        service.query(where={"planet": 1}, start="2025-01-01")
+
+
+def test_index_is_saved_and_queries_are_fast(tmp_path):
+    make_service(tmp_path).query(where={"tone": 1}, start="2024-01-01")
+    assert (tmp_path / "day_index.npz").exists()
+
+    reloaded = make_service(tmp_path)
+    reloaded.query(where={"tone": 1}, start="2024-01-01")  # loads from disk
+    started = time.perf_counter()
+    result = reloaded.query(
+        any_of=[{"nakshatra": "Pushya"}, {"tithi": [11, 26]}], exclude={"weekday": [5, 6]},
+        start="2024-01-01", limit=1000
+    )
+    assert time.perf_counter() - started < 0.05
+    assert all(date.fromisoformat(d).weekday() < 5 for d in result["dates"])
+    assert result["dates"][-1] <= "2026-12-31"
+
+
+def test_vibration_cache_is_thread_safe(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    service = make_service(tmp_path)
+    dobs = [f"19{y}-05-17" for y in range(50, 90)]
+    with ThreadPoolExecutor(8) as pool:
+        columns = list(pool.map(service._vibration_column, dobs * 3))
+
+    assert len(service._vibrations) == 16
+    engine = AGENTS["numerology"].engine
+    for dob, column in zip(dobs * 3, columns):
+        assert column[0] == engine.get_daily_vibration(dob, "2024-01-01")
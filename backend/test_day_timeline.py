@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("swisseph")
+
+from agents.muhurtas_agent import MuhurtasAgent, SunTimes, location_datetime
+
+SUNDAY = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    agent = MuhurtasAgent()
+
+    def sun_times(date, latitude, longitude):
+        # 07:00 sunrise, 17:00 sunset: 10h day, 14h night
+        midnight = date.replace(hour=0, minute=0, second=0, microsecond=0)
+        sunrise, sunset = midnight + timedelta(hours=7), midnight + timedelta(hours=17)
+        return SunTimes(sunrise, sunset, sunset - sunrise, timedelta(hours=14), sunrise + timedelta(days=1))
+
+    monkeypatch.setattr(agent, "get_sun_times", sun_times)
+    return agent
+
+
+def of_type(timeline, kind):
+    return [e for e in timeline["intervals"] if e["type"] == kind]
+
+
+@pytest.mark.parametrize("latitude,longitude", [(34.05, -118.24), (35.68, 139.69), (55.75, 37.62)])
+def test_timeline_covers_the_day_in_order(latitude, longitude):
+    agent = MuhurtasAgent()
+    day = location_datetime("2026-10-19", latitude, longitude)  # a Monday, read in the location's zone
+    timeline = agent.get_day_timeline(day, latitude, longitude, "en", now=day)
+    starts = [datetime.fromisoformat(e["start"]) for e in timeline["intervals"]]
+    assert starts == sorted(starts)
+
+    horas = of_type(timeline, "hora")
+    assert len(horas) == 24 and len(of_type(timeline, "choghadiya")) == 16
+    assert horas[0]["planet"] == "Moon"
+    assert all(a["end"] == b["start"] for a, b in zip(horas, horas[1:]))
+    durations = [datetime.fromisoformat(h["end"]) - datetime.fromisoformat(h["start"]) for h in horas]
+    assert all(d > timedelta(minutes=30) for d in durations)
+
+    sun = agent.get_sun_times(day, latitude, longitude)
+    assert datetime.fromisoformat(horas[0]["start"]) == sun.sunrise
+    assert datetime.fromisoformat(horas[-1]["end"]) == sun.next_sunrise
+    assert abs(sum(durations, timedelta()) - (sun.next_sunrise - sun.sunrise)) < timedelta(seconds=1)
+
+
+def test_choghadiya_sequences(agent):
+    timeline = agent.get_day_timeline(SUNDAY, 55.75, 37.62, "en", now=SUNDAY)
+    names = [e["name"] for e in of_type(timeline, "choghadiya")]
+    assert names[:8] == ["Udveg", "Chal", "Labh", "Amrit", "Kaal", "Shubh", "Rog", "Udveg"]
+    assert names[8:] == ["Shubh", "Amrit", "Chal", "Rog", "Kaal", "Labh", "Udveg", "Shubh"]
+    [rahu] = of_type(timeline, "rahu_kala")
+    assert rahu["start"] == "2026-03-01T15:45:00+00:00"  # Sunday: 8th eighth of the day
+
+
+def test_current_and_next_transition(agent):
+    timeline = agent.get_day_timeline(SUNDAY, 55.75, 37.62, "en", now=SUNDAY + timedelta(hours=8, minutes=10))
+    assert {e["type"] for e in timeline["current"]} == {"hora", "choghadiya"}
+    assert timeline["next_transition"] == "2026-03-01T08:15:00+00:00"  # end of the 1st choghadiya (1h15m)
+
+    late = agent.get_day_timeline(SUNDAY, 55.75, 37.62, "en", now=SUNDAY + timedelta(days=2))
+    assert late["current"] == [] and late["next_transition"] is None
+
+
+def test_consecutive_days_share_sunrise_solves():
+    pytest.importorskip("swisseph")
+    fresh = MuhurtasAgent()
+    start = datetime(2026, 12, 1, tzinfo=timezone.utc)
+    series = fresh.get_sun_series(start, 7, 55.75, 37.62)
+    assert fresh.stats["solves"] == 7 + 8
+
+    for today, tomorrow in zip(series, series[1:]):
+        assert today.next_sunrise == tomorrow.sunrise
+        assert today.night_duration == tomorrow.sunrise - today.sunset
+    # Moscow in December: nights are long, not simply 24h minus the day
+    assert series[0].night_duration > timedelta(hours=15)
+
+    for day in range(7):
+        fresh.get_day_timeline(start + timedelta(days=day), 55.75, 37.62)
+    assert fresh.stats["solves"] == 15
+
+
+@pytest.mark.parametrize("latitude,longitude", [(34.05, -118.24), (40.71, -74.0), (35.68, 139.69)])
+def test_utc_dates_give_the_locations_own_day(latitude, longitude):
+    fresh = MuhurtasAgent()
+    day = datetime(2026, 10, 19, tzinfo=timezone.utc)
+    sun = fresh.get_sun_times(day, latitude, longitude)
+    assert sun.sunrise < sun.sunset < sun.next_sunrise
+    assert timedelta(hours=9) < sun.day_duration < timedelta(hours=13)
+    assert sun.day_duration + sun.night_duration == sun.next_sunrise - sun.sunrise
+    # The local morning of that date: sunrise near 06:00 local mean solar time
+    solar_hour = (sun.sunrise.hour + sun.sunrise.minute / 60 + longitude / 15) % 24
+    assert 5 < solar_hour < 8
+
+    hora = fresh.get_current_hora(sun.sunset + timedelta(minutes=1), latitude, longitude, "en")
+    assert not hora["is_day"] and hora["hora_number"] == 1
+    assert hora["duration_minutes"] == int(sun.night_duration.total_seconds() / 60 / 12)
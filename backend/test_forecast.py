@@ -0,0 +1,71 @@
+import asyncio
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from services.forecast import ForecastService, score_days
+from services.profile_cache import MemoryCacheBackend
+
+
+def test_score_days_follows_analyze_day_rules():
+    # days: neutral, Amavasya + malefic yoga, tone 13 + master 11, Krishna Chaturthi (19), good tithi + tone 7
+    scored = score_days(
+        vibration=np.array([4, 9, 11, 1, 5]),
+        tone=np.array([3, 5, 13, 2, 7]),
+        tithi=np.array([1, 30, 8, 19, 2]),
+        yoga=np.array([2, 27, 3, 4, 5]),
+    )
+    assert scored["score"].tolist() == [0, -3, 3, -2, 2]
+    assert scored["status"].tolist() == [2, 0, 4, 0, 3]  # Neutral, Critical, Excellent, Critical, Good
+    assert scored["masks"]["cleanse9"].tolist() == [False, True, False, False, False]
+
+
+def test_range_apis_match_single_day_calls():
+    pytest.importorskip("swisseph")
+    from agents.jyotish_agent import JyotishAgent
+    from agents.mayan_agent import MayanAgent
+    from agents.numerology_expert import NumerologyExpertAgent
+
+    numerology, mayan, jyotish = NumerologyExpertAgent(), MayanAgent(), JyotishAgent()
+    start, days = date(2027, 12, 20), 90  # crosses a year end and Feb 29, 2028
+    vibrations = numerology.engine.get_daily_vibrations("1987-12-29", start.isoformat(), days)
+    tzolkin = mayan.calculate_tzolkin_range(start.isoformat(), days)
+    panchanga = jyotish.calculate_panchanga_range(start.isoformat(), days)
+
+    for i in range(days):
+        day = (start + timedelta(days=i)).isoformat()
+        assert vibrations[i] == numerology.engine.get_daily_vibration("1987-12-29", day)
+        expected = mayan.calculate_tzolkin(day)
+        assert tzolkin["tone"][i] == expected["tone"] and tzolkin["seal"][i] == expected["seal"]
+        single = jyotish.calculate_panchanga(day)
+        assert panchanga["tithi"][i] == single["tithi"]["number"]
+        assert panchanga["yoga"][i] == single["yoga"]["number"]
+
+
+def test_forecast_is_columnar_and_cached():
+    pytest.importorskip("swisseph")
+    from registry import create_agent_registry
+
+    registry = create_agent_registry()
+    service = ForecastService(
+        {name: registry.proxy(name) for name in ("numerology", "mayan", "jyotish")},
+        cache_backend=MemoryCacheBackend()
+    )
+
+    async def scenario():
+        first = await service.get_forecast("1990-05-17", start="2026-03-01", days=365, language="en")
+        second = await service.get_forecast("1990-05-17", start="2026-03-01", days=365, language="en")
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    columns = first["columns"]
+    assert all(len(values) == 365 for values in columns.values())
+    assert columns["date"][0] == "2026-03-01" and columns["date"][-1] == "2027-02-28"
+    assert sum(first["counts"].values()) == 365
+    assert any(note.startswith("🚀") for notes in columns["notes"] for note in notes)
+    assert second is first  # forecasts are read-only, hits are not copied
+    assert service.stats == {"hits": 1, "misses": 1}
+
+    with pytest.raises(ValueError):
+        asyncio.run(service.get_forecast("1990-05-17", start="2026-03-01", days=5000))
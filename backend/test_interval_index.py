@@ -0,0 +1,52 @@
+import random
+
+from services.interval_index import IntervalIndex
+
+
+def brute_force_pairs(intervals):
+    items = sorted(intervals.items(), key=lambda kv: (kv[1][0], kv[0]))
+    return {
+        frozenset((a, b))
+        for i, (a, (s1, e1)) in enumerate(items)
+        for b, (s2, e2) in items[i + 1:]
+        if s1 < e2 and s2 < e1
+    }
+
+
+def test_overlapping_and_moves():
+    index = IntervalIndex()
+    index.add("a", 0, 60)
+    index.add("b", 30, 90)
+    index.add("c", 90, 120)
+
+    assert [k for k, *_ in index.overlapping(50, 100)] == ["a", "b", "c"]
+    assert [k for k, *_ in index.overlapping(60, 90)] == ["b"]
+
+    index.add("a", 200, 260)  # moved
+    assert [k for k, *_ in index.overlapping(0, 30)] == []
+    assert index.remove("c") and not index.remove("c")
+    assert len(index) == 2
+
+
+def test_conflicts_match_brute_force():
+    rng = random.Random(7)
+    index, intervals = IntervalIndex(), {}
+    for i in range(300):
+        start = rng.uniform(0, 10_000)
+        intervals[f"t{i}"] = (start, start + rng.uniform(10, 200))
+        index.add(f"t{i}", *intervals[f"t{i}"])
+    for key in list(intervals)[::5]:
+        index.remove(key)
+        del intervals[key]
+
+    assert {frozenset((a, b)) for a, b, _ in index.conflicts()} == brute_force_pairs(intervals)
+
+
+def test_free_slots():
+    index = IntervalIndex()
+    index.add("a", 10, 20)
+    index.add("b", 15, 30)
+    index.add("c", 40, 45)
+
+    assert index.free_slots(0, 60) == [(0, 10), (30, 40), (45, 60)]
+    assert index.free_slots(0, 60, min_length=12) == [(45, 60)]
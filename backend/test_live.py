@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("swisseph")
+
+from agents.muhurtas_agent import MuhurtasAgent
+from services.live import LiveHub
+from services.transition_scheduler import TransitionScheduler
+
+MOSCOW = dict(latitude=55.7510, longitude=37.6180, timezone="Europe/Moscow")
+
+
+def test_windows_fire_start_and_end_events():
+    now = datetime(2026, 10, 19, 0, 0, tzinfo=timezone.utc).timestamp()
+    scheduler = TransitionScheduler(MuhurtasAgent(), clock=lambda: now)
+    scheduler.subscribe("u1", **MOSCOW, kinds=["hora", "rahu_kala"], ends=True)
+    events = scheduler.pop_due(now + 24 * 3600)
+
+    rahu = [e for e in events if e["interval"]["type"] == "rahu_kala"]
+    assert [e["event"] for e in rahu] == ["started", "ended"]
+    assert rahu[1]["fire_at"][:19] == rahu[1]["interval"]["end"][:19]
+    # Horas are contiguous: only starts
+    assert {e["event"] for e in events if e["interval"]["type"] == "hora"} == {"started"}
+
+
+def test_connections_share_a_track_and_receive_transitions():
+    offset = {"value": 0.0}
+    scheduler = TransitionScheduler(MuhurtasAgent(), clock=lambda: time.time() + offset["value"])
+    hub = LiveHub(scheduler, MuhurtasAgent())
+
+    async def scenario():
+        first = await hub.connect(**MOSCOW)
+        second = await hub.connect(latitude=55.7530, longitude=37.6220, timezone="Europe/Moscow")
+        assert scheduler.get_stats()["tracks"] == 1
+        assert any(i["type"] == "hora" for i in first.snapshot["current"])
+
+        streams = [hub.events(first, heartbeat=0.1), hub.events(second, heartbeat=0.1)]
+        assert (await streams[0].__anext__())["type"] == "snapshot"
+        await streams[1].__anext__()
+
+        # Jump the clock to 0.2 s before the next transition
+        offset["value"] = scheduler._heap[0][0] - 0.2 - time.time()
+        scheduler._wakeup.set()
+        received = []
+        for stream in streams:
+            event = await stream.__anext__()
+            while event is None:  # heartbeats until the transition fires
+                event = await stream.__anext__()
+            received.append(event)
+
+        hub.disconnect(first)
+        hub.disconnect(second)
+        await scheduler.close()
+        return received
+
+    received = asyncio.run(scenario())
+    assert [e["type"] for e in received] == ["transition", "transition"]
+    assert received[0]["interval"] == received[1]["interval"]
+    assert len(hub) == 0 and scheduler.get_stats()["subscriptions"] == 0
+
+
+def test_invalid_connection_is_not_kept():
+    hub = LiveHub(TransitionScheduler(MuhurtasAgent()), MuhurtasAgent())
+
+    async def scenario():
+        with pytest.raises(ValueError):
+            await hub.connect(latitude=55.0, longitude=37.0, timezone="Mars/Olympus")
+
+    asyncio.run(scenario())
+    assert len(hub) == 0
+
+
+def test_snapshot_uses_the_locations_timezone_off_the_event_loop():
+    now = datetime(2026, 10, 19, 9, 0, tzinfo=timezone.utc)
+    scheduler = TransitionScheduler(MuhurtasAgent(), clock=lambda: now.timestamp())
+    hub = LiveHub(scheduler, MuhurtasAgent())
+    threads = []
+    current = hub._current
+    hub._current = lambda *args: threads.append(threading.get_ident()) or current(*args)
+
+    async def scenario():
+        conn = await hub.connect(latitude=34.05, longitude=-118.24, kinds=["hora"])
+        hub.disconnect(conn)
+        await scheduler.close()
+        return conn.snapshot
+
+    snapshot = asyncio.run(scenario())
+    assert threads and threads[0] != threading.get_ident()
+    assert snapshot["timezone"] == "America/Los_Angeles"
+    [hora] = snapshot["current"]
+    start, end = datetime.fromisoformat(hora["start"]), datetime.fromisoformat(hora["end"])
+    assert start <= now < end and start.utcoffset().total_seconds() == -7 * 3600
+    assert 40 * 60 < (end - start).total_seconds() < 80 * 60
@@ -0,0 +1,131 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from postgrest import AsyncPostgrestClient
+
+from services.profile_service import ProfileService
+
+PROFILE = {"id": "p2", "user_id": "u1", "profile_name": "Second", "is_active": True}
+
+
+class FakePostgrest:
+    """Records PostgREST requests and answers them from a mock transport."""
+
+    def __init__(self, delay: float = 0.0):
+        self.requests = []
+        self.delay = delay
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        await asyncio.sleep(self.delay)
+        if "/rpc/" in request.url.path:
+            return httpx.Response(200, json=[PROFILE])
+        if request.method == "POST":
+            body = json.loads(request.content)
+            return httpx.Response(201, json=body if isinstance(body, list) else [body])
+        return httpx.Response(200, json=[PROFILE])
+
+    def client(self) -> AsyncPostgrestClient:
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+        return AsyncPostgrestClient("http://db.test/rest/v1", http_client=http_client)
+
+    def tables(self):
+        return [(r.method, r.url.path.rsplit("/", 1)[-1]) for r in self.requests]
+
+
+@pytest.fixture
+def service():
+    fake = FakePostgrest(delay=0.05)
+    svc = ProfileService(db=fake.client())
+    svc.fake = fake
+    return svc
+
+
+def test_active_profile_is_one_round_trip(service):
+    async def scenario():
+        profile = await service.get_active_profile("u1")
+        requests_before_flush = list(service.fake.tables())
+        await service.close()
+        return profile, requests_before_flush
+
+    profile, requests = asyncio.run(scenario())
+    assert profile["id"] == "p2"
+    assert requests == [("GET", "profiles")]
+    assert service.fake.tables()[-1] == ("POST", "action_log")
+
+
+def test_switch_profile_is_one_rpc(service):
+    profile = asyncio.run(service.switch_profile("u1", "p2"))
+
+    assert profile["id"] == "p2"
+    assert service.fake.tables() == [("POST", "switch_active_profile")]
+    assert json.loads(service.fake.requests[0].content) == {"p_user_id": "u1", "p_profile_id": "p2"}
+
+
+def test_create_profile_is_one_rpc(service):
+    asyncio.run(service.create_profile("u1", {"birth_date": "1990-01-01"}))
+
+    assert service.fake.tables() == [("POST", "create_profile")]
+    body = json.loads(service.fake.requests[0].content)
+    assert body["p_profile"]["is_active"] is True
+
+
+def test_active_profile_is_cached_until_a_write(service):
+    async def scenario():
+        await service.get_active_profile("u1")
+        await service.get_active_profile("u1")
+        reads_while_warm = service.fake.tables().count(("GET", "profiles"))
+
+        await service.switch_profile("u1", "p2")
+        await service.get_active_profile("u1")
+        reads_after_write = service.fake.tables().count(("GET", "profiles"))
+        await service.close()
+        return reads_while_warm, reads_after_write
+
+    assert asyncio.run(scenario()) == (1, 2)
+    assert service.cache.stats["hits"] == 1
+
+
+def test_memory_cache_is_bounded():
+    from services.profile_cache import MemoryCacheBackend, _MISSING
+
+    backend = MemoryCacheBackend(max_entries=2)
+
+    async def scenario():
+        await backend.set("a", 1, ttl=60)
+        await backend.set("b", 2, ttl=60)
+        await backend.get("a")  # "b" is now least recently used
+        await backend.set("c", 3, ttl=60)
+        return [await backend.get(k) for k in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == [1, _MISSING, 3]
+
+
+def test_memory_cache_expires_entries():
+    from services.profile_cache import MemoryCacheBackend, _MISSING
+
+    backend = MemoryCacheBackend()
+
+    async def scenario():
+        await backend.set("a", 1, ttl=-1)
+        return await backend.get("a")
+
+    assert asyncio.run(scenario()) is _MISSING
+
+
+def test_profile_cache_returns_copies():
+    from services.profile_cache import ProfileCache
+
+    backend = ProfileCache().backend
+
+    async def scenario():
+        profile = {"value": {"profile_name": "Me", "tags": ["a"]}}
+        await backend.set("p", profile, ttl=60)
+        profile["value"]["profile_name"] = "changed after set"
+        first = await backend.get("p")
+        first["value"]["tags"].append("b")
+        return await backend.get("p")
+
+    assert asyncio.run(scenario()) == {"value": {"profile_name": "Me", "tags": ["a"]}}
@@ -0,0 +1,89 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("swisseph")
+
+from services.slot_scheduler import compute_sun_days, schedule_tasks
+
+START = datetime(2026, 3, 2, 6, tzinfo=timezone.utc)  # Monday sunrise at longitude 0
+
+
+def sun_days(days=9):
+    first = START - timedelta(days=1)
+    return [
+        (first + timedelta(days=i), first + timedelta(days=i, hours=12))
+        for i in range(days + 2)
+    ]
+
+
+def test_trade_task_goes_to_mercury_hora():
+    tasks = [{"id": "t1", "title": "Call supplier", "task_type": "flexible",
+              "estimated_duration": 60, "life_sphere": "trade"}]
+    plan = schedule_tasks(tasks, sun_days(), 0.0, START)
+
+    [placed] = plan["scheduled"]
+    # Monday's 7th day hora is Mercury (12:00-13:00 with 06:00/18:00 sun)
+    assert placed["start"] == "2026-03-02T12:00:00+00:00"
+    assert placed["hora"] == "Mercury"
+    assert placed["avoids_bad_kala"] is True
+
+
+def test_rigid_tasks_block_time_and_are_flagged():
+    tasks = [
+        {"id": "r1", "title": "Meeting", "task_type": "rigid",
+         "scheduled_at": "2026-03-02T12:00:00+00:00", "estimated_duration": 60},
+        {"id": "rk", "title": "Dentist", "task_type": "rigid",
+         "scheduled_at": "2026-03-02T08:00:00+00:00", "estimated_duration": 30},
+        {"id": "t1", "title": "Call supplier", "task_type": "flexible",
+         "estimated_duration": 60, "life_sphere": "trade", "due_date": "2026-03-02"},
+    ]
+    plan = schedule_tasks(tasks, sun_days(), 0.0, START)
+
+    [placed] = plan["scheduled"]
+    assert not (placed["start"] < "2026-03-02T13:00:00" and placed["end"] > "2026-03-02T12:00:00")
+    assert placed["end"] <= "2026-03-03T00:00:00+00:00"
+    assert [w["task_id"] for w in plan["warnings"]] == ["rk"]  # 08:00 is in Monday's Rahu Kala
+
+
+def test_tasks_that_do_not_fit_are_reported():
+    tasks = [{"id": f"t{i}", "title": "Long", "task_type": "flexible",
+              "estimated_duration": 600, "due_date": "2026-03-02"} for i in range(2)]
+    plan = schedule_tasks(tasks, sun_days(), 0.0, START)
+
+    assert len(plan["scheduled"]) == 1
+    assert plan["unscheduled"][0]["reason"] == "No free window before the deadline"
+
+
+def test_hundreds_of_tasks_schedule_quickly():
+    spheres = ["trade", "career", "health", None]
+    tasks = [{"id": f"t{i}", "title": f"Task {i}", "task_type": "flexible",
+              "estimated_duration": 15 + (i % 4) * 15, "life_sphere": spheres[i % 4]}
+             for i in range(300)]
+
+    started = time.perf_counter()
+    plan = schedule_tasks(tasks, sun_days(), 0.0, START)
+    elapsed = time.perf_counter() - started
+
+    assert len(plan["scheduled"]) + len(plan["unscheduled"]) == 300
+    intervals = sorted((p["start"], p["end"]) for p in plan["scheduled"])
+    assert all(prev_end <= start for (_, prev_end), (start, _) in zip(intervals, intervals[1:]))
+    assert elapsed < 1.0
+
+
+@pytest.mark.parametrize("latitude,longitude", [(34.05, -118.24), (35.68, 139.69)])
+def test_real_sun_days_away_from_greenwich(latitude, longitude):
+    from agents.muhurtas_agent import MuhurtasAgent
+
+    start = datetime(2026, 10, 19, tzinfo=timezone.utc)
+    days = compute_sun_days(MuhurtasAgent(), start, start + timedelta(days=7), latitude, longitude)
+
+    assert all(timedelta(hours=9) < sunset - sunrise < timedelta(hours=13) for sunrise, sunset in days)
+    assert all(b[0] - a[0] < timedelta(hours=25) for a, b in zip(days, days[1:]))
+    assert days[0][0] <= start and days[-1][0] >= start + timedelta(days=7)
+
+    tasks = [{"id": "t1", "title": "Call supplier", "task_type": "flexible",
+              "estimated_duration": 60, "life_sphere": "trade"}]
+    plan = schedule_tasks(tasks, days, longitude, start)
+    assert [t["task_id"] for t in plan["scheduled"]] == ["t1"]
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+swe = pytest.importorskip("swisseph")
+
+from agents.muhurtas_agent import MuhurtasAgent
+from agents.solar import sun_events
+
+JAN_1 = swe.julday(2026, 1, 1, 0)
+
+
+def reference(jd_start, latitude, longitude, kind):
+    flag = (swe.CALC_RISE if kind == "rise" else swe.CALC_SET) | swe.BIT_DISC_CENTER
+    res, tret = swe.rise_trans(jd_start, swe.SUN, flag, (longitude, latitude, 0), 0, 0)
+    return tret[0] if res == 0 else np.nan
+
+
+@pytest.mark.parametrize("latitude,longitude", [(-55, -74), (0, 0), (32.08, 34.78), (55.75, 37.62), (65, 139.7)])
+def test_matches_rise_trans_within_seconds(latitude, longitude):
+    days = JAN_1 + np.arange(0, 365, 3)
+    for kind in ("rise", "set"):
+        fast = sun_events(days, latitude, longitude, kind)
+        exact = np.array([reference(jd, latitude, longitude, kind) for jd in days])
+        assert np.max(np.abs(fast - exact)) * 86400 < 5
+
+
+def test_arbitrary_start_times_find_the_next_event():
+    # Random instants, not midnights: far east longitudes list events under the next UTC day
+    rng = np.random.default_rng(7)
+    latitude = rng.uniform(-55, 65, 400)
+    longitude = rng.uniform(-180, 180, 400)
+    jd_start = JAN_1 + rng.uniform(0, 365, 400)
+    for kind in ("rise", "set"):
+        fast = sun_events(jd_start, latitude, longitude, kind)
+        exact = np.array([reference(*args, kind) for args in zip(jd_start, latitude, longitude)])
+        assert not np.isnan(fast).any()
+        assert np.max(np.abs(fast - exact)) * 86400 < 5
+    assert not np.isnan(sun_events(swe.julday(2026, 3, 1, 23.5), -30.86, 174.78, "rise"))
+
+
+def test_polar_day_is_nan_and_tables_broadcast():
+    midsummer = swe.julday(2026, 6, 21, 0)
+    assert np.isnan(sun_events(midsummer, 78.2, 15.6, "rise"))
+    assert np.isnan(reference(midsummer, 78.2, 15.6, "rise"))
+
+    table = sun_events((JAN_1 + np.arange(365))[:, None], np.array([0.0, 40.0, 55.0]), 0.0, "set")
+    assert table.shape == (365, 3) and not np.isnan(table).any()
+
+
+@pytest.mark.parametrize("latitude,longitude,tz", [
+    (55.75, 37.62, timezone(timedelta(hours=3))),
+    (34.05, -118.24, timezone.utc),  # UTC dates west of Greenwich still mean the local day
+])
+def test_calendar_matches_the_single_day_methods(latitude, longitude, tz):
+    agent = MuhurtasAgent()
+    start = datetime(2026, 3, 1, tzinfo=tz)
+    fast = agent.get_muhurtas_calendar(start, 366, latitude, longitude)
+    precise = agent.get_muhurtas_calendar(start, 366, latitude, longitude, precise=True)
+    assert len(fast["dates"]) == 366 and fast["dates"][0] == "2026-03-01"
+
+    for i in range(0, 366, 45):
+        day = start + timedelta(days=i, hours=12)
+        sunrise = datetime.fromisoformat(precise["sunrise"][i])
+        assert timedelta(hours=7) < datetime.fromisoformat(precise["sunset"][i]) - sunrise < timedelta(hours=18)
+        for key, single in (
+            ("rahu_kala", agent.get_rahu_kala(day, latitude, longitude)),
+            ("brahma_muhurta", agent.get_brahma_muhurta(day, latitude, longitude)),
+            ("abhijit_muhurta", agent.get_abhijit_muhurta(day, latitude, longitude)),
+        ):
+            expected = datetime.fromisoformat(single["start"])
+            assert abs((datetime.fromisoformat(precise[key]["start"][i]) - expected).total_seconds()) <= 1
+            assert abs((datetime.fromisoformat(fast[key]["start"][i]) - expected).total_seconds()) <= 6
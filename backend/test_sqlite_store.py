@@ -0,0 +1,133 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from services.profile_service import ProfileService
+from services.sqlite_store import SqliteClient, SqliteError
+from services.sync_service import SyncService
+from services.task_service import TaskCreate, TaskService, TaskStatus, TaskType, TaskUpdate
+
+
+@pytest.fixture
+def db(tmp_path):
+    return SqliteClient(str(tmp_path / "calendar.db"))
+
+
+def test_uses_wal_journal(db):
+    assert db._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_profiles_switch_atomically(db):
+    service = ProfileService(db=db)
+
+    async def scenario():
+        first = await service.create_profile("u1", {"profile_name": "Me", "birth_date": "1990-01-01"})
+        second = await service.create_profile("u1", {"profile_name": "Partner", "birth_date": "1991-02-02"})
+        active_after_create = await service.get_active_profile("u1")
+        await service.switch_profile("u1", first["id"])
+        active_after_switch = await service.get_active_profile("u1")
+        profiles = await service.get_all_profiles("u1")
+        await service.close()
+        return second, active_after_create, active_after_switch, profiles
+
+    second, after_create, after_switch, profiles = asyncio.run(scenario())
+    assert after_create["id"] == second["id"]
+    assert after_switch["profile_name"] == "Me"
+    assert [p["is_active"] for p in profiles] == [True, False]
+
+
+def test_profile_deletion_is_logged(db):
+    service = ProfileService(db=db)
+
+    async def scenario():
+        keep = await service.create_profile("u1", {"profile_name": "Me", "birth_date": "1990-01-01"})
+        gone = await service.create_profile("u1", {"profile_name": "Old", "birth_date": "1991-02-02"})
+        await service.delete_profile("u1", gone["id"])
+        logs = await service.get_recent_logs("u1")
+        await service.close()
+        return keep, gone, logs
+
+    keep, gone, logs = asyncio.run(scenario())
+    assert service.log_writer.get_stats()["failed_rows"] == 0
+    [deleted] = [log for log in logs if log["action_type"] == "profile_deleted"]
+    assert deleted["profile_id"] is None and deleted["action_details"]["profile_id"] == gone["id"]
+    # action_log rows of a deleted profile cascade away
+    assert [log["action_type"] for log in logs] == ["profile_deleted", "profile_created"]
+
+
+def test_task_service_round_trip(db):
+    service = TaskService(db=db)
+
+    async def scenario():
+        created = await service.bulk_create_tasks("u1", [TaskCreate(title=f"Task {i}") for i in range(5)])
+        ids = [r["task"]["id"] for r in created]
+        first_page = await service.get_tasks_page("u1", limit=3, fields=["title"])
+        second_page = await service.get_tasks_page("u1", limit=3, cursor=first_page["next_cursor"])
+        await service.update_task("u1", ids[0], TaskUpdate(
+            scheduled_at=datetime(2026, 3, 2, 10, tzinfo=timezone.utc), estimated_duration=60))
+        await service.update_task("u1", ids[1], TaskUpdate(
+            scheduled_at=datetime(2026, 3, 2, 10, 30, tzinfo=timezone.utc)))
+        conflicts = await service.find_conflicts("u1")
+        done = await service.bulk_set_status("u1", ids[2:4], TaskStatus.COMPLETED)
+        await service.delete_task("u1", ids[4])
+        return ids, first_page, second_page, conflicts, done
+
+    ids, first_page, second_page, conflicts, done = asyncio.run(scenario())
+    assert len(first_page["tasks"]) == 3 and len(second_page["tasks"]) == 2
+    assert {t["id"] for t in first_page["tasks"] + second_page["tasks"]} == set(ids)
+    assert [[t["id"] for t in c["tasks"]] for c in conflicts] == [ids[:2]]
+    assert all(r["task"]["completed_at"] for r in done)
+
+
+def test_changing_a_rule_regenerates_occurrences(db):
+    service = TaskService(db=db)
+    monday = datetime.now(timezone.utc).replace(hour=9, minute=0, second=0, microsecond=0)
+
+    async def scenario():
+        template = await service.create_task("u1", TaskCreate(
+            title="Standup", task_type=TaskType.RECURRING, scheduled_at=monday, recurrence_rule="FREQ=DAILY"))
+        daily = await service.get_open_tasks("u1")
+        await service.update_task("u1", template["id"], TaskUpdate(recurrence_rule="FREQ=WEEKLY"))
+        weekly = await service.get_open_tasks("u1")
+        return daily, weekly
+
+    daily, weekly = asyncio.run(scenario())
+    assert len(daily) > 50 and 8 <= len(weekly) <= 10
+
+
+def test_today_lists_one_occurrence_of_a_daily_rule(db):
+    service = TaskService(db=db)
+    nine = datetime.now(timezone.utc).replace(hour=9, minute=0, second=0, microsecond=0)
+
+    async def scenario():
+        await service.create_task("u1", TaskCreate(
+            title="Standup", task_type=TaskType.RECURRING, scheduled_at=nine, recurrence_rule="FREQ=DAILY"))
+        await service.create_task("u1", TaskCreate(title="Someday"))
+        return await service.get_pending_tasks_for_today("u1")
+
+    today = asyncio.run(scenario())
+    occurrences = [t for t in today if t["parent_task_id"]]
+    assert len(occurrences) == 1 and occurrences[0]["scheduled_at"].startswith(nine.date().isoformat())
+    assert [t["title"] for t in today if not t["parent_task_id"]] == ["Someday"]
+
+
+def test_sync_feed_reports_tombstones(db, monkeypatch):
+    monkeypatch.setattr("services.sync_service.SYNC_SETTLE_SECONDS", -60)
+    tasks, sync = TaskService(db=db), SyncService(db=db)
+
+    async def scenario():
+        task = await tasks.create_task("u1", TaskCreate(title="Temporary"))
+        snapshot = await sync.get_changes("u1")
+        await tasks.delete_task("u1", task["id"])
+        delta = await sync.get_changes("u1", since=snapshot["next_cursor"])
+        return task, snapshot, delta
+
+    task, snapshot, delta = asyncio.run(scenario())
+    assert [t["id"] for t in snapshot["tasks"]] == [task["id"]]
+    assert delta["deleted"][0]["id"] == task["id"] and delta["tasks"] == []
+
+
+def test_rejects_unknown_columns(db):
+    with pytest.raises(SqliteError):
+        db.table("tasks").select("password")._build()
@@ -0,0 +1,90 @@
+import asyncio
+
+import httpx
+import pytest
+from postgrest import AsyncPostgrestClient
+
+from services.sync_service import SyncService, decode_sync_cursor, encode_sync_cursor
+
+TASKS = [
+    {"id": f"t{i}", "title": f"Task {i}", "updated_at": f"2026-01-01T00:00:0{i}+00:00"}
+    for i in range(3)
+]
+TOMBSTONES = [
+    {"seq": 7, "table_name": "tasks", "record_id": "t9", "deleted_at": "2026-01-01T00:00:05+00:00"},
+]
+
+
+class FakePostgrest:
+    """Answers each table from canned rows and records requests."""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.requests = []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        rows = self.tables.get(request.url.path.rsplit("/", 1)[-1], [])
+        limit = int(request.url.params.get("limit", len(rows)))
+        return httpx.Response(200, json=rows[:limit])
+
+    def client(self) -> AsyncPostgrestClient:
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+        return AsyncPostgrestClient("http://db.test/rest/v1", http_client=http_client)
+
+    def params(self, table):
+        return [r.url.params for r in self.requests if r.url.path.endswith("/" + table)]
+
+
+def test_cursor_round_trip():
+    positions = {"tasks": ["2026-01-01T00:00:00+00:00", "t1"], "projects": None, "deleted": 3}
+    assert decode_sync_cursor(encode_sync_cursor(positions)) == positions
+    with pytest.raises(ValueError):
+        decode_sync_cursor("garbage")
+    # Values that would inject PostgREST filter syntax are rejected
+    for position in (["2026-01-01", "t1),user_id.neq.u1"], ['"),id.gt.0', "t1"], ["2026-01-01", 5]):
+        with pytest.raises(ValueError):
+            decode_sync_cursor(encode_sync_cursor({"tasks": position, "deleted": 0}))
+    with pytest.raises(ValueError):
+        decode_sync_cursor(encode_sync_cursor({"deleted": "3"}))
+
+
+def test_snapshot_skips_tombstones_and_pages():
+    fake = FakePostgrest({"tasks": TASKS, "deleted_records": TOMBSTONES})
+    service = SyncService(db=fake.client())
+
+    page = asyncio.run(service.get_changes("u1", limit=2))
+
+    assert [t["id"] for t in page["tasks"]] == ["t0", "t1"]
+    assert page["projects"] == [] and page["deleted"] == []
+    assert page["has_more"] is True
+    positions = decode_sync_cursor(page["next_cursor"])
+    assert positions["tasks"] == ["2026-01-01T00:00:01+00:00", "t1"]
+    assert positions["projects"] is None
+    assert positions["deleted"] == 7
+
+    params = fake.params("tasks")[0]
+    assert params["order"] == "updated_at.asc,id.asc"
+    assert params["updated_at"].startswith("lt.")
+
+
+def test_delta_uses_keyset_and_returns_tombstones():
+    fake = FakePostgrest({"deleted_records": TOMBSTONES})
+    service = SyncService(db=fake.client())
+    since = encode_sync_cursor({"tasks": ["2026-01-01T00:00:01+00:00", "t1"], "deleted": 3})
+
+    page = asyncio.run(service.get_changes("u1", since=since))
+
+    assert page["deleted"] == [
+        {"table": "tasks", "id": "t9", "deleted_at": "2026-01-01T00:00:05+00:00"}
+    ]
+    assert page["has_more"] is False
+    positions = decode_sync_cursor(page["next_cursor"])
+    assert positions["tasks"] == ["2026-01-01T00:00:01+00:00", "t1"]
+    assert positions["deleted"] == 7
+
+    assert fake.params("tasks")[0]["or"] == (
+        '(updated_at.gt."2026-01-01T00:00:01+00:00",'
+        'and(updated_at.eq."2026-01-01T00:00:01+00:00",id.gt."t1"))'
+    )
+    assert fake.params("deleted_records")[0]["seq"] == "gt.3"
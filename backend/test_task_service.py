@@ -0,0 +1,249 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from postgrest import AsyncPostgrestClient
+
+from services import recurrence
+from services.task_service import (
+    TaskCreate, TaskService, TaskStatus, TaskUpdate, build_select, decode_cursor, encode_cursor,
+)
+
+
+def make_tasks(n):
+    return [
+        {"id": f"t{i:03d}", "title": f"Task {i}", "created_at": f"2026-01-01T00:00:{59 - i:02d}+00:00"}
+        for i in range(n)
+    ]
+
+
+class FakePostgrest:
+    """Answers PostgREST requests from a mock transport and records them."""
+
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.requests = []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.method == "POST":
+            body = json.loads(request.content)
+            return httpx.Response(201, json=body if isinstance(body, list) else [body])
+        if request.method == "PATCH":
+            body = json.loads(request.content)
+            ids = request.url.params["id"][len("in.("):-1].split(",")
+            return httpx.Response(200, json=[
+                {**row, **body} for row in self.rows if row["id"] in ids
+            ])
+        limit = int(request.url.params.get("limit", len(self.rows)))
+        return httpx.Response(200, json=self.rows[:limit])
+
+    def client(self) -> AsyncPostgrestClient:
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+        return AsyncPostgrestClient("http://db.test/rest/v1", http_client=http_client)
+
+
+def test_cursor_round_trip():
+    task = {"id": "abc", "created_at": "2026-01-01T10:00:00+00:00"}
+    assert decode_cursor(encode_cursor(task)) == ["2026-01-01T10:00:00+00:00", "abc"]
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+    # Values that would inject PostgREST filter syntax are rejected
+    for created_at, task_id in (("2026-01-01", "x),status.eq.done"), ('"),id.gt.0', "abc"), ("2026-01-01", 7)):
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor({"id": task_id, "created_at": created_at}))
+
+
+def test_projection_always_includes_cursor_columns():
+    assert build_select(None) == "*"
+    assert build_select(["title", "status"]) == "title,status,created_at,id"
+    with pytest.raises(ValueError):
+        build_select(["title", "password"])
+
+
+def test_pages_use_keyset_filter():
+    fake = FakePostgrest(make_tasks(5))
+    service = TaskService(db=fake.client())
+
+    first = asyncio.run(service.get_tasks_page("u1", limit=3, fields=["title"]))
+    assert [t["id"] for t in first["tasks"]] == ["t000", "t001", "t002"]
+    assert first["next_cursor"] == encode_cursor(first["tasks"][-1])
+
+    params = fake.requests[0].url.params
+    assert params["select"] == "title,created_at,id"
+    assert params["order"] == "created_at.desc,id.desc"
+    assert params["limit"] == "4"
+
+    asyncio.run(service.get_tasks_page("u1", limit=3, cursor=first["next_cursor"]))
+    keyset = fake.requests[1].url.params["or"]
+    assert keyset == (
+        '(created_at.lt."2026-01-01T00:00:57+00:00",'
+        'and(created_at.eq."2026-01-01T00:00:57+00:00",id.lt."t002"))'
+    )
+
+
+def test_page_limit_is_validated():
+    service = TaskService(db=FakePostgrest(make_tasks(2)).client())
+    for limit in (0, -5, 10_000):
+        with pytest.raises(ValueError):
+            asyncio.run(service.get_tasks_page("u1", limit=limit))
+
+
+def test_last_page_has_no_cursor():
+    service = TaskService(db=FakePostgrest(make_tasks(2)).client())
+    page = asyncio.run(service.get_tasks_page("u1", limit=3))
+    assert len(page["tasks"]) == 2
+    assert page["next_cursor"] is None
+
+
+def test_bulk_create_is_one_insert_per_chunk(monkeypatch):
+    monkeypatch.setattr("services.task_service.BULK_CHUNK_SIZE", 2)
+    fake = FakePostgrest()
+    service = TaskService(db=fake.client())
+
+    tasks = [TaskCreate(title=f"Task {i}") for i in range(5)]
+    results = asyncio.run(service.bulk_create_tasks("u1", tasks))
+
+    assert [r["task"]["title"] for r in results] == [f"Task {i}" for i in range(5)]
+    assert [len(json.loads(r.content)) for r in fake.requests] == [2, 2, 1]
+
+
+class RejectingPostgrest(FakePostgrest):
+    """Fails any request that touches a row titled "bad" or the id "broken" (like a constraint error)."""
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content) if request.content else None
+        rows = body if isinstance(body, list) else [body]
+        if any(row and row.get("title") == "bad" for row in rows) or "broken" in request.url.params.get("id", ""):
+            self.requests.append(request)
+            return httpx.Response(400, json={"message": "check constraint violated", "code": "23514"})
+        return await super().handler(request)
+
+
+def test_bulk_operations_retry_a_failed_chunk_row_by_row():
+    fake = RejectingPostgrest(make_tasks(3))
+    service = TaskService(db=fake.client())
+
+    created = asyncio.run(service.bulk_create_tasks("u1", [TaskCreate(title=t) for t in ("a", "bad", "c")]))
+    assert [r["success"] for r in created] == [True, False, True]
+    assert [r["task"]["title"] for r in created if r["success"]] == ["a", "c"]
+
+    done = asyncio.run(service.bulk_set_status("u1", ["t000", "broken", "t002"], TaskStatus.COMPLETED))
+    assert [r["success"] for r in done] == [True, False, True]
+
+
+def test_bulk_update_groups_identical_changes():
+    fake = FakePostgrest(make_tasks(4))
+    service = TaskService(db=fake.client())
+
+    updates = [
+        ("t000", TaskUpdate(project_id="p1")),
+        ("t001", TaskUpdate(title="Renamed")),
+        ("t002", TaskUpdate(project_id="p1")),
+        ("missing", TaskUpdate(project_id="p1")),
+    ]
+    results = asyncio.run(service.bulk_update_tasks("u1", updates))
+
+    assert len(fake.requests) == 2
+    assert [r["success"] for r in results] == [True, True, True, False]
+    assert results[1]["task"]["title"] == "Renamed"
+    assert results[3]["error"] == "Task not found"
+
+
+def test_bulk_complete_sets_completed_at():
+    fake = FakePostgrest(make_tasks(3))
+    service = TaskService(db=fake.client())
+
+    results = asyncio.run(service.bulk_set_status("u1", ["t000", "t002"], TaskStatus.COMPLETED))
+
+    assert len(fake.requests) == 1
+    assert all(r["task"]["status"] == "completed" and r["task"]["completed_at"] for r in results)
+
+
+TEMPLATE = {
+    "id": "r1", "user_id": "u1", "title": "Standup", "task_type": "recurring",
+    "recurrence_rule": "FREQ=WEEKLY;BYDAY=MO,WE", "scheduled_at": "2026-01-05T09:00:00+00:00",
+    "recurrence_expanded_until": None,
+}
+NOW = datetime(2026, 3, 2, 12, tzinfo=timezone.utc)  # a Monday
+
+
+def test_recurrence_expands_window_incrementally():
+    start, end = recurrence.expansion_window(NOW, days=14)
+    rows = list(recurrence.iter_instance_rows(TEMPLATE, start, end))
+    assert [r["scheduled_at"][:10] for r in rows] == ["2026-03-02", "2026-03-04", "2026-03-09", "2026-03-11"]
+    assert rows[0]["parent_task_id"] == "r1" and rows[0]["recurrence_id"] == rows[0]["scheduled_at"]
+
+    # Once the window has moved, only the new tail is generated
+    advanced = {**TEMPLATE, "recurrence_expanded_until": end.isoformat()}
+    assert list(recurrence.iter_instance_rows(advanced, start, end)) == []
+    later = recurrence.expansion_window(NOW.replace(day=5), days=14)
+    assert [r["scheduled_at"][:10] for r in recurrence.iter_instance_rows(advanced, *later)] == ["2026-03-16", "2026-03-18"]
+
+
+def test_recurrence_keeps_local_time_across_dst():
+    # Monday 09:00 in Berlin: 08:00 UTC in winter, 07:00 UTC after 29 March
+    berlin = {**TEMPLATE, "recurrence_rule": "FREQ=WEEKLY;BYDAY=MO",
+              "scheduled_at": "2026-03-02T09:00:00+01:00", "timezone": "Europe/Berlin"}
+    rows = list(recurrence.iter_instance_rows(berlin, *recurrence.expansion_window(NOW, days=35)))
+    assert [r["scheduled_at"] for r in rows] == [
+        "2026-03-02T08:00:00+00:00", "2026-03-09T08:00:00+00:00", "2026-03-16T08:00:00+00:00",
+        "2026-03-23T08:00:00+00:00", "2026-03-30T07:00:00+00:00",
+    ]
+    with pytest.raises(ValueError):
+        list(recurrence.iter_instance_rows({**berlin, "timezone": "Mars/Olympus"}, *recurrence.expansion_window(NOW)))
+
+
+def test_expand_recurrences_bulk_upserts_and_advances_template():
+    fake = FakePostgrest([TEMPLATE])
+    service = TaskService(db=fake.client())
+
+    written = asyncio.run(service.expand_recurrences("u1", now=NOW))
+    again = asyncio.run(service.expand_recurrences("u1", now=NOW))
+
+    assert written == 18 and again == 0  # 60-day window; second call is a no-op
+    methods = [r.method for r in fake.requests]
+    assert methods == ["GET", "POST", "PATCH"]
+    assert "resolution=ignore-duplicates" in fake.requests[1].headers["prefer"]
+    assert json.loads(fake.requests[2].content) == {"recurrence_expanded_until": "2026-05-01T00:00:00+00:00"}
+
+
+def test_conflict_index_follows_writes():
+    scheduled = [
+        {"id": "a", "title": "A", "status": "pending", "scheduled_at": "2026-03-02T10:00:00+00:00", "estimated_duration": 60},
+        {"id": "b", "title": "B", "status": "pending", "scheduled_at": "2026-03-02T10:30:00+00:00", "estimated_duration": 60},
+    ]
+    fake = FakePostgrest(scheduled)
+    service = TaskService(db=fake.client())
+
+    async def scenario():
+        before = await service.find_conflicts("u1")
+        await service.bulk_set_status("u1", ["b"], TaskStatus.COMPLETED)
+        after = await service.find_conflicts("u1")
+        slots = await service.find_free_slots(
+            "u1", datetime(2026, 3, 2, 9, tzinfo=timezone.utc), datetime(2026, 3, 2, 12, tzinfo=timezone.utc)
+        )
+        return before, after, slots
+
+    before, after, slots = asyncio.run(scenario())
+    assert [[t["id"] for t in c["tasks"]] for c in before] == [["a", "b"]]
+    assert before[0]["overlap_minutes"] == 30
+    assert after == []
+    assert [s["start"][11:16] for s in slots] == ["09:00", "11:00"]
+    assert [r.method for r in fake.requests] == ["GET", "PATCH"]  # index loaded once
+
+
+def test_conflict_indexes_are_bounded(monkeypatch):
+    monkeypatch.setattr("services.task_service.CONFLICT_INDEX_MAX_USERS", 2)
+    fake = FakePostgrest([])
+    service = TaskService(db=fake.client())
+
+    async def scenario():
+        for user_id in ["u1", "u2", "u1", "u3"]:
+            await service.find_conflicts(user_id)
+
+    asyncio.run(scenario())
+    assert list(service._conflict_indexes) == ["u1", "u3"]  # least recently used evicted
+    assert len(fake.requests) == 3
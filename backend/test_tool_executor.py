@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from tool_executor import ToolExecutor, ToolTimeoutError
+
+
+def test_parallel_calls_run_concurrently():
+    executor = ToolExecutor(max_workers=4, default_limit=4)
+
+    async def scenario():
+        start = time.perf_counter()
+        await asyncio.gather(*[executor.run("slow", time.sleep, 0.2) for _ in range(4)])
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(scenario())
+    executor.shutdown()
+    assert elapsed < 0.6  # serial would be 0.8s
+    assert executor.stats["slow"]["completed"] == 4
+
+
+def test_per_tool_limit_is_respected():
+    executor = ToolExecutor(max_workers=8, limits={"strategy": 2})
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    async def scenario():
+        await asyncio.gather(*[executor.run("strategy", work) for _ in range(6)])
+
+    asyncio.run(scenario())
+    executor.shutdown()
+    assert peak == 2
+
+
+def test_cancelled_call_keeps_slot_until_thread_finishes():
+    executor = ToolExecutor(max_workers=2, limits={"strategy": 1})
+    release = threading.Event()
+    ran = []
+
+    async def scenario():
+        first = asyncio.ensure_future(executor.run("strategy", release.wait, 1))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        # The worker thread is still busy, so the next call must wait for it
+        second = asyncio.ensure_future(executor.run("strategy", ran.append, "second"))
+        await asyncio.sleep(0.05)
+        assert ran == []
+        release.set()
+        await second
+
+    asyncio.run(scenario())
+    executor.shutdown()
+    assert ran == ["second"]
+    assert executor.stats["strategy"]["cancelled"] == 1
+
+
+def test_timeout():
+    executor = ToolExecutor(max_workers=1, timeout=0.05)
+
+    async def scenario():
+        await executor.run("slow", time.sleep, 0.2)
+
+    with pytest.raises(ToolTimeoutError):
+        asyncio.run(scenario())
+    executor.shutdown(wait=True)
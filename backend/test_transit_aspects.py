@@ -0,0 +1,69 @@
+import time
+
+import numpy as np
+import pytest
+
+from agents.transit_aspects import GRAHAS, compute_aspects, describe_profile
+
+SUN, MOON, MARS, JUPITER, SATURN = (GRAHAS.index(g) for g in ("Sun", "Moon", "Mars", "Jupiter", "Saturn"))
+
+
+def sky(**longitudes):
+    values = np.full(len(GRAHAS), 200.0)
+    for graha, longitude in longitudes.items():
+        values[GRAHAS.index(graha)] = longitude
+    return values
+
+
+def test_conjunction_opposition_and_drishti():
+    transit = sky(Sun=10.0, Mars=95.0, Jupiter=359.0, Saturn=300.0)
+    natal = sky(Sun=3.0, Moon=183.0, Mars=185.0)[None, :]
+    aspects = compute_aspects(transit, natal)
+
+    assert aspects["conjunction"][0, SUN, SUN]  # 7 deg apart
+    assert aspects["opposition"][0, SUN, MOON] and aspects["conjunction"][0, JUPITER, SUN]  # wraps past 0
+    assert not aspects["conjunction"][0, MARS, SUN]
+    # Mars in Cancer aspects the 4th sign from itself (Libra): natal Moon and Mars are there
+    assert aspects["drishti"][0, MARS, MOON] and aspects["drishti"][0, MARS, MARS]
+    assert not aspects["drishti"][0, SUN, SUN]
+
+
+def test_gochara_from_the_natal_moon():
+    transit = sky(Saturn=185.0, Jupiter=45.0)  # Saturn in Libra, Jupiter in Taurus
+    natal = np.vstack([sky(Moon=200.0), sky(Moon=np.nan)])  # Moon in Libra / unknown
+    aspects = compute_aspects(transit, natal)
+
+    assert aspects["gochara_house"][0, SATURN] == 1 and aspects["sade_sati"][0]
+    assert aspects["gochara_house"][0, JUPITER] == 8 and not aspects["gochara_favorable"][0, JUPITER]
+    assert aspects["gochara_house"][1].sum() == 0 and not aspects["sade_sati"][1]
+    assert describe_profile(aspects, 1)["gochara"] is None
+
+
+def test_batch_matches_one_by_one_and_is_fast():
+    rng = np.random.default_rng(7)
+    transit = rng.uniform(0, 360, len(GRAHAS))
+    natal = rng.uniform(0, 360, (20000, len(GRAHAS)))
+
+    started = time.perf_counter()
+    batch = compute_aspects(transit, natal)
+    assert time.perf_counter() - started < 1.0
+
+    for i in (0, 1234, 19999):
+        single = compute_aspects(transit, natal[i:i + 1])
+        assert describe_profile(batch, i) == describe_profile(single, 0)
+
+
+def test_transits_agent_compare_many():
+    pytest.importorskip("swisseph")
+    from datetime import datetime, timezone
+    from agents.transits_agent import TransitsAgent
+
+    agent = TransitsAgent()
+    now = datetime(2026, 10, 19, tzinfo=timezone.utc)
+    charts = {
+        "p1": {"grahas": {g: {"degree": 30.0 * i} for i, g in enumerate(GRAHAS)}},
+        "p2": {"grahas": {}},
+    }
+    results = agent.compare_many(now, charts)
+    assert results["p1"] == agent.compare(agent.get_current_data(now), charts["p1"])
+    assert results["p2"] == {"conjunctions": [], "oppositions": [], "drishti": [], "gochara": None}
@@ -0,0 +1,136 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("swisseph")
+
+from agents.muhurtas_agent import MuhurtasAgent
+from services.transition_scheduler import TransitionScheduler
+
+NOW = datetime(2026, 10, 19, 9, 0, tzinfo=timezone.utc).timestamp()
+MOSCOW = dict(latitude=55.7510, longitude=37.6180, timezone="Europe/Moscow")
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def keys(events):
+    return [(e["user_id"], e["interval"]["type"], e["interval"]["start"], e["lead_minutes"]) for e in events]
+
+
+def test_subscription_fires_the_day_timeline_in_order():
+    clock = Clock(NOW)
+    scheduler = TransitionScheduler(MuhurtasAgent(), clock=clock)
+    result = scheduler.subscribe("u1", **MOSCOW, kinds=["hora", "rahu_kala"], lead_minutes=[0, 10])
+    # 24 horas in the next 24h, each announced twice
+    assert result["scheduled"] >= 48
+
+    events = scheduler.pop_due(NOW + 24 * 3600)
+    fire_times = [datetime.fromisoformat(e["fire_at"]) for e in events]
+    assert fire_times == sorted(fire_times) and len(events) == result["scheduled"]
+    for event in events:
+        start = datetime.fromisoformat(event["interval"]["start"])
+        assert (start - datetime.fromisoformat(event["fire_at"])).total_seconds() == pytest.approx(
+            event["lead_minutes"] * 60, abs=1
+        )
+        assert event["event"] == ("starts_in" if event["lead_minutes"] else "started")
+        assert start.utcoffset().total_seconds() == 3 * 3600  # user's timezone
+    # Monday's Rahu Kala (morning) is already over; Tuesday's is past the horizon
+    assert sum(e["interval"]["type"] == "hora" for e in events) == 48
+    assert all(NOW <= t.timestamp() < NOW + 24 * 3600 for t in fire_times)
+
+
+def test_refill_extends_the_horizon_without_duplicates():
+    clock = Clock(NOW)
+    scheduler = TransitionScheduler(MuhurtasAgent(), clock=clock)
+    scheduler.subscribe("u1", **MOSCOW)
+    scheduler.subscribe("u2", latitude=55.7530, longitude=37.6220, timezone="Europe/Moscow")
+    timelines = scheduler.stats["timelines"]
+
+    fired = []
+    for hour in range(6, 73, 6):
+        clock.now = NOW + hour * 3600
+        fired += scheduler.pop_due()
+        scheduler.refill()
+    # Both users share the cell's timelines: about one per day, not one per user
+    assert scheduler.stats["timelines"] <= timelines + 4
+    assert len(keys(fired)) == len(set(keys(fired)))
+    per_user = [sum(e["user_id"] == u for e in fired) for u in ("u1", "u2")]
+    assert per_user[0] == per_user[1] and per_user[0] >= 3 * 24
+
+
+def test_unsubscribed_events_are_dropped():
+    scheduler = TransitionScheduler(MuhurtasAgent(), clock=Clock(NOW))
+    scheduler.subscribe("u1", **MOSCOW)
+    scheduler.subscribe("u2", **MOSCOW)
+    assert scheduler.unsubscribe("u1") and not scheduler.unsubscribe("nobody")
+    events = scheduler.pop_due(NOW + 24 * 3600)
+    assert {e["user_id"] for e in events} == {"u2"}
+    assert scheduler.stats["stale"] > 0 and len(scheduler) == 0
+
+
+def test_invalid_subscription_is_rejected():
+    scheduler = TransitionScheduler(MuhurtasAgent(), clock=Clock(NOW))
+    with pytest.raises(ValueError):
+        scheduler.subscribe("u1", **MOSCOW, kinds=["eclipse"])
+    with pytest.raises(ValueError):
+        scheduler.subscribe("u1", latitude=55.0, longitude=37.0, timezone="Mars/Olympus")
+    for url in ("http://example.com/hook", "https://127.0.0.1/hook", "https://10.0.0.5/hook",
+                "https://169.254.169.254/latest", "https://[::1]/hook", "https://localhost/hook"):
+        with pytest.raises(ValueError):
+            scheduler.subscribe("u1", **MOSCOW, webhook_url=url)
+
+
+def test_webhook_host_resolving_to_a_private_address_is_not_posted():
+    scheduler = TransitionScheduler(MuhurtasAgent(), clock=Clock(NOW))
+    scheduler.subscribe("u1", **MOSCOW, webhook_url="https://hooks.example.com/alerts")
+
+    async def resolve(*args, **kwargs):
+        return [(2, 1, 6, "", ("192.168.1.10", 443))]
+
+    async def scenario():
+        asyncio.get_running_loop().getaddrinfo = resolve
+        await scheduler._post("https://hooks.example.com/alerts", {"user_id": "u1"})
+        await scheduler.close()
+
+    asyncio.run(scenario())
+    assert scheduler.stats["webhook_failures"] == 1 and scheduler.stats["webhooks"] == 0
+
+
+def test_timezone_defaults_to_the_locations():
+    scheduler = TransitionScheduler(MuhurtasAgent(), clock=Clock(NOW))
+    scheduler.subscribe("u1", latitude=34.05, longitude=-118.24, kinds=["hora"])
+    events = scheduler.pop_due(NOW + 24 * 3600)
+
+    assert len(events) == 24
+    for event in events:
+        start, end = (datetime.fromisoformat(event["interval"][k]) for k in ("start", "end"))
+        assert start.utcoffset().total_seconds() == -7 * 3600  # America/Los_Angeles (PDT)
+        assert 40 * 60 < (end - start).total_seconds() < 80 * 60
+
+
+def test_background_loop_fires_listeners_on_time():
+    offset = {"value": 0.0}
+    scheduler = TransitionScheduler(MuhurtasAgent(), clock=lambda: time.time() + offset["value"])
+
+    async def scenario():
+        received = []
+        scheduler.add_listener(received.append)
+        scheduler.subscribe("u1", **MOSCOW)
+        # Jump the clock to 0.2 s before the first transition
+        offset["value"] = scheduler._heap[0][0] - 0.2 - time.time()
+        scheduler._wakeup.set()
+        await asyncio.sleep(0.6)
+        await scheduler.close()
+        return received
+
+    received = asyncio.run(scenario())
+    assert len(received) == 1 and received[0]["user_id"] == "u1"
+    assert scheduler.get_stats()["fired"] == 1
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from agents.vargas import POINTS, RASHIS, divisional_charts, divisional_charts_batch, varga_signs
+
+ARIES, TAURUS, GEMINI, CANCER, LEO = range(5)
+
+
+def test_known_placements():
+    # Navamsa: 0-3d20' Aries -> Aries; Taurus (fixed) starts from Capricorn; Gemini (dual) from Libra
+    assert varga_signs([1.0, 31.0, 61.0], "D9").tolist() == [ARIES, 9, 6]
+    assert varga_signs(29.9, "D9") == 8  # last navamsa of Aries is Sagittarius
+    # Hora: odd sign Leo then Cancer, even sign Cancer then Leo
+    assert varga_signs([5.0, 20.0, 35.0, 50.0], "D2").tolist() == [LEO, CANCER, CANCER, LEO]
+    # Drekkana: Aries 10-20 -> Leo (5th), 20-30 -> Sagittarius (9th)
+    assert varga_signs([15.0, 25.0], "D3").tolist() == [LEO, 8]
+    # Dasamsa of Taurus (even) starts from its 9th, Capricorn; Saptamsa from its 7th, Scorpio
+    assert varga_signs(30.5, "D10") == 9 and varga_signs(30.5, "D7") == 7
+    # D60: each half degree counted from the sign itself
+    assert varga_signs([0.2, 0.7, 359.9], "D60").tolist() == [ARIES, TAURUS, 10]
+
+
+def test_batch_matches_single_and_handles_missing():
+    rng = np.random.default_rng(3)
+    longitudes = rng.uniform(0, 360, (500, len(POINTS)))
+    longitudes[7, 2] = np.nan
+    batch = divisional_charts_batch(longitudes)
+
+    assert set(batch) == {"D2", "D3", "D7", "D9", "D10", "D12", "D60"}
+    single = divisional_charts(longitudes[42])
+    assert single["D9"]["Moon"] == RASHIS[batch["D9"][42, 2]]
+    assert batch["D12"][7, 2] == 255 and divisional_charts(longitudes[7])["D12"]["Moon"] is None
+
+    with pytest.raises(ValueError):
+        varga_signs(10.0, "D5")
+
+
+def test_jyotish_agent_vargas_need_no_extra_ephemeris_calls(monkeypatch):
+    pytest.importorskip("swisseph")
+    from agents import jyotish_agent as module
+
+    agent = module.JyotishAgent()
+    chart = agent.calculate_birth_chart("1990-05-17", "14:30", 55.75, 37.62)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("ephemeris called")
+
+    monkeypatch.setattr(module.swe, "calc_ut", fail)
+    vargas = agent.calculate_divisional_charts("1990-05-17", "14:30", 55.75, 37.62, vargas=["D9"])
+    assert list(vargas) == ["D9"]
+    assert vargas["D9"]["Moon"] == RASHIS[varga_signs(chart["grahas"]["Moon"]["degree"], "D9")]
+
+    batch = agent.calculate_divisional_charts_batch([
+        {"birth_date": "1990-05-17", "birth_time": "14:30", "latitude": 55.75, "longitude": 37.62},
+    ] * 3, vargas=["D9", "D60"])
+    assert batch["vargas"]["D9"][0] == [RASHIS.index(vargas["D9"][p]) for p in POINTS]
+
+
+def test_navamsa_ascendant_is_sidereal():
+    pytest.importorskip("swisseph")
+    from agents.jyotish_agent import JyotishAgent
+
+    # Tropical Placidus would give 131.46 (Leo); Lahiri sidereal is 107.73 (Cancer)
+    agent = JyotishAgent()
+    chart = agent.calculate_birth_chart("1990-05-01", "12:00", 55.75, 37.62)
+    assert chart["ascendant"]["degree"] == pytest.approx(107.73, abs=0.01)
+    assert chart["ascendant"]["rashi"] == "Cancer"
+    # Cancer (movable) 17.73: 6th navamsa counted from Cancer
+    vargas = agent.calculate_divisional_charts("1990-05-01", "12:00", 55.75, 37.62, vargas=["D9"])
+    assert vargas["D9"]["Ascendant"] == "Sagittarius"
@@ -0,0 +1,101 @@
+"""
+Tool Executor - runs blocking agent calls off the event loop.
+
+The MCP server multiplexes many tool calls over one stdio session. Agent
+methods (swisseph, LLM calls) are synchronous, so running them directly in
+an async handler stalls every other call. ToolExecutor runs them in a shared
+thread pool with a per-tool concurrency limit.
+
+Cancellation:
+- A call still waiting for its slot or queued in the pool never runs.
+- A call already running finishes in its thread, but the result is dropped
+  and its slot is released only when the thread is done, so limits hold.
+
+Usage:
+    executor = ToolExecutor(limits={"analyze_day_strategy": 2})
+    result = await executor.run("get_panchanga", jyotish_agent.calculate_panchanga, date_str)
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class ToolTimeoutError(Exception):
+    """Raised when a tool call exceeds its timeout."""
+    pass
+
+
+class ToolExecutor:
+    """Thread pool with per-tool semaphores, timeouts and counters."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        default_limit: int = 4,
+        limits: Optional[Dict[str, int]] = None,
+        timeout: Optional[float] = None,
+    ):
+        self._max_workers = max_workers or int(os.getenv("MCP_TOOL_WORKERS", "8"))
+        self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="mcp-tool")
+        self._default_limit = default_limit
+        self._limits: Dict[str, int] = dict(limits or {})
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._timeout = timeout
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _semaphore(self, tool: str) -> asyncio.Semaphore:
+        sem = self._semaphores.get(tool)
+        if sem is None:
+            sem = asyncio.Semaphore(self._limits.get(tool, self._default_limit))
+            self._semaphores[tool] = sem
+        return sem
+
+    def _count(self, tool: str, key: str):
+        counters = self.stats.setdefault(tool, {"started": 0, "completed": 0, "failed": 0, "cancelled": 0, "timed_out": 0})
+        counters[key] += 1
+
+    async def run(self, tool: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run `func(*args, **kwargs)` in the pool under the limit for `tool`."""
+        loop = asyncio.get_running_loop()
+        sem = self._semaphore(tool)
+
+        try:
+            await sem.acquire()
+        except asyncio.CancelledError:
+            self._count(tool, "cancelled")
+            raise
+
+        # Release from the worker's done-callback, not from this coroutine:
+        # a cancelled caller must not free the slot while the thread still runs.
+        try:
+            cf = self._pool.submit(functools.partial(func, *args, **kwargs))
+        except BaseException:
+            sem.release()
+            raise
+        cf.add_done_callback(lambda _: loop.call_soon_threadsafe(sem.release))
+        self._count(tool, "started")
+
+        try:
+            if self._timeout:
+                result = await asyncio.wait_for(asyncio.wrap_future(cf), self._timeout)
+            else:
+                result = await asyncio.wrap_future(cf)
+        except asyncio.TimeoutError:
+            self._count(tool, "timed_out")
+            raise ToolTimeoutError(f"Tool '{tool}' timed out after {self._timeout}s")
+        except asyncio.CancelledError:
+            self._count(tool, "cancelled")
+            raise
+        except Exception:
+            self._count(tool, "failed")
+            raise
+
+        self._count(tool, "completed")
+        return result
+
+    def shutdown(self, wait: bool = False):
+        """Stop the pool. Queued calls are dropped."""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
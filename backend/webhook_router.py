@@ -175,7 +175,9 @@ def create_webhook_router(
     jyotish_agent=None,
     mayan_agent=None,
     numerology_agent=None,
-    orchestrator=None
+    orchestrator=None,
+    forecast_service=None,
+    day_index_service=None
 ) -> WebhookRouter:
     """
     Factory: creates a WebhookRouter with all agent actions registered.
@@ -188,12 +190,8 @@ def create_webhook_router(
     # --- Muhurtas Agent ---
     if muhurtas_agent:
         def handle_muhurtas(params):
-            from datetime import datetime as dt, timezone as tz
-            datetime_str = params.get("datetime")
-            if datetime_str:
-                date = dt.fromisoformat(datetime_str.replace('Z', '+00:00'))
-            else:
-                date = dt.now(tz.utc)
+            from agents.muhurtas_agent import location_datetime
+            date = location_datetime(params.get("datetime"), params["latitude"], params["longitude"])
             return muhurtas_agent.get_all_muhurtas(
                 date, params["latitude"], params["longitude"], params.get("language", "ru")
             )
@@ -207,9 +205,9 @@ def create_webhook_router(
         ))
 
         def handle_hora(params):
-            from datetime import datetime as dt, timezone as tz
+            from agents.muhurtas_agent import location_datetime
             return muhurtas_agent.get_current_hora(
-                dt.now(tz.utc), params["latitude"], params["longitude"], params.get("language", "ru")
+                location_datetime(None, params["latitude"], params["longitude"]), params["latitude"], params["longitude"], params.get("language", "ru")
             )
 
         router.register(WebhookAction(
@@ -221,9 +219,9 @@ def create_webhook_router(
         ))
 
         def handle_rahu_kala(params):
-            from datetime import datetime as dt, timezone as tz
+            from agents.muhurtas_agent import location_datetime
             return muhurtas_agent.get_rahu_kala(
-                dt.now(tz.utc), params["latitude"], params["longitude"], params.get("language", "ru")
+                location_datetime(None, params["latitude"], params["longitude"]), params["latitude"], params["longitude"], params.get("language", "ru")
             )
 
         router.register(WebhookAction(
@@ -234,6 +232,24 @@ def create_webhook_router(
             optional_params={"language": "ru"}
         ))
 
+        def handle_day_timeline(params):
+            from agents.muhurtas_agent import location_datetime
+            date = location_datetime(params.get("date"), params["latitude"], params["longitude"])
+            return muhurtas_agent.get_day_timeline(
+                date, params["latitude"], params["longitude"], params.get("language", "ru")
+            )
+
+        router.register(WebhookAction(
+            name="get_day_timeline",
+            description=(
+                "Whole day (sunrise to next sunrise) as one sorted interval list: 24 horas, 16 choghadiyas, "
+                "Rahu/Gulika/Yamaghanda, Brahma and Abhijit muhurtas, plus the next transition time"
+            ),
+            handler=handle_day_timeline,
+            required_params=["latitude", "longitude"],
+            optional_params={"date": None, "language": "ru"}
+        ))
+
     # --- Transits Agent ---
     if transits_agent:
         def handle_transits(params):
@@ -315,6 +331,79 @@ def create_webhook_router(
             optional_params={"date": None}
         ))
 
+    # --- Forecast (numerology + Mayan + Jyotish day scores) ---
+    if forecast_service:
+        async def handle_forecast(params):
+            return await forecast_service.get_forecast(
+                params["dob"], start=params.get("start"),
+                days=int(params.get("days", 30)), language=params.get("language", "ru")
+            )
+
+        router.register(WebhookAction(
+            name="get_forecast",
+            description="Score every day of a 30/90/365-day horizon (columnar: date, score, status, notes, ...)",
+            handler=handle_forecast,
+            required_params=["dob"],
+            optional_params={"start": None, "days": 30, "language": "ru"}
+        ))
+
+    # --- Day Index (date search over 1900-2100) ---
+    if day_index_service:
+        async def handle_find_dates(params):
+            return await day_index_service.find_dates(
+                where=params.get("where"), any_of=params.get("any_of"), exclude=params.get("exclude"),
+                start=params.get("start"), end=params.get("end"),
+                limit=int(params.get("limit", 20)), dob=params.get("dob")
+            )
+
+        router.register(WebhookAction(
+            name="find_dates",
+            description=(
+                "Find dates (1900-2100) matching day features: tithi, nakshatra, yoga, weekday, "
+                "kin, tone, seal, moon, and vibration (needs dob). "
+                "E.g. where={'tithi': 'Ekadashi', 'nakshatra': 'Pushya', 'tone': 1}"
+            ),
+            handler=handle_find_dates,
+            required_params=[],
+            optional_params={"where": None, "any_of": None, "exclude": None, "start": None, "end": None, "limit": 20, "dob": None}
+        ))
+
+    # --- Jyotish: Vimshottari dasha ---
+    if jyotish_agent:
+        def handle_dasha(params):
+            return jyotish_agent.calculate_dasha(
+                params["dob"], params["birth_time"], float(params["latitude"]), float(params["longitude"]),
+                date=params.get("date"), level=params.get("level")
+            )
+
+        router.register(WebhookAction(
+            name="get_dasha",
+            description=(
+                "Vimshottari dasha at a date: mahadasha, antardasha and pratyantardasha with boundaries. "
+                "level='mahadasha' (or antardasha/pratyantardasha) also lists that level's periods"
+            ),
+            handler=handle_dasha,
+            required_params=["dob", "birth_time", "latitude", "longitude"],
+            optional_params={"date": None, "level": None}
+        ))
+
+    # --- Jyotish: divisional charts (vargas) ---
+    if jyotish_agent:
+        def handle_divisional_charts(params):
+            vargas = params.get("vargas")
+            return jyotish_agent.calculate_divisional_charts(
+                params["dob"], params["birth_time"], float(params["latitude"]), float(params["longitude"]),
+                vargas=[vargas] if isinstance(vargas, str) else vargas
+            )
+
+        router.register(WebhookAction(
+            name="get_divisional_charts",
+            description="Varga charts (D2, D3, D7, D9 Navamsa, D10, D12, D60): sign of the Ascendant and each graha",
+            handler=handle_divisional_charts,
+            required_params=["dob", "birth_time", "latitude", "longitude"],
+            optional_params={"vargas": None}
+        ))
+
     # --- Jyotish & Transits Combined (Birth Chart) ---
     if jyotish_agent and transits_agent:
         def handle_birth_chart(params):
@@ -349,6 +438,23 @@ def create_webhook_router(
             optional_params={"datetime": None, "date": "2000-01-01", "language": "ru"}
         ))
 
+        def handle_transits_to_natal(params):
+            from datetime import datetime as dt, timezone as tz
+            datetime_str = params.get("datetime")
+            date_val = dt.fromisoformat(datetime_str.replace('Z', '+00:00')) if datetime_str else dt.now(tz.utc)
+            chart = jyotish_agent.calculate_birth_chart(
+                params["dob"], params["birth_time"], float(params["latitude"]), float(params["longitude"])
+            )
+            return transits_agent.compare(transits_agent.get_current_data(date_val), chart)
+
+        router.register(WebhookAction(
+            name="get_transits_to_natal",
+            description="Transit-to-natal conjunctions, oppositions, graha drishti and gochara (houses from the natal Moon)",
+            handler=handle_transits_to_natal,
+            required_params=["dob", "birth_time", "latitude", "longitude"],
+            optional_params={"datetime": None}
+        ))
+
     # --- Full User Profile (All Systems) ---
     if numerology_agent and mayan_agent and jyotish_agent and transits_agent:
         def handle_get_full_profile(params):